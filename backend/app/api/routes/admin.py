@@ -9,6 +9,7 @@ from app.schemas.credit import UserCreditUpdate, CreditTransactionResponse, Cred
 from app.services.user_service import UserService
 from app.services.credit_service import CreditService
 from app.db.models.user import User as UserModel
+from app.core.security import password_hashing_pool
 from datetime import datetime
 
 router = APIRouter()
@@ -122,4 +123,12 @@ async def get_credit_usage_summary(
     current_user: UserModel = Depends(get_current_admin_user)
 ):
     """Get a summary of credit usage across the system (admin only)."""
-    return await CreditService.get_credit_usage_summary(db) 
\ No newline at end of file
+    return await CreditService.get_credit_usage_summary(db) 
+
+
+@router.get("/password-hashing/stats", response_model=dict)
+async def get_password_hashing_stats(
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Get queue and timing metrics of this worker's password hashing pool (admin only)."""
+    return password_hashing_pool.stats() 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import List, Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
@@ -18,6 +18,7 @@ from app.schemas.text import TextResponse as TextSchemaResponse
 from app.services.agent_service import AgentService
 from app.services.contest_service import ContestService
 from app.services.judge_service import JudgeService
+from app.utils.http_cache import conditional_response, latest_timestamp, make_etag
 from app.utils.ai_models import estimate_credits
 
 router = APIRouter()
@@ -222,14 +223,23 @@ async def get_agent_executions(
 @router.get("/{agent_id}", response_model=AgentResponse)
 async def get_agent(
     agent_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """
     Get details of a specific AI agent.
     User must be the owner of the agent or the agent must be public, or user is admin.
+    Supports conditional requests via ETag / Last-Modified.
     """
-    return await AgentService.get_agent_by_id(db, agent_id, current_user.id)
+    agent = await AgentService.get_agent_by_id(db, agent_id, current_user.id)
+    last_modified = latest_timestamp(agent.created_at, agent.updated_at)
+    etag = make_etag("agent", agent.id, agent.version, last_modified)
+    not_modified = conditional_response(request, response, etag, last_modified=last_modified)
+    if not_modified:
+        return not_modified
+    return agent
 
 
 @router.put("/{agent_id}", response_model=AgentResponse)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
+from jose import JWTError
 from datetime import timedelta
 from typing import Optional, Dict
 
@@ -12,9 +12,10 @@ from app.services.auth_service import (
     create_user,
 )
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.security import create_access_token, decode_access_token
 from app.db.repositories.user_repository import UserRepository
 from app.db.models.user import User as UserModel
+from app.services.auth_context import get_auth_context
 
 router = APIRouter(tags=["authentication"])
 
@@ -34,7 +35,8 @@ async def _get_user_from_token_data(
     db: AsyncSession
 ) -> Optional[UserModel]:
     """
-    Internal helper to decode JWT, extract user info, and fetch user from DB.
+    Internal helper to decode JWT, extract user info, and fetch user from DB
+    (through the principal cache, so most requests need no query).
     Returns UserModel instance or None if token is invalid, payload is bad, or user not found.
     Does NOT raise HTTPException directly for "optional" use cases.
     """
@@ -42,11 +44,7 @@ async def _get_user_from_token_data(
         return None
 
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         username: Optional[str] = payload.get("sub")
         user_id: Optional[int] = payload.get("id")
 
@@ -62,7 +60,10 @@ async def _get_user_from_token_data(
         return None
     
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_username(username=username)
+    user = await user_repo.get_principal(user_id=user_id, username=username)
+    if user is not None:
+        # Seed the request's authorization context with the loaded principal
+        get_auth_context(db, user.id, user)
     return user
 
 
@@ -1,5 +1,5 @@
 from typing import List, Optional, Union
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
@@ -8,10 +8,12 @@ from app.api.routes.auth import get_current_user, get_optional_current_user
 from app.schemas.contest import (
     ContestCreate, ContestResponse, ContestUpdate, ContestDetailResponse,
     TextSubmission, TextSubmissionResponse, JudgeAssignment, JudgeAssignmentResponse,
-    ContestTextResponse, ContestMemberAdd, ContestMemberResponse
+    ContestTextResponse, ContestMemberAdd, ContestMemberResponse,
+    BatchTextSubmission, BatchSubmissionResponse, ContestStandingEntry
 )
 from app.db.models.user import User as UserModel
 from app.services.contest_service import ContestService
+from app.utils.http_cache import conditional_response, contest_cache_control
 
 router = APIRouter(tags=["contests"])
 
@@ -102,9 +104,31 @@ async def get_all_my_submissions(
     )
 
 
+@router.post("/submissions/batch", response_model=BatchSubmissionResponse)
+async def submit_texts_batch(
+    batch: BatchTextSubmission,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """
+    Submit many texts, possibly to many contests, in one request.
+    
+    Each (contest_id, text_id) pair is checked like a single submission; pairs that fail
+    are listed in `rejected` with the status code and reason the single endpoint would give.
+    Passwords for password-protected contests go in `contest_passwords`, keyed by contest ID.
+    """
+    return await ContestService.submit_texts_batch(
+        db=db,
+        batch=batch,
+        current_user_id=current_user.id
+    )
+
+
 @router.get("/{contest_id}", response_model=ContestDetailResponse)
 async def get_contest(
     contest_id: int,
+    request: Request,
+    response: Response,
     password: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[UserModel] = Depends(get_optional_current_user)
@@ -113,14 +137,20 @@ async def get_contest(
     Get contest details including participant and text counts
     
     For password-protected contests, provide the password unless you're the creator or admin
+    Supports conditional requests via ETag / If-None-Match.
     """
     user_id = current_user.id if current_user else None
-    await ContestService.check_contest_access(
+    contest = await ContestService.check_contest_access(
         db=db,
         contest_id=contest_id,
         current_user_id=user_id,
         password=password
     )
+
+    etag = await ContestService.get_contest_detail_etag(db=db, contest_id=contest_id)
+    not_modified = conditional_response(request, response, etag, cache_control=contest_cache_control(contest))
+    if not_modified:
+        return not_modified
     
     # Service now returns a dictionary with all required fields and counts
     result_dict = await ContestService.get_contest_detail(db=db, contest_id=contest_id)
@@ -210,6 +240,8 @@ async def submit_text_to_contest(
 @router.get("/{contest_id}/submissions/", response_model=List[ContestTextResponse])
 async def get_contest_submissions(
     contest_id: int,
+    request: Request,
+    response: Response,
     password: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[UserModel] = Depends(get_optional_current_user)
@@ -220,15 +252,23 @@ async def get_contest_submissions(
     For password-protected contests, provide the password unless you're the creator or admin
     For open contests, only the creator and admins can see submissions
     For evaluation/closed contests, anyone with access can see submissions with full details
+    Supports conditional requests via ETag / If-None-Match.
     """
     user_id = current_user.id if current_user else None
-    return await ContestService.get_contest_submissions(
+    contest = await ContestService.check_submissions_access(
         db=db,
         contest_id=contest_id,
         current_user_id=user_id,
         password=password
     )
 
+    etag = await ContestService.get_submissions_etag(db=db, contest_id=contest_id)
+    not_modified = conditional_response(request, response, etag, cache_control=contest_cache_control(contest))
+    if not_modified:
+        return not_modified
+
+    return await ContestService.get_submissions_for_contest(db=db, contest=contest)
+
 
 @router.get("/{contest_id}/my-submissions/", response_model=List[ContestTextResponse])
 async def get_my_contest_submissions(
@@ -255,6 +295,25 @@ async def get_my_contest_submissions(
     return my_submissions
 
 
+@router.get("/{contest_id}/standings", response_model=List[ContestStandingEntry])
+async def get_contest_standings(
+    contest_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """
+    Get the live standings of a contest (contest creator or admin only)
+    
+    Points and places are kept up to date as judges vote, so standings can be followed
+    during evaluation, before the contest is closed.
+    """
+    return await ContestService.get_live_standings(
+        db=db,
+        contest_id=contest_id,
+        current_user_id=current_user.id
+    )
+
+
 @router.delete("/{contest_id}/submissions/{submission_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_submission_from_contest(
     contest_id: int,
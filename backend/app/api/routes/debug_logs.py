@@ -1,26 +1,54 @@
-from typing import List, Optional
+from datetime import datetime
+from html import escape
+from typing import Literal, Optional
+from urllib.parse import urlencode
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select
 
 from app.db.database import get_db
 from app.api.routes.auth import get_current_user
 from app.db.models.user import User as UserModel
 from app.db.models.ai_debug_log import AIDebugLog
-from app.utils.debug_logger import AIDebugLogger
+from app.utils.debug_logger import AIDebugLogger, SUMMARY_COLUMNS
 from app.core.config import settings
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 200
+
+
+def _summary_to_dict(log) -> dict:
+    return {
+        "id": log.id,
+        "timestamp": log.timestamp.isoformat(),
+        "operation_type": log.operation_type,
+        "user_id": log.user_id,
+        "agent_id": log.agent_id,
+        "contest_id": log.contest_id,
+        "model_id": log.model_id,
+        "execution_time_ms": log.execution_time_ms,
+        "prompt_tokens": log.prompt_tokens,
+        "completion_tokens": log.completion_tokens,
+        "cost_usd": float(log.cost_usd) if log.cost_usd else None
+    }
+
+
 @router.get("/admin/ai-debug-logs", response_class=HTMLResponse)
 async def get_ai_debug_logs_page(
     operation_type: Optional[str] = Query(None, description="Filter by operation type (writer/judge)"),
-    limit: int = Query(50, description="Number of logs to show"),
+    model_id: Optional[str] = Query(None, description="Filter by model"),
+    contest_id: Optional[int] = Query(None, description="Filter by contest"),
+    user_id: Optional[int] = Query(None, description="Filter by user"),
+    since: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only logs before this time"),
+    before_id: Optional[int] = Query(None, description="Keyset cursor: only logs older than this id"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Number of logs to show"),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    """Admin page to view AI debug logs (development only)."""
+    """Admin page to view AI debug logs (development only). Bodies are linked, not inlined."""
     
     # Check if user is admin
     if not current_user.is_admin:
@@ -42,17 +70,22 @@ async def get_ai_debug_logs_page(
         </html>
         """)
     
-    # Build query
-    query = select(AIDebugLog).order_by(desc(AIDebugLog.timestamp))
-    
-    if operation_type:
-        query = query.where(AIDebugLog.operation_type == operation_type)
-    
-    query = query.limit(limit)
-    
-    # Execute query
-    result = await db.execute(query)
-    logs = result.scalars().all()
+    filters = {
+        "model_id": model_id,
+        "contest_id": contest_id,
+        "user_id": user_id,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "limit": limit
+    }
+    logs = await AIDebugLogger.list_summaries(
+        db, limit, before_id=before_id, operation_type=operation_type, model_id=model_id,
+        contest_id=contest_id, user_id=user_id, since=since, until=until
+    )
+
+    def page_url(**overrides) -> str:
+        params = {key: value for key, value in {**filters, "operation_type": operation_type, **overrides}.items() if value is not None}
+        return "/admin/ai-debug-logs" + (f"?{escape(urlencode(params))}" if params else "")
     
     # Generate HTML
     html_content = f"""
@@ -84,6 +117,9 @@ async def get_ai_debug_logs_page(
             .content-box {{ background: #f8f9fa; padding: 10px; border-radius: 4px; font-family: monospace; font-size: 0.9em; white-space: pre-wrap; max-height: 300px; overflow-y: auto; }}
             .no-logs {{ text-align: center; padding: 40px; color: #6c757d; }}
             .refresh-info {{ text-align: center; margin-bottom: 20px; color: #6c757d; font-size: 0.9em; }}
+            .pagination {{ text-align: center; margin-top: 20px; }}
+            .pagination a {{ padding: 8px 16px; background: #007bff; color: white; text-decoration: none; border-radius: 4px; }}
+            .body-links a {{ margin-right: 15px; }}
         </style>
         <script>
             function toggleLog(id) {{
@@ -91,10 +127,8 @@ async def get_ai_debug_logs_page(
                 content.classList.toggle('show');
             }}
             
-            // Auto-refresh every 30 seconds
-            setTimeout(function() {{
-                window.location.reload();
-            }}, 30000);
+            // Auto-refresh the first page every 30 seconds
+            {"" if before_id is not None else "setTimeout(function() { window.location.reload(); }, 30000);"}
         </script>
     </head>
     <body>
@@ -102,13 +136,13 @@ async def get_ai_debug_logs_page(
             <h1>AI Debug Logs</h1>
             
             <div class="refresh-info">
-                🔄 Auto-refreshing every 30 seconds | Showing last {limit} operations
+                {"🔄 Auto-refreshing every 30 seconds | " if before_id is None else ""}Showing {limit} operations per page
             </div>
             
             <div class="filters">
-                <a href="/admin/ai-debug-logs" {"class='active'" if not operation_type else ""}>All Operations</a>
-                <a href="/admin/ai-debug-logs?operation_type=writer" {"class='active'" if operation_type == 'writer' else ""}>Writer Only</a>
-                <a href="/admin/ai-debug-logs?operation_type=judge" {"class='active'" if operation_type == 'judge' else ""}>Judge Only</a>
+                <a href="{page_url(operation_type=None)}" {"class='active'" if not operation_type else ""}>All Operations</a>
+                <a href="{page_url(operation_type='writer')}" {"class='active'" if operation_type == 'writer' else ""}>Writer Only</a>
+                <a href="{page_url(operation_type='judge')}" {"class='active'" if operation_type == 'judge' else ""}>Judge Only</a>
             </div>
     """
     
@@ -132,7 +166,7 @@ async def get_ai_debug_logs_page(
                     <span class="metric">⏱️ {log.execution_time_ms}ms</span>
                     <span class="metric">📝 {log.prompt_tokens or 0} + {log.completion_tokens or 0} = {(log.prompt_tokens or 0) + (log.completion_tokens or 0)} tokens</span>
                     <span class="metric">💰 ${log.cost_usd or 0:.4f}</span>
-                    <span class="metric">🤖 {log.model_id or 'Unknown'}</span>
+                    <span class="metric">🤖 {escape(log.model_id or 'Unknown')}</span>
                 </div>
             """
             
@@ -147,29 +181,22 @@ async def get_ai_debug_logs_page(
                     {metrics_html}
                 </div>
                 <div id="content-{log.id}" class="log-content">
-                    <div class="section">
-                        <h4>📥 Strategy Input</h4>
-                        <div class="content-box">{log.strategy_input or 'No input logged'}</div>
-                    </div>
-                    
-                    <div class="section">
-                        <h4>🚀 LLM Prompt</h4>
-                        <div class="content-box">{log.llm_prompt or 'No prompt logged'}</div>
-                    </div>
-                    
-                    <div class="section">
-                        <h4>🤖 LLM Response</h4>
-                        <div class="content-box">{log.llm_response or 'No response logged'}</div>
-                    </div>
-                    
-                    <div class="section">
-                        <h4>📤 Parsed Output</h4>
-                        <div class="content-box">{log.parsed_output or 'No output logged'}</div>
+                    <div class="section body-links">
+                        <a href="/admin/ai-debug-logs/api/{log.id}">📥 Strategy input &amp; parsed output</a>
+                        <a href="/admin/ai-debug-logs/api/{log.id}/prompt">🚀 LLM Prompt</a>
+                        <a href="/admin/ai-debug-logs/api/{log.id}/response">🤖 LLM Response</a>
                     </div>
                 </div>
             </div>
             """
     
+    if len(logs) == limit:
+        html_content += f"""
+            <div class="pagination">
+                <a href="{page_url(before_id=logs[-1].id)}">Older →</a>
+            </div>
+        """
+    
     html_content += """
         </div>
     </body>
@@ -181,11 +208,17 @@ async def get_ai_debug_logs_page(
 @router.get("/admin/ai-debug-logs/api")
 async def get_ai_debug_logs_api(
     operation_type: Optional[str] = Query(None),
-    limit: int = Query(50),
+    model_id: Optional[str] = Query(None),
+    contest_id: Optional[int] = Query(None),
+    user_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    before_id: Optional[int] = Query(None, description="Keyset cursor: pass next_before_id of the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    """API endpoint to get AI debug logs as JSON."""
+    """API endpoint to list AI debug log summaries as JSON, newest first."""
     
     if not current_user.is_admin:
         raise HTTPException(
@@ -196,39 +229,79 @@ async def get_ai_debug_logs_api(
     if not AIDebugLogger.is_enabled():
         return {"enabled": False, "logs": []}
     
-    # Build query
-    query = select(AIDebugLog).order_by(desc(AIDebugLog.timestamp))
+    logs = await AIDebugLogger.list_summaries(
+        db, limit, before_id=before_id, operation_type=operation_type, model_id=model_id,
+        contest_id=contest_id, user_id=user_id, since=since, until=until
+    )
     
-    if operation_type:
-        query = query.where(AIDebugLog.operation_type == operation_type)
+    return {
+        "enabled": True,
+        "count": len(logs),
+        "logs": [_summary_to_dict(log) for log in logs],
+        "next_before_id": logs[-1].id if len(logs) == limit else None
+    }
+
+
+@router.get("/admin/ai-debug-logs/api/{log_id}")
+async def get_ai_debug_log_api(
+    log_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Metadata, strategy input and parsed output of one log. Bodies are served separately."""
     
-    query = query.limit(limit)
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
     
-    # Execute query
-    result = await db.execute(query)
-    logs = result.scalars().all()
+    result = await db.execute(
+        select(AIDebugLog.strategy_input, AIDebugLog.parsed_output, *SUMMARY_COLUMNS).where(AIDebugLog.id == log_id)
+    )
+    log = result.first()
+    if log is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debug log not found"
+        )
     
     return {
-        "enabled": True,
-        "count": len(logs),
-        "logs": [
-            {
-                "id": log.id,
-                "timestamp": log.timestamp.isoformat(),
-                "operation_type": log.operation_type,
-                "user_id": log.user_id,
-                "agent_id": log.agent_id,
-                "contest_id": log.contest_id,
-                "model_id": log.model_id,
-                "strategy_input": log.strategy_input,
-                "llm_prompt": log.llm_prompt,
-                "llm_response": log.llm_response,
-                "parsed_output": log.parsed_output,
-                "execution_time_ms": log.execution_time_ms,
-                "prompt_tokens": log.prompt_tokens,
-                "completion_tokens": log.completion_tokens,
-                "cost_usd": float(log.cost_usd) if log.cost_usd else None
-            }
-            for log in logs
-        ]
-    } 
\ No newline at end of file
+        **_summary_to_dict(log),
+        "strategy_input": log.strategy_input,
+        "parsed_output": log.parsed_output
+    }
+
+
+@router.get("/admin/ai-debug-logs/api/{log_id}/{body}")
+async def stream_ai_debug_log_body(
+    log_id: int,
+    body: Literal["prompt", "response"],
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Stream the LLM prompt or response of one log as plain text, chunk by chunk."""
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    text_column, blobs_column = (
+        (AIDebugLog.llm_prompt, AIDebugLog.llm_prompt_blobs) if body == "prompt"
+        else (AIDebugLog.llm_response, AIDebugLog.llm_response_blobs)
+    )
+    result = await db.execute(select(text_column, blobs_column).where(AIDebugLog.id == log_id))
+    row = result.first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debug log not found"
+        )
+    
+    inline_text, digests = row
+    if digests is None:
+        # Logged before blob storage (or nothing logged)
+        return StreamingResponse(iter([inline_text or ""]), media_type="text/plain; charset=utf-8")
+    return StreamingResponse(AIDebugLogger.stream_body_chunks(db.bind, digests), media_type="text/plain; charset=utf-8")
@@ -1,22 +1,34 @@
 from typing import List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from app.utils.ai_models import get_available_models, get_model_by_id, AIModel
+from app.core.config import settings
+from app.utils.ai_models import get_available_models, get_model_by_id, get_catalog_etag, AIModel
+from app.utils.http_cache import conditional_response
 
 router = APIRouter()
 
+# The catalog only changes on deploy, so let browsers and proxies keep it for a while
+_CATALOG_CACHE_CONTROL = f"public, max-age={settings.MODEL_CATALOG_CACHE_MAX_AGE}"
+
 @router.get("", response_model=List[AIModel])
 async def get_available_llm_models(
+    request: Request,
+    response: Response,
 ):
     """
     Get all available LLM models.
     Returns models that are currently enabled in the system with their pricing information.
     """
+    not_modified = conditional_response(request, response, get_catalog_etag(), cache_control=_CATALOG_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     return get_available_models()
 
 @router.get("/{model_id}", response_model=AIModel)
 async def get_llm_model_details(
     model_id: str,
+    request: Request,
+    response: Response,
 ):
     """
     Get technical details and pricing information about a specific LLM model.
@@ -25,4 +37,7 @@ async def get_llm_model_details(
     model = get_model_by_id(model_id)
     if not model:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
-    return model 
\ No newline at end of file
+    not_modified = conditional_response(request, response, get_catalog_etag(), cache_control=_CATALOG_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    return model 
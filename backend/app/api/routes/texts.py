@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Path, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Path, Query, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.routes.auth import get_current_user, get_optional_current_user
@@ -7,6 +7,7 @@ from app.db.database import get_db
 from app.schemas.text import TextCreate, TextResponse, TextUpdate
 from app.db.models.user import User as UserModel
 from app.services.text_service import TextService
+from app.utils.http_cache import conditional_response, make_etag
 
 router = APIRouter(
     tags=["texts"]
@@ -60,6 +61,8 @@ async def get_my_texts(
 
 @router.get("/{text_id}", response_model=TextResponse)
 async def get_text(
+    request: Request,
+    response: Response,
     text_id: int = Path(..., gt=0),
     current_user: Optional[UserModel] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db)
@@ -67,9 +70,15 @@ async def get_text(
     """
     Get a specific text by ID.
     During evaluation or closed phase, anyone can view the text content.
+    Supports conditional requests via ETag / Last-Modified.
     """
     service = TextService(db)
-    return await service.get_text(text_id, current_user.id if current_user else None)
+    text = await service.get_text(text_id, current_user.id if current_user else None)
+    etag = make_etag("text", text.id, text.updated_at)
+    not_modified = conditional_response(request, response, etag, last_modified=text.updated_at)
+    if not_modified:
+        return not_modified
+    return text
 
 
 @router.put("/{text_id}", response_model=TextResponse)
@@ -0,0 +1,294 @@
+"""
+Application read cache for hot, rarely-changing rows (contests, agents, users, judge lists).
+
+Values are stored as plain column dictionaries rather than ORM instances, so the same
+entries work for the in-process backend and for a networked (Redis-protocol) backend.
+Repositories rehydrate them into the caller's session with `merge(load=False)`, which
+keeps identity-map semantics and lets callers modify and commit the returned objects
+exactly as if they had been loaded with a SELECT.
+
+Entries are tagged; repository write methods invalidate by key or tag right after
+they commit.
+"""
+
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT")
+
+
+class CacheBackend(ABC):
+    """Interface implemented by all cache backends."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        """Cache `value` under `key` for `ttl` seconds, invalidated by any of `tags`."""
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Drop the given keys."""
+        pass
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry tagged with any of `tags`."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every entry."""
+        pass
+
+
+class NullCache(CacheBackend):
+    """Backend used when caching is disabled: every lookup is a miss."""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        return None
+
+    async def delete(self, *keys: str) -> None:
+        return None
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        return None
+
+    async def clear(self) -> None:
+        return None
+
+
+class InMemoryCache(CacheBackend):
+    """In-process TTL + LRU cache. Only suitable for a single worker process."""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: int = 60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags: Dict[str, set] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._entries[key] = (expires_at, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._remove(key)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            for key in list(self._tags.pop(tag, ())):
+                self._remove(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCache(CacheBackend):
+    """
+    Networked backend speaking the Redis protocol (Redis, Valkey, KeyDB, ...).
+    Tags are stored as sets of keys. `client` can be any redis.asyncio-compatible
+    client, which makes it easy to run against a local stand-in in tests.
+    Requires Redis 7.0+ (EXPIRE with NX/GT).
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", default_ttl: int = 60,
+                 prefix: str = "duelo:", client: Any = None):
+        if client is None:
+            import redis.asyncio as redis  # Optional dependency, only needed for this backend
+            client = redis.from_url(url)
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return _loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        full_key = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.set(full_key, _dumps(value), ex=ttl)
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            pipe.sadd(tag_key, full_key)
+            # A tag set must outlive every entry it points to, so its TTL is only ever
+            # extended: NX sets it on a new set, GT raises it for a longer-lived entry
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+        await pipe.execute()
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            members = await self.client.smembers(tag_key)
+            if members:
+                await self.client.delete(*members)
+            await self.client.delete(tag_key)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache backend configured by CACHE_BACKEND."""
+    global _cache
+    if _cache is None:
+        _cache = _create_backend()
+    return _cache
+
+
+def set_cache(backend: CacheBackend) -> None:
+    """Replace the process-wide cache backend (used by tests and tooling)."""
+    global _cache
+    _cache = backend
+
+
+def _create_backend() -> CacheBackend:
+    backend = settings.CACHE_BACKEND.lower()
+    if backend == "memory":
+        if settings.WEB_CONCURRENCY > 1:
+            # Each worker would keep (and invalidate) its own copy, so writes on one worker
+            # would leave stale entries on the others
+            raise RuntimeError(
+                f"CACHE_BACKEND=memory only supports a single worker (WEB_CONCURRENCY={settings.WEB_CONCURRENCY}); "
+                "use CACHE_BACKEND=redis or none"
+            )
+        return InMemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, default_ttl=settings.CACHE_TTL_SECONDS)
+    if backend == "redis":
+        return RedisCache(url=settings.REDIS_URL, default_ttl=settings.CACHE_TTL_SECONDS)
+    if backend not in ("none", "off", ""):
+        logger.warning("Unknown CACHE_BACKEND '%s', caching disabled", settings.CACHE_BACKEND)
+    return NullCache()
+
+
+# ORM helpers
+
+def row_to_dict(obj: Any, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Snapshot the column values of an ORM instance. Columns in `exclude` (secrets) are left
+    out; they stay unloaded on rehydrated instances and are loaded by the next real SELECT.
+    """
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns if column.key not in exclude}
+
+
+async def rehydrate(db: AsyncSession, model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """Attach a cached row to the session as a persistent, clean instance (no SQL emitted)."""
+    # An instance already in the session wins: it may hold newer or pending state
+    primary_key = [data[column.key] for column in inspect(model).primary_key]
+    existing = db.sync_session.identity_map.get(db.sync_session.identity_key(model, primary_key))
+    if existing is not None:
+        return existing
+    obj = model(**data)
+    make_transient_to_detached(obj)
+    return await db.merge(obj, load=False)
+
+
+def detached(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    Build a read-only copy of a cached row that is never attached to a session, so changes
+    made to it are never flushed. Unloaded columns and relationships raise on access.
+    """
+    obj = model(**data)
+    make_transient_to_detached(obj)
+    return obj
+
+
+async def rehydrate_all(db: AsyncSession, model: Type[ModelT], rows: List[Dict[str, Any]]) -> List[ModelT]:
+    return [await rehydrate(db, model, data) for data in rows]
+
+
+# Serialization for networked backends
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode)
+
+
+def _loads(raw: Any) -> Any:
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    return json.loads(raw, object_hook=_decode)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+        if "__decimal__" in obj:
+            return Decimal(obj["__decimal__"])
+    return obj
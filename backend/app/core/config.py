@@ -28,6 +28,60 @@ class Settings(BaseSettings):
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     ALLOWED_ORIGINS: List[str] = json.loads(os.getenv("ALLOWED_ORIGINS", '["http://localhost:3001", "http://localhost:8000"]'))
 
+    # HTTP caching (seconds) for responses that rarely change
+    CLOSED_CONTEST_CACHE_MAX_AGE: int = int(os.getenv("CLOSED_CONTEST_CACHE_MAX_AGE", "3600"))
+    MODEL_CATALOG_CACHE_MAX_AGE: int = int(os.getenv("MODEL_CATALOG_CACHE_MAX_AGE", "300"))
+
+    # Application read cache: "memory" (single process), "redis" (shared) or "none".
+    # With more than one worker process (WEB_CONCURRENCY, as read by uvicorn/gunicorn) the
+    # cache must be shared, so "memory" is refused at startup.
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Authenticated principals are cached briefly so requests skip the user lookup
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    TOKEN_DECODE_CACHE_SIZE: int = int(os.getenv("TOKEN_DECODE_CACHE_SIZE", "4096"))
+
+    # Password hashing: bcrypt work factor (use 4 in tests) and hashing threads per worker
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+
+    # Contest lifecycle scheduler: moves open contests to evaluation at their end_date.
+    # Set CONTEST_AUTO_AI_JUDGE_MODEL to also run their AI judges (billed to the contest creator).
+    CONTEST_SCHEDULER_ENABLED: bool = os.getenv("CONTEST_SCHEDULER_ENABLED", "True").lower() == "true"
+    CONTEST_SCHEDULER_POLL_SECONDS: int = int(os.getenv("CONTEST_SCHEDULER_POLL_SECONDS", "30"))
+    CONTEST_SCHEDULER_BATCH_SIZE: int = int(os.getenv("CONTEST_SCHEDULER_BATCH_SIZE", "50"))
+    CONTEST_AUTO_AI_JUDGE_MODEL: str = os.getenv("CONTEST_AUTO_AI_JUDGE_MODEL", "")
+
+    # AI debug logs (DEBUG only) are buffered in memory and written in batches;
+    # only the newest AI_DEBUG_LOG_RETENTION rows are kept
+    AI_DEBUG_LOG_QUEUE_SIZE: int = int(os.getenv("AI_DEBUG_LOG_QUEUE_SIZE", "1000"))
+    AI_DEBUG_LOG_BATCH_SIZE: int = int(os.getenv("AI_DEBUG_LOG_BATCH_SIZE", "100"))
+    AI_DEBUG_LOG_FLUSH_SECONDS: float = float(os.getenv("AI_DEBUG_LOG_FLUSH_SECONDS", "1.0"))
+    AI_DEBUG_LOG_RETENTION: int = int(os.getenv("AI_DEBUG_LOG_RETENTION", "1000"))
+    AI_DEBUG_LOG_RETENTION_INTERVAL_SECONDS: int = int(os.getenv("AI_DEBUG_LOG_RETENTION_INTERVAL_SECONDS", "300"))
+
+    # Request tracing: Server-Timing headers plus one JSON log line per sampled request.
+    # Requests slower than TRACE_SLOW_REQUEST_MS are always logged.
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "True").lower() == "true"
+    TRACE_LOG_SAMPLE_RATE: float = float(os.getenv("TRACE_LOG_SAMPLE_RATE", "0.01"))
+    TRACE_SLOW_REQUEST_MS: float = float(os.getenv("TRACE_SLOW_REQUEST_MS", "1000"))
+    TRACE_SERVER_TIMING: bool = os.getenv("TRACE_SERVER_TIMING", "True").lower() == "true"
+
+    # Startup warmup: the tokenizer, model catalog and AI provider client are loaded lazily;
+    # when enabled, the app preloads them concurrently at startup and prints a timing report.
+    STARTUP_WARMUP_ENABLED: bool = os.getenv("STARTUP_WARMUP_ENABLED", "True").lower() == "true"
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("STARTUP_WARMUP_TIMEOUT_SECONDS", "10"))
+
+    # Model fallback routing: a provider's error rate is measured over its calls (failures and
+    # calls over a latency budget) in the last window, once there are enough of them.
+    # MODEL_ROUTING_MAX_ERROR_RATE applies to routing policies that don't set their own.
+    MODEL_ROUTING_ERROR_WINDOW_SECONDS: int = int(os.getenv("MODEL_ROUTING_ERROR_WINDOW_SECONDS", "300"))
+    MODEL_ROUTING_MIN_CALLS: int = int(os.getenv("MODEL_ROUTING_MIN_CALLS", "5"))
+    MODEL_ROUTING_MAX_ERROR_RATE: float = float(os.getenv("MODEL_ROUTING_MAX_ERROR_RATE", "0.5"))
+
     # Superuser Credentials (for initial setup/tests)
     # These should align with the credentials used by scripts/create_admin.py
     # and be present in the .env file for the testing environment.
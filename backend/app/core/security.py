@@ -1,11 +1,28 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt
+from typing import Any, Callable, Dict, Optional, Tuple
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password context for hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password context for hashing. Hashes made with any other work factor than the
+# configured one are reported as needing an update, so they get rehashed on the next
+# login: older, weaker hashes are strengthened, and lowering BCRYPT_ROUNDS takes effect
+# for existing users too.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Verified token payloads, keyed by a digest of the token
+_decoded_tokens: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -15,6 +32,85 @@ def get_password_hash(password: str) -> str:
     """Generate a password hash."""
     return pwd_context.hash(password)
 
+
+class PasswordHashingPool:
+    """
+    Bounded thread pool for bcrypt, so hashing never blocks the event loop.
+    bcrypt releases the GIL while it works, so threads hash in parallel.
+    Callers beyond `workers` wait for a slot; the counters expose that queue.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.max_waiting = 0
+        self.total_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        slots = self._get_slots()
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - queued_at
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.total_hash_seconds += time.perf_counter() - started_at
+            slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "max_waiting": self.max_waiting,
+            "avg_wait_ms": round(self.total_wait_seconds * 1000 / completed, 2),
+            "avg_hash_ms": round(self.total_hash_seconds * 1000 / completed, 2),
+        }
+
+
+password_hashing_pool = PasswordHashingPool(workers=settings.PASSWORD_HASH_WORKERS)
+
+async def hash_password(password: str) -> str:
+    """Generate a password hash without blocking the event loop."""
+    return await password_hashing_pool.run(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password without blocking the event loop.
+    Returns (is_valid, new_hash); new_hash is set when the stored hash uses an outdated
+    scheme or work factor and should be replaced.
+    """
+    return await password_hashing_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT token."""
     to_encode = data.copy()
@@ -27,4 +123,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
-    return encoded_jwt 
\ No newline at end of file
+    return encoded_jwt
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT and return its payload. Raises JWTError if it is invalid or expired.
+    Successful verifications are memoized until the token expires, since clients
+    send the same token on every request.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = _decoded_tokens.get(key)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is None or exp > time.time():
+            _decoded_tokens.move_to_end(key)
+            return payload
+        del _decoded_tokens[key]
+        raise JWTError("Signature has expired.")
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    _decoded_tokens[key] = payload
+    while len(_decoded_tokens) > settings.TOKEN_DECODE_CACHE_SIZE:
+        _decoded_tokens.popitem(last=False)
+    return payload
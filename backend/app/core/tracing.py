@@ -0,0 +1,213 @@
+"""
+Per-request performance tracing.
+
+TracingMiddleware opens a RequestTrace for every HTTP request and keeps it in a
+context variable. SQLAlchemy cursor events and the AI provider layer add to the
+active trace, so no request or service code has to pass it around. When a request
+finishes, its breakdown (total, DB and LLM time) is sent as a `Server-Timing`
+header and logged as one JSON line, for a sample of requests and for every slow one.
+"""
+
+import functools
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger("app.tracing")
+
+
+def configure_trace_logging() -> None:
+    """Emit trace records as bare JSON lines on stderr unless logging was configured elsewhere."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+@dataclass
+class RequestTrace:
+    method: str
+    path: str
+    started_at: float = field(default_factory=time.perf_counter)
+    status_code: Optional[int] = None
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    llm_cached_prompt_tokens: int = 0
+    llm_cache_write_tokens: int = 0
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def server_timing(self) -> str:
+        return ", ".join((
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_statements} queries"',
+            f'llm;dur={self.llm_seconds * 1000:.1f};desc="{self.llm_calls} calls"',
+            f"total;dur={self.elapsed_ms():.1f}"
+        ))
+
+    def to_log_record(self) -> dict:
+        return {
+            "event": "request",
+            "method": self.method,
+            "path": self.path,
+            "status": self.status_code,
+            "duration_ms": round(self.elapsed_ms(), 2),
+            "db_statements": self.db_statements,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "llm_calls": self.llm_calls,
+            "llm_ms": round(self.llm_seconds * 1000, 2),
+            "llm_prompt_tokens": self.llm_prompt_tokens,
+            "llm_completion_tokens": self.llm_completion_tokens,
+            "llm_cached_prompt_tokens": self.llm_cached_prompt_tokens,
+            "llm_cache_write_tokens": self.llm_cache_write_tokens
+        }
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """The trace of the request being handled, or None outside a traced request."""
+    return _current_trace.get()
+
+
+# Database
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault("trace_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    started = conn.info.get("trace_query_started")
+    if trace is not None and started:
+        trace.db_statements += 1
+        trace.db_seconds += time.perf_counter() - started.pop()
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    connection = exception_context.connection
+    started = connection.info.get("trace_query_started") if connection is not None else None
+    if started:
+        started.pop()
+
+
+def install_sql_tracing(engine: AsyncEngine) -> None:
+    """Count statements and DB time of `engine` against the active request trace."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# LLM providers
+
+@dataclass
+class _LLMCallFrame:
+    # Set when a traced call runs inside this one (e.g. a batch falling back to single calls)
+    nested: bool = False
+
+
+_current_llm_call: ContextVar[Optional[_LLMCallFrame]] = ContextVar("llm_call", default=None)
+
+
+def trace_llm_call(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Decorate a provider generate method so its duration and token usage are added
+    to the active trace. Works for single results
+    (text, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens) and for batch results
+    (a list of those). Only the innermost traced calls are counted, so a decorated method
+    calling another one is not counted twice.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        trace = _current_trace.get()
+        if trace is None:
+            return await func(*args, **kwargs)
+        parent = _current_llm_call.get()
+        if parent is not None:
+            parent.nested = True
+        frame = _LLMCallFrame()
+        token = _current_llm_call.set(frame)
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        finally:
+            _current_llm_call.reset(token)
+            if not frame.nested:
+                trace.llm_calls += 1
+                trace.llm_seconds += time.perf_counter() - started
+        if frame.nested:
+            return result
+        for _, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens in (
+            result if isinstance(result, list) else [result]
+        ):
+            trace.llm_prompt_tokens += prompt_tokens or 0
+            trace.llm_completion_tokens += completion_tokens or 0
+            trace.llm_cached_prompt_tokens += cached_prompt_tokens or 0
+            trace.llm_cache_write_tokens += cache_write_tokens or 0
+        return result
+
+    return wrapper
+
+
+# HTTP
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces every HTTP request.
+    Written as plain ASGI (not BaseHTTPMiddleware) so streaming responses pass through
+    untouched and the context variable is visible to the endpoint.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_request_ms: float = 1000,
+                 server_timing: bool = True):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(method=scope["method"], path=scope["path"])
+        token = _current_trace.set(trace)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            if trace.status_code is None:
+                trace.status_code = 500
+            duration_ms = trace.elapsed_ms()
+            if duration_ms >= self.slow_request_ms or random.random() < self.sample_rate:
+                logger.info(json.dumps(trace.to_log_record()))
+
@@ -0,0 +1,85 @@
+"""
+Startup warmup.
+
+The tokenizer, the model catalog and the AI provider HTTP client are loaded on first
+use, so imports (and CLI scripts) don't pay for them. A serving worker preloads them
+concurrently during the lifespan startup instead, so the first requests don't either,
+and reports how long its startup took.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_model_catalog() -> None:
+    from app.utils.ai_models import load_model_catalog
+    load_model_catalog()
+
+
+def _warm_tokenizer() -> None:
+    from app.utils.tokens import get_encoder, tokenizer_families
+    # Loads tiktoken and the encoder of every tokenizer family of the available models
+    for tokenizer in tokenizer_families():
+        get_encoder(tokenizer)
+
+
+def _warm_http_client() -> None:
+    importlib.import_module("aiohttp")
+
+
+WARMUP_STEPS: Dict[str, Callable[[], None]] = {
+    "model_catalog": _warm_model_catalog,
+    "tokenizer": _warm_tokenizer,
+    "http_client": _warm_http_client,
+}
+
+
+@dataclass
+class StartupReport:
+    import_seconds: float
+    warmup_seconds: float = 0.0
+    step_seconds: Dict[str, float] = field(default_factory=dict)
+    failed_steps: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.step_seconds.items())
+        line = f"Startup: app import {self.import_seconds * 1000:.0f} ms"
+        if steps:
+            line += f", warmup {self.warmup_seconds * 1000:.0f} ms ({steps})"
+        if self.failed_steps:
+            line += f"; warmup failed or timed out: {', '.join(self.failed_steps)}"
+        return line
+
+
+async def warm_up(report: StartupReport, timeout: float) -> StartupReport:
+    """
+    Run the warmup steps concurrently in worker threads and record their durations.
+    A failing or slow step is only reported: everything it loads is still loaded on first use.
+    """
+    started = time.perf_counter()
+
+    async def run_step(name: str, step: Callable[[], None]) -> None:
+        step_started = time.perf_counter()
+        try:
+            await asyncio.to_thread(step)
+        except Exception as e:
+            logger.warning(f"Startup warmup step '{name}' failed: {e}")
+            report.failed_steps.append(name)
+        finally:
+            report.step_seconds[name] = time.perf_counter() - step_started
+
+    tasks = [asyncio.create_task(run_step(name, step)) for name, step in WARMUP_STEPS.items()]
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        # The thread keeps running; the app just doesn't wait for it
+        task.cancel()
+        report.failed_steps.append(list(WARMUP_STEPS)[tasks.index(task)])
+
+    report.warmup_seconds = time.perf_counter() - started
+    return report
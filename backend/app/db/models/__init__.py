@@ -11,6 +11,9 @@ from app.db.models.contest_judge import ContestJudge
 from app.db.models.contest_member import ContestMember
 from app.db.models.agent_execution import AgentExecution
 from app.db.models.vote import Vote
+from app.db.models.contest_result_snapshot import ContestResultSnapshot
+from app.db.models.contest_text_tally import ContestTextTally
+from app.db.models.scheduled_judge_run import ScheduledJudgeRun
 
 # Import any remaining models
 # This ensures the SQLAlchemy mapper properly initializes relationships 
\ No newline at end of file
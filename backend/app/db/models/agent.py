@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -17,6 +17,7 @@ class Agent(Base):
     type = Column(String, nullable=False)  # "judge" or "writer"
     is_public = Column(Boolean, default=False)
     version = Column(String, nullable=False, default="1.0")  # Version of the base mechanism
+    routing = Column(JSON, nullable=True)  # Model fallback policy (ModelRoutingPolicy), None: no fallback
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
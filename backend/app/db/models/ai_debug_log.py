@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Index, JSON, LargeBinary
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -21,10 +21,12 @@ class AIDebugLog(Base):
     
     # What we send to LLM
     strategy_input = Column(Text, nullable=True)  # Variables passed to strategy
-    llm_prompt = Column(Text, nullable=True)      # Actual prompt sent to LLM
+    llm_prompt = Column(Text, nullable=True)      # Only set on rows logged before blob storage
+    llm_prompt_blobs = Column(JSON, nullable=True)    # Ordered AIDebugBlob hashes of the prompt
     
     # What we get back
-    llm_response = Column(Text, nullable=True)    # Raw LLM response
+    llm_response = Column(Text, nullable=True)    # Only set on rows logged before blob storage
+    llm_response_blobs = Column(JSON, nullable=True)  # Ordered AIDebugBlob hashes of the response
     parsed_output = Column(Text, nullable=True)   # What we extracted/parsed
     
     # Performance metrics
@@ -36,4 +38,23 @@ class AIDebugLog(Base):
     # Index for timestamp-based queries
     __table_args__ = (
         Index('idx_ai_debug_timestamp', 'timestamp'),
+    )
+
+
+class AIDebugBlob(Base):
+    """
+    Compressed, content-addressed chunk of an LLM prompt or response.
+    Prompts share long sections (base prompt, personalities, contest texts), so
+    each distinct chunk is stored once and debug logs reference it by hash.
+    """
+    __tablename__ = "ai_debug_blobs"
+
+    hash = Column(String(64), primary_key=True)  # sha256 of the uncompressed chunk
+    data = Column(LargeBinary, nullable=False)   # zlib-compressed UTF-8 chunk
+    size = Column(Integer, nullable=False)       # uncompressed size in bytes
+    # Timestamp of the newest log using the chunk, so retention can drop unused chunks
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('idx_ai_debug_blob_last_used', 'last_used_at'),
     ) 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,8 @@ class Contest(Base):
     status = Column(String, default="open")  # "open", "evaluation", "closed"
     judge_restrictions = Column(Boolean, default=False)  # Whether judges can participate as authors
     author_restrictions = Column(Boolean, default=False)  # Whether authors can submit multiple texts
+    # Assigned judges that haven't finished voting; the contest closes when it reaches 0
+    judges_remaining = Column(Integer, nullable=False, default=0, server_default="0")
     
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     creator = relationship("User", back_populates="contests")
@@ -28,4 +30,9 @@ class Contest(Base):
     
     end_date = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False) 
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Queue of contests waiting for their deadline, read by the lifecycle scheduler
+        Index("ix_contests_open_end_date", "end_date", postgresql_where=text("status = 'open'")),
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, JSON
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class ContestResultSnapshot(Base):
+    """
+    Read-only copy of a closed contest's submissions view: texts, rankings,
+    points and evaluations with judge names. Written when the contest closes
+    so closed-contest views are served from one row. Edits to the texts,
+    submissions or judge names it shows delete it; the next read rebuilds it.
+    """
+    __tablename__ = "contest_result_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contest_id = Column(Integer, ForeignKey("contests.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    # Incremented every time the snapshot is rebuilt
+    version = Column(Integer, nullable=False, default=1)
+
+    # Serialized ContestTextResponse list, as returned by the submissions endpoint
+    submissions = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class ContestTextTally(Base):
+    """
+    Running vote totals of one text in one contest.
+    Maintained by VoteRepository whenever votes are created or deleted, so standings
+    can be read during evaluation and closure only has to rank the texts.
+    """
+    __tablename__ = "contest_text_tallies"
+
+    contest_id = Column(Integer, ForeignKey("contests.id", ondelete="CASCADE"), primary_key=True)
+    text_id = Column(Integer, ForeignKey("texts.id", ondelete="CASCADE"), primary_key=True)
+
+    # Points derived from text_place (1st = 3, 2nd = 2, 3rd = 1)
+    points = Column(Integer, nullable=False, default=0)
+    first_places = Column(Integer, nullable=False, default=0)
+    second_places = Column(Integer, nullable=False, default=0)
+    third_places = Column(Integer, nullable=False, default=0)
+    vote_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
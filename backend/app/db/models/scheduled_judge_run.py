@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class ScheduledJudgeRun(Base):
+    """
+    An AI judge the contest scheduler still has to run, written in the same transaction
+    that moves its contest to evaluation. Workers lease a row while they run the judge and
+    delete it when they are done, so pending runs survive restarts and crashes.
+    """
+    __tablename__ = "scheduled_judge_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contest_id = Column(Integer, ForeignKey("contests.id", ondelete="CASCADE"), nullable=False)
+    agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"), nullable=False)
+
+    # Times a worker has taken the run; it is dropped after too many failed attempts
+    attempts = Column(Integer, nullable=False, default=0)
+    # Set while a worker runs the judge; once it passes, another worker may retry it
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("contest_id", "agent_id", name="uq_scheduled_judge_runs_contest_agent"),
+    )
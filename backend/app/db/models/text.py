@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,11 @@ class Text(Base):
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     author = Column(String, nullable=False)
+
+    # Size of the content, kept current on create/update for cost estimation without loading it:
+    # characters and {tokenizer family: tokens}. Null on rows written before they existed.
+    content_chars = Column(Integer, nullable=True)
+    content_tokens = Column(JSON, nullable=True)
     
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     owner = relationship("User", back_populates="texts")
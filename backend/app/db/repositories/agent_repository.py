@@ -4,7 +4,13 @@ from sqlalchemy import select, delete
 
 from app.db.models.agent import Agent
 from app.db.models.agent_execution import AgentExecution
+from app.db.models.contest_judge import ContestJudge
+from app.db.models.vote import Vote
+from app.db.repositories.vote_repository import VoteRepository
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.results_snapshot_repository import ResultsSnapshotRepository
 from app.schemas.agent import AgentCreate, AgentUpdate
+from app.core.cache import get_cache, row_to_dict, rehydrate, rehydrate_all
 
 
 class AgentRepository:
@@ -17,19 +23,32 @@ class AgentRepository:
             prompt=agent_data.prompt,
             type=agent_data.type,
             is_public=agent_data.is_public,
+            routing=agent_data.routing.model_dump() if agent_data.routing else None,
             owner_id=owner_id
         )
         db.add(db_agent)
         await db.commit()
+        if db_agent.is_public:
+            await get_cache().invalidate_tags("agents:public")
         await db.refresh(db_agent)
         return db_agent
     
     @staticmethod
-    async def get_agent_by_id(db: AsyncSession, agent_id: int) -> Optional[Agent]:
+    async def get_agent_by_id(db: AsyncSession, agent_id: int, use_cache: bool = True) -> Optional[Agent]:
         """Get an agent by ID."""
+        cache = get_cache()
+        cache_key = f"agent:{agent_id}"
+        if use_cache:
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return await rehydrate(db, Agent, cached)
+
         stmt = select(Agent).filter(Agent.id == agent_id)
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        agent = result.scalar_one_or_none()
+        if agent is not None:
+            await cache.set(cache_key, row_to_dict(agent), tags=[cache_key])
+        return agent
     
     @staticmethod
     async def get_agents_by_owner(db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Agent]:
@@ -41,18 +60,31 @@ class AgentRepository:
     @staticmethod
     async def get_public_agents(db: AsyncSession, agent_type: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Agent]:
         """Get all public agents, optionally filtered by type."""
+        cache = get_cache()
+        cache_key = f"agents:public:{agent_type or 'all'}:{skip}:{limit}"
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return await rehydrate_all(db, Agent, cached)
+
         stmt = select(Agent).where(Agent.is_public == True)
         if agent_type:
             stmt = stmt.where(Agent.type == agent_type)
             
         stmt = stmt.offset(skip).limit(limit)
         result = await db.execute(stmt)
-        return result.scalars().all()
+        agents = result.scalars().all()
+        await cache.set(cache_key, [row_to_dict(agent) for agent in agents], tags=["agents:public"])
+        return agents
+
+    @staticmethod
+    async def invalidate_agent_cache(agent_id: int) -> None:
+        """Drop cached reads of this agent, the public listings and judge lists that include it."""
+        await get_cache().invalidate_tags(f"agent:{agent_id}", "agents:public")
     
     @staticmethod
     async def update_agent(db: AsyncSession, agent_id: int, agent_data: AgentUpdate) -> Optional[Agent]:
         """Update an agent."""
-        db_agent = await AgentRepository.get_agent_by_id(db, agent_id)
+        db_agent = await AgentRepository.get_agent_by_id(db, agent_id, use_cache=False)
         if not db_agent:
             return None
             
@@ -60,20 +92,41 @@ class AgentRepository:
         
         for key, value in update_data.items():
             setattr(db_agent, key, value)
+        if "name" in update_data:
+            # Results snapshots of the contests it judged show the agent's name
+            await ResultsSnapshotRepository.delete_snapshots(
+                db, select(ContestJudge.contest_id).where(ContestJudge.agent_judge_id == agent_id)
+            )
             
         await db.commit()
+        await AgentRepository.invalidate_agent_cache(agent_id)
         await db.refresh(db_agent)
         return db_agent
     
     @staticmethod
     async def delete_agent(db: AsyncSession, agent_id: int) -> bool:
         """Delete an agent."""
-        db_agent = await AgentRepository.get_agent_by_id(db, agent_id)
+        db_agent = await AgentRepository.get_agent_by_id(db, agent_id, use_cache=False)
         if not db_agent:
             return False
             
+        # The agent's judge assignments and their votes are deleted with it (ON DELETE CASCADE)
+        judged_contests = await db.execute(
+            select(ContestJudge.contest_id).where(ContestJudge.agent_judge_id == agent_id).distinct()
+        )
+        judged_contest_ids = judged_contests.scalars().all()
+        await VoteRepository.apply_votes_to_tallies(
+            db,
+            Vote.contest_judge_id.in_(select(ContestJudge.id).where(ContestJudge.agent_judge_id == agent_id)),
+            sign=-1
+        )
+        await ContestRepository.release_judge_assignments(db, ContestJudge.agent_judge_id == agent_id)
+        await ResultsSnapshotRepository.delete_snapshots(db, judged_contest_ids)
         await db.delete(db_agent)
         await db.commit()
+        await AgentRepository.invalidate_agent_cache(agent_id)
+        for contest_id in judged_contest_ids:
+            await ContestRepository.invalidate_contest_cache(contest_id)
         return True
     
     @staticmethod
@@ -1,15 +1,26 @@
-from typing import List, Optional, Union
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Integer, select, func, insert, update, delete, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
 
+from app.db.models.agent import Agent
 from app.db.models.contest import Contest
 from app.db.models.contest_text import ContestText
 from app.db.models.contest_judge import ContestJudge
 from app.db.models.contest_member import ContestMember
 from app.db.models.text import Text
+from app.db.models.scheduled_judge_run import ScheduledJudgeRun
+from app.db.models.user import User
+from app.db.models.vote import Vote
+from app.db.repositories.vote_repository import VoteRepository
+from app.db.repositories.results_snapshot_repository import ResultsSnapshotRepository
 from app.schemas.contest import ContestCreate, ContestUpdate
+from app.core.cache import get_cache, row_to_dict, rehydrate, rehydrate_all
+from app.utils.tokens import CHARS_PER_TOKEN
 
 
 class ContestRepository:
@@ -176,9 +187,120 @@ class ContestRepository:
     
     @staticmethod
     async def get_contest(db: AsyncSession, contest_id: int) -> Optional[Contest]:
+        cache = get_cache()
+        cache_key = f"contest:{contest_id}"
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return await rehydrate(db, Contest, cached)
+
         result = await db.execute(select(Contest).filter(Contest.id == contest_id))
-        return result.scalar_one_or_none()
+        contest = result.scalar_one_or_none()
+        if contest is not None:
+            await cache.set(cache_key, row_to_dict(contest), tags=[cache_key])
+        return contest
+
+    @staticmethod
+    async def invalidate_contest_cache(contest_id: int) -> None:
+        """Drop every cached read that depends on this contest (row, judge list)."""
+        await get_cache().invalidate_tags(f"contest:{contest_id}")
     
+    @staticmethod
+    async def claim_due_contests(
+        db: AsyncSession, now: datetime, limit: int = 50, schedule_ai_judges: bool = False
+    ) -> List:
+        """
+        Move open contests whose end_date has passed to evaluation, returning (id, creator_id)
+        of the contests this call transitioned. The status condition makes the claim
+        idempotent: when several workers race, each contest is returned to exactly one.
+        With schedule_ai_judges, the AI judges of the claimed contests that haven't voted yet
+        are written to scheduled_judge_runs in the same transaction.
+        """
+        due_ids = (
+            select(Contest.id)
+            .where(Contest.status == "open", Contest.end_date.is_not(None), Contest.end_date <= now)
+            .order_by(Contest.end_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Contest)
+            .where(Contest.id.in_(due_ids.scalar_subquery()), Contest.status == "open")
+            .values(status="evaluation")
+            .returning(Contest.id, Contest.creator_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        claimed = result.all()
+        if claimed and schedule_ai_judges:
+            pending = select(ContestJudge.contest_id, ContestJudge.agent_judge_id).where(
+                ContestJudge.contest_id.in_([row.id for row in claimed]),
+                ContestJudge.agent_judge_id.is_not(None),
+                func.coalesce(ContestJudge.has_voted, False).is_(False)
+            ).order_by(ContestJudge.contest_id, ContestJudge.id)
+            await db.execute(
+                insert(ScheduledJudgeRun).from_select(
+                    [ScheduledJudgeRun.contest_id, ScheduledJudgeRun.agent_id], pending
+                )
+            )
+        await db.commit()
+        for row in claimed:
+            await ContestRepository.invalidate_contest_cache(row.id)
+        return claimed
+
+    @staticmethod
+    async def get_next_end_date(db: AsyncSession) -> Optional[datetime]:
+        """Earliest end_date among open contests (served by ix_contests_open_end_date)."""
+        result = await db.execute(
+            select(func.min(Contest.end_date)).where(Contest.status == "open")
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def claim_judge_run(db: AsyncSession, now: datetime, lease_seconds: int):
+        """
+        Lease the oldest scheduled AI judge run that no worker holds, returning (id, contest_id,
+        agent_id, creator_id, attempts), or None when there is nothing to run. The lease lasts
+        lease_seconds; if the worker dies, the run is picked up again once it expires.
+        """
+        free_id = (
+            select(ScheduledJudgeRun.id)
+            .where(or_(ScheduledJudgeRun.locked_until.is_(None), ScheduledJudgeRun.locked_until <= now))
+            .order_by(ScheduledJudgeRun.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        creator_id = (
+            select(Contest.creator_id)
+            .where(Contest.id == ScheduledJudgeRun.contest_id)
+            .scalar_subquery()
+            .label("creator_id")
+        )
+        stmt = (
+            update(ScheduledJudgeRun)
+            .where(
+                ScheduledJudgeRun.id == free_id.scalar_subquery(),
+                or_(ScheduledJudgeRun.locked_until.is_(None), ScheduledJudgeRun.locked_until <= now)
+            )
+            .values(locked_until=now + timedelta(seconds=lease_seconds), attempts=ScheduledJudgeRun.attempts + 1)
+            .returning(ScheduledJudgeRun.id, ScheduledJudgeRun.contest_id, ScheduledJudgeRun.agent_id,
+                       creator_id, ScheduledJudgeRun.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        run = result.one_or_none()
+        await db.commit()
+        return run
+
+    @staticmethod
+    async def delete_judge_run(db: AsyncSession, run_id: int) -> None:
+        """Remove a scheduled AI judge run once it has finished or has been given up on."""
+        await db.execute(
+            delete(ScheduledJudgeRun)
+            .where(ScheduledJudgeRun.id == run_id)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
     @staticmethod
     async def update_contest(
         db: AsyncSession, contest_id: int, contest_update: ContestUpdate
@@ -195,6 +317,7 @@ class ContestRepository:
             setattr(db_contest, key, value)
         
         await db.commit()
+        await ContestRepository.invalidate_contest_cache(contest_id)
         await db.refresh(db_contest)
         return db_contest
     
@@ -209,6 +332,7 @@ class ContestRepository:
         
         await db.delete(db_contest)
         await db.commit()
+        await ContestRepository.invalidate_contest_cache(contest_id)
         return True
     
     @staticmethod
@@ -280,6 +404,73 @@ class ContestRepository:
         
         return contest_data
     
+    @staticmethod
+    async def get_contest_detail_version(db: AsyncSession, contest_id: int):
+        """
+        Cheap aggregate describing the current version of a contest's detail view
+        (contest row, creator, submissions, judges and members). Used to build ETags.
+        """
+        texts_count = select(func.count(ContestText.id)).where(ContestText.contest_id == contest_id).scalar_subquery()
+        texts_max_id = select(func.max(ContestText.id)).where(ContestText.contest_id == contest_id).scalar_subquery()
+        judges_count = select(func.count(ContestJudge.id)).where(ContestJudge.contest_id == contest_id).scalar_subquery()
+        judges_max_id = select(func.max(ContestJudge.id)).where(ContestJudge.contest_id == contest_id).scalar_subquery()
+        judges_voted = select(func.count(ContestJudge.id)).where(
+            ContestJudge.contest_id == contest_id, ContestJudge.has_voted.is_(True)
+        ).scalar_subquery()
+        members_count = select(func.count(ContestMember.id)).where(ContestMember.contest_id == contest_id).scalar_subquery()
+        members_max_id = select(func.max(ContestMember.id)).where(ContestMember.contest_id == contest_id).scalar_subquery()
+
+        stmt = select(
+            Contest.id,
+            Contest.updated_at,
+            User.username.label("creator_username"),
+            texts_count.label("texts_count"),
+            texts_max_id.label("texts_max_id"),
+            judges_count.label("judges_count"),
+            judges_max_id.label("judges_max_id"),
+            judges_voted.label("judges_voted"),
+            members_count.label("members_count"),
+            members_max_id.label("members_max_id")
+        ).outerjoin(User, Contest.creator_id == User.id).filter(Contest.id == contest_id)
+        result = await db.execute(stmt)
+        return result.first()
+
+    @staticmethod
+    async def get_submissions_version(db: AsyncSession, contest_id: int):
+        """
+        Cheap aggregate describing the current version of a contest's submissions view
+        (submissions, their texts, votes, rankings and judge names). Used to build ETags.
+        """
+        texts_count = select(func.count(ContestText.id)).where(ContestText.contest_id == contest_id).scalar_subquery()
+        texts_max_id = select(func.max(ContestText.id)).where(ContestText.contest_id == contest_id).scalar_subquery()
+        points_sum = select(func.sum(ContestText.total_points)).where(ContestText.contest_id == contest_id).scalar_subquery()
+        texts_updated = select(func.max(Text.updated_at)).join(
+            ContestText, ContestText.text_id == Text.id
+        ).where(ContestText.contest_id == contest_id).scalar_subquery()
+        votes_count = select(func.count(Vote.id)).where(Vote.contest_id == contest_id).scalar_subquery()
+        votes_max_id = select(func.max(Vote.id)).where(Vote.contest_id == contest_id).scalar_subquery()
+        judge_users_updated = select(func.max(User.updated_at)).join(
+            ContestJudge, ContestJudge.user_judge_id == User.id
+        ).where(ContestJudge.contest_id == contest_id).scalar_subquery()
+        judge_agents_updated = select(func.max(Agent.updated_at)).join(
+            ContestJudge, ContestJudge.agent_judge_id == Agent.id
+        ).where(ContestJudge.contest_id == contest_id).scalar_subquery()
+
+        stmt = select(
+            Contest.id,
+            Contest.updated_at,
+            texts_count.label("texts_count"),
+            texts_max_id.label("texts_max_id"),
+            points_sum.label("points_sum"),
+            texts_updated.label("texts_updated_at"),
+            votes_count.label("votes_count"),
+            votes_max_id.label("votes_max_id"),
+            judge_users_updated.label("judge_users_updated_at"),
+            judge_agents_updated.label("judge_agents_updated_at")
+        ).filter(Contest.id == contest_id)
+        result = await db.execute(stmt)
+        return result.first()
+
     # Methods for contest text submissions
     @staticmethod
     async def submit_text_to_contest(db: AsyncSession, contest_id: int, text_id: int) -> Optional[ContestText]:
@@ -302,6 +493,84 @@ class ContestRepository:
         await db.refresh(db_contest_text)
         return db_contest_text
     
+    @staticmethod
+    async def get_submission_eligibility(db: AsyncSession, contest_ids: Iterable[int], user_id: int) -> List:
+        """
+        Load contests together with the submitting user's relation to each of them, in one query.
+        Rows are (Contest, is_member, is_judge, has_own_submission).
+        """
+        is_member = select(ContestMember.id).where(
+            ContestMember.contest_id == Contest.id,
+            ContestMember.user_id == user_id
+        ).exists()
+        is_judge = select(ContestJudge.id).where(
+            ContestJudge.contest_id == Contest.id,
+            ContestJudge.user_judge_id == user_id
+        ).exists()
+        has_own_submission = select(ContestText.id).join(Text, Text.id == ContestText.text_id).where(
+            ContestText.contest_id == Contest.id,
+            Text.owner_id == user_id
+        ).exists()
+        stmt = select(
+            Contest,
+            is_member.label("is_member"),
+            is_judge.label("is_judge"),
+            has_own_submission.label("has_own_submission")
+        ).where(Contest.id.in_(list(contest_ids)))
+        result = await db.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    async def bulk_submit_texts(db: AsyncSession, pairs: List[Tuple[int, int]]) -> List:
+        """
+        Insert (contest_id, text_id) submissions with a single statement. Pairs that are
+        already submitted are skipped by the contest_text_unique index rather than failing
+        the statement. Returns (id, contest_id, text_id, submission_date) of inserted rows.
+        """
+        if not pairs:
+            return []
+        values = [{"contest_id": contest_id, "text_id": text_id} for contest_id, text_id in pairs]
+        returning = (ContestText.id, ContestText.contest_id, ContestText.text_id, ContestText.submission_date)
+
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(ContestText).values(values).on_conflict_do_nothing(
+                index_elements=[ContestText.contest_id, ContestText.text_id]
+            ).returning(*returning)
+            result = await db.execute(stmt)
+            inserted = result.all()
+        else:
+            # No portable "insert or ignore": insert row by row behind savepoints
+            inserted = []
+            for row in values:
+                try:
+                    async with db.begin_nested():
+                        result = await db.execute(insert(ContestText).values(**row).returning(*returning))
+                        inserted.append(result.one())
+                except IntegrityError:
+                    pass
+        await db.commit()
+        return inserted
+
+    @staticmethod
+    async def get_contest_text_size(db: AsyncSession, contest_id: int, tokenizer: str) -> Tuple[int, int]:
+        """
+        Number of submissions of a contest and their total tokens (title and content) for a
+        tokenizer family, summed in SQL from the stored counts without loading any content.
+        Texts without a stored count for the tokenizer are approximated from their length.
+        """
+        chars = func.coalesce(Text.content_chars, func.length(Text.content, type_=Integer))
+        content_tokens = func.coalesce(Text.content_tokens[tokenizer].as_integer(), chars // CHARS_PER_TOKEN)
+        title_tokens = func.length(Text.title, type_=Integer) // CHARS_PER_TOKEN
+        stmt = (
+            select(func.count(ContestText.id), func.coalesce(func.sum(content_tokens + title_tokens), 0))
+            .join(Text, Text.id == ContestText.text_id)
+            .where(ContestText.contest_id == contest_id)
+        )
+        text_count, total_tokens = (await db.execute(stmt)).one()
+        return text_count, int(total_tokens)
+
     @staticmethod
     async def get_contest_texts(db: AsyncSession, contest_id: int) -> List[ContestText]:
         stmt = select(ContestText).filter(
@@ -340,6 +609,7 @@ class ContestRepository:
         if not db_contest_text:
             return False
             
+        await ResultsSnapshotRepository.delete_snapshots(db, [contest_id])
         await db.delete(db_contest_text)
         await db.commit()
         return True
@@ -352,6 +622,7 @@ class ContestRepository:
         if not db_submission:
             return False
             
+        await ResultsSnapshotRepository.delete_snapshots(db, [db_submission.contest_id])
         await db.delete(db_submission)
         await db.commit()
         return True
@@ -393,7 +664,10 @@ class ContestRepository:
 
         db.add(db_contest_judge)
         try:
+            # A new assignment is one more judge the contest waits for
+            await ContestRepository._adjust_judges_remaining(db, contest_id, 1)
             await db.commit()
+            await ContestRepository.invalidate_contest_cache(contest_id)
             await db.refresh(db_contest_judge)
             return db_contest_judge
         except IntegrityError: # Catch potential unique constraint violations not caught by prior check
@@ -409,11 +683,130 @@ class ContestRepository:
 
     @staticmethod
     async def get_contest_judges(db: AsyncSession, contest_id: int) -> List[ContestJudge]:
+        cache = get_cache()
+        cache_key = f"contest:{contest_id}:judges"
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return await rehydrate_all(db, ContestJudge, cached)
+
         stmt = select(ContestJudge).filter(
             ContestJudge.contest_id == contest_id
         )
         result = await db.execute(stmt)
-        return result.scalars().all()
+        judges = result.scalars().all()
+        # Also tag by judge identity: deleting a user/agent cascades to its assignments
+        tags = {f"contest:{contest_id}", cache_key}
+        for judge in judges:
+            if judge.user_judge_id:
+                tags.add(f"user:{judge.user_judge_id}")
+            if judge.agent_judge_id:
+                tags.add(f"agent:{judge.agent_judge_id}")
+        await cache.set(cache_key, [row_to_dict(judge) for judge in judges], tags=tags)
+        return judges
+
+    @staticmethod
+    async def set_judge_has_voted(db: AsyncSession, contest_judge: ContestJudge, has_voted: bool) -> Optional[int]:
+        """
+        Mark a judge assignment as done (or not done) voting and keep the contest's
+        judges_remaining counter in step, in one transaction. The flag is flipped with a
+        conditional UPDATE, so concurrent calls for the same judge only count once.
+        Returns the contest's judges_remaining after the change, or None if the flag
+        already had that value.
+        """
+        flipped = await db.execute(
+            update(ContestJudge)
+            .where(
+                ContestJudge.id == contest_judge.id,
+                func.coalesce(ContestJudge.has_voted, False).is_(not has_voted)
+            )
+            .values(has_voted=has_voted)
+            .returning(ContestJudge.id)
+            .execution_options(synchronize_session=False)
+        )
+        remaining = None
+        if flipped.first() is not None:
+            remaining = await ContestRepository._adjust_judges_remaining(
+                db, contest_judge.contest_id, -1 if has_voted else 1
+            )
+        await db.commit()
+        set_committed_value(contest_judge, "has_voted", has_voted)
+        await ContestRepository.invalidate_contest_cache(contest_judge.contest_id)
+        return remaining
+
+    @staticmethod
+    async def _adjust_judges_remaining(db: AsyncSession, contest_id: int, delta: int) -> int:
+        """Atomically add `delta` to a contest's judges_remaining and return the new value. Doesn't commit."""
+        result = await db.execute(
+            update(Contest)
+            .where(Contest.id == contest_id)
+            .values(judges_remaining=Contest.judges_remaining + delta)
+            .returning(Contest.judges_remaining)
+            .execution_options(synchronize_session=False)
+        )
+        remaining = result.scalar_one()
+        contest = db.sync_session.identity_map.get(db.sync_session.identity_key(Contest, contest_id))
+        if contest is not None:
+            set_committed_value(contest, "judges_remaining", remaining)
+        return remaining
+
+    @staticmethod
+    async def release_judge_assignments(db: AsyncSession, *criteria) -> None:
+        """
+        Take the not-yet-voted judge assignments matching `criteria` out of their contests'
+        judges_remaining counters. Call it before deleting the assignments (or the user/agent
+        they cascade from), in the same transaction. Doesn't commit.
+        """
+        pending = select(func.count(ContestJudge.id)).where(
+            ContestJudge.contest_id == Contest.id,
+            func.coalesce(ContestJudge.has_voted, False).is_(False),
+            *criteria
+        ).scalar_subquery()
+        await db.execute(
+            update(Contest)
+            .where(Contest.id.in_(select(ContestJudge.contest_id).where(*criteria)))
+            .values(judges_remaining=Contest.judges_remaining - pending)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def close_completed_contest(db: AsyncSession, contest_id: int) -> bool:
+        """
+        Close a contest in evaluation once all of its judges have voted. The conditional UPDATE
+        locks the contest row, so when several requests race only one of them gets True and
+        goes on to compute the results. Doesn't commit: the caller writes the results in the
+        same transaction, commits and invalidates the contest cache.
+        """
+        has_judges = select(ContestJudge.id).where(ContestJudge.contest_id == Contest.id).exists()
+        result = await db.execute(
+            update(Contest)
+            .where(
+                Contest.id == contest_id,
+                Contest.status == "evaluation",
+                Contest.judges_remaining <= 0,
+                has_judges
+            )
+            .values(status="closed")
+            .returning(Contest.id)
+            .execution_options(synchronize_session=False)
+        )
+        closed = result.first() is not None
+        if closed:
+            contest = db.sync_session.identity_map.get(db.sync_session.identity_key(Contest, contest_id))
+            if contest is not None:
+                set_committed_value(contest, "status", "closed")
+        return closed
+
+    @staticmethod
+    async def get_completed_evaluation_contest_ids(db: AsyncSession, limit: int = 50) -> List[int]:
+        """IDs of contests still in evaluation although all of their judges have voted."""
+        has_judges = select(ContestJudge.id).where(ContestJudge.contest_id == Contest.id).exists()
+        result = await db.execute(
+            select(Contest.id)
+            .where(Contest.status == "evaluation", Contest.judges_remaining <= 0, has_judges)
+            .order_by(Contest.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
     
     @staticmethod
     async def remove_judge_from_contest(db: AsyncSession, contest_id: int, contest_judge_id: int) -> bool:
@@ -428,10 +821,31 @@ class ContestRepository:
         if not db_contest_judge:
             return False # Assignment not found or doesn't belong to this contest
             
+        # The judge's votes are deleted with the assignment (ON DELETE CASCADE)
+        await VoteRepository.apply_votes_to_tallies(db, Vote.contest_judge_id == contest_judge_id, sign=-1)
+        await ContestRepository.release_judge_assignments(db, ContestJudge.id == contest_judge_id)
+        await ResultsSnapshotRepository.delete_snapshots(db, [contest_id])
         await db.delete(db_contest_judge)
         await db.commit()
+        await ContestRepository.invalidate_contest_cache(contest_id)
         return True
     
+    @staticmethod
+    async def get_pending_judge_contests(db: AsyncSession, user_judge_id: int) -> List[Contest]:
+        """Get contests in evaluation where the given user is a judge and hasn't finished voting."""
+        stmt = (
+            select(Contest)
+            .join(ContestJudge, Contest.id == ContestJudge.contest_id)
+            .filter(
+                ContestJudge.user_judge_id == user_judge_id,
+                func.coalesce(ContestJudge.has_voted, False).is_(False),
+                func.lower(Contest.status) == "evaluation"
+            )
+            .order_by(Contest.id.desc())
+        )
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
     @staticmethod
     async def get_contests_for_judge(db: AsyncSession, user_judge_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
         """Get all contests where the given user_id is a judge with counts."""
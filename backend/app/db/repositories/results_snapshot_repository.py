@@ -0,0 +1,63 @@
+from typing import List, Optional, Dict, Any, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, Select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.models.contest_result_snapshot import ContestResultSnapshot
+
+
+class ResultsSnapshotRepository:
+    @staticmethod
+    async def get_snapshot(db: AsyncSession, contest_id: int) -> Optional[ContestResultSnapshot]:
+        """Get the results snapshot for a contest, if one has been written."""
+        stmt = select(ContestResultSnapshot).filter(ContestResultSnapshot.contest_id == contest_id)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def save_snapshot(
+        db: AsyncSession, contest_id: int, submissions: List[Dict[str, Any]], commit: bool = True
+    ) -> ContestResultSnapshot:
+        """
+        Create the snapshot for a contest, or replace it and bump its version. Runs as a single
+        INSERT ... ON CONFLICT DO UPDATE, so concurrent rebuilds of the same snapshot don't collide.
+        With commit=False the caller commits.
+        """
+        dialect_insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        stmt = dialect_insert(ContestResultSnapshot).values(contest_id=contest_id, submissions=submissions, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ContestResultSnapshot.contest_id],
+            set_={
+                "submissions": stmt.excluded.submissions,
+                "version": ContestResultSnapshot.version + 1,
+                "updated_at": func.now()
+            }
+        ).returning(ContestResultSnapshot)
+        result = await db.execute(
+            select(ContestResultSnapshot).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        snapshot = result.scalar_one()
+        if commit:
+            await db.commit()
+        return snapshot
+
+    @staticmethod
+    async def delete_snapshot(db: AsyncSession, contest_id: int) -> bool:
+        """Delete the snapshot for a contest (e.g. when it is reopened)."""
+        stmt = delete(ContestResultSnapshot).where(ContestResultSnapshot.contest_id == contest_id)
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def delete_snapshots(db: AsyncSession, contest_ids: Union[List[int], Select]) -> None:
+        """
+        Drop the snapshots of the given contests (IDs, or a SELECT of contest IDs) after a change to
+        something they show: a text, a submission or a judge's name. The next read of each contest
+        rebuilds its snapshot. Call it in the same transaction as the change. Doesn't commit.
+        """
+        await db.execute(
+            delete(ContestResultSnapshot)
+            .where(ContestResultSnapshot.contest_id.in_(contest_ids))
+            .execution_options(synchronize_session=False)
+        )
@@ -1,11 +1,14 @@
-from typing import List, Optional
+import asyncio
+from typing import Dict, Iterable, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.db.models import Text, User
 from app.db.models.contest_text import ContestText
 from app.db.models.contest import Contest
+from app.db.repositories.results_snapshot_repository import ResultsSnapshotRepository
 from app.schemas.text import TextCreate, TextUpdate
+from app.utils.tokens import count_text_tokens
 
 
 class TextRepository:
@@ -19,16 +22,31 @@ class TextRepository:
             author=text_data.author,
             owner_id=owner_id
         )
+        await self._set_content_size(db_text)
         self.db.add(db_text)
         await self.db.commit()
         await self.db.refresh(db_text)
         return db_text
     
+    @staticmethod
+    async def _set_content_size(db_text: Text) -> None:
+        """Store the content's character and per-tokenizer token counts (tokenized off the event loop)."""
+        db_text.content_chars = len(db_text.content)
+        db_text.content_tokens = await asyncio.to_thread(count_text_tokens, db_text.content)
+
     async def get_text(self, text_id: int) -> Optional[Text]:
         stmt = select(Text).filter(Text.id == text_id)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
+    async def get_owner_ids(self, text_ids: Iterable[int]) -> Dict[int, int]:
+        """Map text IDs to their owner IDs (missing texts are left out)."""
+        text_ids = list(text_ids)
+        if not text_ids:
+            return {}
+        result = await self.db.execute(select(Text.id, Text.owner_id).where(Text.id.in_(text_ids)))
+        return {row.id: row.owner_id for row in result}
+
     async def get_texts(self, skip: int = 0, limit: int = 100) -> List[Text]:
         stmt = select(Text).offset(skip).limit(limit)
         result = await self.db.execute(stmt)
@@ -58,6 +76,10 @@ class TextRepository:
         update_data = text_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_text, key, value)
+        if "content" in update_data:
+            await self._set_content_size(db_text)
+        # Closed contests showing this text rebuild their results snapshot on the next read
+        await ResultsSnapshotRepository.delete_snapshots(self.db, self._submitted_contest_ids(text_id))
         
         await self.db.commit()
         await self.db.refresh(db_text)
@@ -68,9 +90,14 @@ class TextRepository:
         if db_text is None:
             return False
         
+        await ResultsSnapshotRepository.delete_snapshots(self.db, self._submitted_contest_ids(text_id))
         await self.db.delete(db_text)
         await self.db.commit()
         return True
+
+    @staticmethod
+    def _submitted_contest_ids(text_id: int):
+        return select(ContestText.contest_id).where(ContestText.text_id == text_id)
     
     async def get_contest_text(self, text_id: int) -> Optional[ContestText]:
         # Get the most recent contest text entry for this text
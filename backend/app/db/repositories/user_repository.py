@@ -1,22 +1,80 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete, func
+from sqlalchemy import update, delete, func, case
 from typing import List
 from datetime import datetime
 
 from app.db.models.user import User
 from app.db.models.contest import Contest
+from app.db.models.text import Text
+from app.db.models.agent import Agent
+from app.db.models.contest_judge import ContestJudge
+from app.db.models.contest_text import ContestText
+from app.db.models.vote import Vote
 from app.schemas.user import UserCreate, UserUpdate, UserCredit
-from app.core.security import get_password_hash
+from app.core.security import hash_password
+from app.db.repositories.vote_repository import VoteRepository
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.results_snapshot_repository import ResultsSnapshotRepository
+from app.core.cache import detached, get_cache, row_to_dict, rehydrate
+from app.core.config import settings
+
+# Never written to the cache (which may be a shared Redis)
+CACHE_EXCLUDED_COLUMNS = ("hashed_password",)
 
 class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
         
-    async def get_by_id(self, user_id: int) -> User:
-        """Get a user by ID."""
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        return result.scalars().first()
+    async def get_by_id(self, user_id: int, use_cache: bool = True) -> User:
+        """
+        Get a user by ID. Pass use_cache=False where the row must be current (credits):
+        the SELECT then also refreshes an instance already rehydrated into the session.
+        """
+        cache = get_cache()
+        cache_key = f"user:{user_id}"
+        if use_cache:
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return await rehydrate(self.db, User, cached)
+
+        result = await self.db.execute(
+            select(User).where(User.id == user_id).execution_options(populate_existing=True)
+        )
+        user = result.scalars().first()
+        if user is not None:
+            await cache.set(cache_key, row_to_dict(user, exclude=CACHE_EXCLUDED_COLUMNS), tags=[cache_key])
+        return user
+
+    async def get_principal(self, user_id: int, username: str) -> User:
+        """
+        Get the user an access token was issued to, from a short-lived principal cache.
+        Returns None if the user no longer exists or no longer matches the token's subject.
+        The principal is a detached, read-only copy without secrets: load the user through
+        the repository to change it.
+        """
+        cache = get_cache()
+        cache_key = f"principal:{user_id}"
+        cached = await cache.get(cache_key)
+        if cached is None:
+            result = await self.db.execute(select(User).where(User.id == user_id))
+            user = result.scalars().first()
+            if user is None:
+                return None
+            cached = row_to_dict(user, exclude=CACHE_EXCLUDED_COLUMNS)
+            await cache.set(
+                cache_key,
+                cached,
+                ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+                tags=[f"user:{user_id}"]
+            )
+        if cached["username"] != username:
+            return None
+        return detached(User, cached)
+
+    async def invalidate_user_cache(self, user_id: int) -> None:
+        """Drop cached reads of this user (including their principal) and the judge lists that include them."""
+        await get_cache().invalidate_tags(f"user:{user_id}")
         
     async def get_by_username(self, username: str) -> User:
         """Get a user by username."""
@@ -79,6 +137,25 @@ class UserRepository:
         
         return users
         
+    async def get_activity_counts(self, user_id: int) -> dict:
+        """Count a user's texts, agents and created contests in a single query."""
+        text_count = select(func.count(Text.id)).where(Text.owner_id == user_id).scalar_subquery()
+        agent_count = select(func.count(Agent.id)).where(Agent.owner_id == user_id).scalar_subquery()
+        contest_count = select(func.count(Contest.id)).where(Contest.creator_id == user_id).scalar_subquery()
+        result = await self.db.execute(
+            select(
+                text_count.label("text_count"),
+                agent_count.label("agent_count"),
+                contest_count.label("contest_count")
+            )
+        )
+        row = result.one()
+        return {
+            "text_count": row.text_count,
+            "agent_count": row.agent_count,
+            "contest_count": row.contest_count
+        }
+        
     async def search_users(self, query: str, skip: int = 0, limit: int = 10):
         """Search users by username or email with pagination."""
         search_pattern = f"%{query}%"
@@ -101,7 +178,7 @@ class UserRepository:
         
     async def create(self, user_data: UserCreate) -> User:
         """Create a new user."""
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         
         db_user = User(
             username=user_data.username,
@@ -122,7 +199,7 @@ class UserRepository:
         update_data = user_data.dict(exclude_unset=True)
         
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await hash_password(update_data.pop("password"))
             
         stmt = (
             update(User)
@@ -133,44 +210,72 @@ class UserRepository:
         
         result = await self.db.execute(stmt)
         await self.db.commit()
+        await self.invalidate_user_cache(user_id)
         
         return result.fetchone()
         
     async def delete(self, user_id: int) -> bool:
         """Delete a user."""
+        # Judge assignments of the user (or their agents) and the votes cast through them
+        # are deleted with the user (ON DELETE CASCADE)
+        is_users_assignment = (
+            (ContestJudge.user_judge_id == user_id)
+            | ContestJudge.agent_judge_id.in_(select(Agent.id).where(Agent.owner_id == user_id))
+        )
+        judge_assignments = select(ContestJudge.id).where(is_users_assignment)
+        # Contests whose counters, judges or submissions change (or that go away with the user)
+        affected_contests = await self.db.execute(
+            select(ContestJudge.contest_id).where(is_users_assignment)
+            .union(
+                select(ContestText.contest_id).join(Text, ContestText.text_id == Text.id).where(Text.owner_id == user_id),
+                select(Contest.id).where(Contest.creator_id == user_id)
+            )
+        )
+        affected_contest_ids = affected_contests.scalars().all()
+        await VoteRepository.apply_votes_to_tallies(self.db, Vote.contest_judge_id.in_(judge_assignments), sign=-1)
+        await ContestRepository.release_judge_assignments(self.db, is_users_assignment)
+        await ResultsSnapshotRepository.delete_snapshots(self.db, affected_contest_ids)
         stmt = delete(User).where(User.id == user_id)
         await self.db.execute(stmt)
         await self.db.commit()
+        # Owned agents are deleted with the user, so public listings may change too
+        await self.invalidate_user_cache(user_id)
+        await get_cache().invalidate_tags("agents:public")
+        for contest_id in affected_contest_ids:
+            await ContestRepository.invalidate_contest_cache(contest_id)
         
         return True
         
     async def update_credits(self, user_id: int, credit_data: UserCredit) -> User:
         """Update a user's credits."""
-        # First get the current user to access their current credits
-        user = await self.get_by_id(user_id)
-        if not user:
-            return None
-            
-        # Calculate new credit balance by adding the amount to the current balance
-        # The amount can be positive (add credits) or negative (subtract credits)
-        new_credit_balance = user.credits + credit_data.amount
-        
-        # Make sure credits can't go below zero
-        if new_credit_balance < 0:
-            new_credit_balance = 0
-        
+        # The amount can be positive (add credits) or negative (subtract credits). The new balance
+        # is computed by the database in a single UPDATE, so concurrent updates (from any worker)
+        # are never lost; credits can't go below zero.
+        new_credit_balance = User.credits + credit_data.amount
         stmt = (
             update(User)
             .where(User.id == user_id)
-            .values(credits=new_credit_balance)
+            .values(credits=case((new_credit_balance < 0, 0), else_=new_credit_balance))
             .returning(User)
+            .execution_options(populate_existing=True)
         )
         
         result = await self.db.execute(stmt)
         await self.db.commit()
+        await self.invalidate_user_cache(user_id)
         
         return result.fetchone()
         
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's stored password hash (e.g. after upgrading its work factor)."""
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(hashed_password=hashed_password)
+        )
+        await self.db.commit()
+        await self.invalidate_user_cache(user_id)
+        
     async def update_last_login(self, user_id: int) -> User:
         """Update a user's last login time."""
         stmt = (
@@ -182,5 +287,6 @@ class UserRepository:
         
         result = await self.db.execute(stmt)
         await self.db.commit()
+        await self.invalidate_user_cache(user_id)
         
         return result.fetchone() 
\ No newline at end of file
@@ -1,9 +1,17 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, delete, update
+from sqlalchemy import func, select, delete, update, tuple_, case, and_, Select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db.models import Vote, ContestText, AgentExecution, ContestJudge, Agent
+from app.db.models import Vote, ContestText, AgentExecution, ContestJudge, Agent, User, Text
+from app.db.models.contest_text_tally import ContestTextTally
+
+# Points awarded by podium place (1st = 3, 2nd = 2, 3rd = 1)
+VOTE_POINTS = case((Vote.text_place == 1, 3), (Vote.text_place == 2, 2), (Vote.text_place == 3, 1), else_=0)
+
+TALLY_COUNTERS = ("points", "first_places", "second_places", "third_places", "vote_count")
 
 
 class VoteRepository:
@@ -29,10 +37,105 @@ class VoteRepository:
             agent_execution_id=agent_execution_id
         )
         db.add(vote)
+        await db.flush()
+        await VoteRepository.apply_votes_to_tallies(db, Vote.id == vote.id)
         await db.commit()
         await db.refresh(vote)
         return vote
 
+    @staticmethod
+    async def apply_votes_to_tallies(db: AsyncSession, *criteria, sign: int = 1) -> None:
+        """
+        Add (sign=1) or subtract (sign=-1) the votes matching `criteria` to/from the
+        per-(contest, text) tallies. Runs as a single INSERT ... SELECT ... ON CONFLICT DO UPDATE;
+        call it in the same transaction as the vote change (before deleting votes). Doesn't commit.
+        """
+        counters = select(
+            Vote.contest_id,
+            Vote.text_id,
+            sign * func.sum(VOTE_POINTS),
+            sign * func.sum(case((Vote.text_place == 1, 1), else_=0)),
+            sign * func.sum(case((Vote.text_place == 2, 1), else_=0)),
+            sign * func.sum(case((Vote.text_place == 3, 1), else_=0)),
+            sign * func.count(Vote.id)
+        ).where(*criteria).group_by(Vote.contest_id, Vote.text_id)
+
+        dialect_insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        stmt = dialect_insert(ContestTextTally).from_select(
+            ["contest_id", "text_id", *TALLY_COUNTERS], counters
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ContestTextTally.contest_id, ContestTextTally.text_id],
+            set_={
+                **{name: getattr(ContestTextTally, name) + getattr(stmt.excluded, name) for name in TALLY_COUNTERS},
+                "updated_at": func.now()
+            }
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def rebuild_contest_tallies(db: AsyncSession, contest_ids: List[int]) -> None:
+        """Recompute the tallies of the given contests from their votes (repair tool; normal writes keep them current)."""
+        if not contest_ids:
+            return
+        await db.execute(delete(ContestTextTally).where(ContestTextTally.contest_id.in_(contest_ids)))
+        await VoteRepository.apply_votes_to_tallies(db, Vote.contest_id.in_(contest_ids))
+        await db.commit()
+
+    @staticmethod
+    def ranked_submissions(*columns) -> Select:
+        """
+        SELECT of submissions with their points and their rank within their contest, followed by
+        `columns`; add .where() to pick the contests. Points come from the vote tallies
+        (1st place = 3 points, 2nd = 2, 3rd = 1) and ranks from RANK() OVER each contest ordered by
+        points, so tied texts share a rank (1, 2, 2, 4). Contests without any votes get no ranks.
+        Rows are ordered as they are listed: by points, earlier submissions first on ties.
+        Both the final results and the live standings are ranked with it.
+        """
+        points = func.coalesce(ContestTextTally.points, 0)
+        contest_vote_count = func.sum(func.coalesce(ContestTextTally.vote_count, 0)).over(
+            partition_by=ContestText.contest_id
+        )
+        rank = func.rank().over(partition_by=ContestText.contest_id, order_by=points.desc())
+        return (
+            select(
+                points.label("points"),
+                case((contest_vote_count > 0, rank), else_=None).label("ranking"),
+                *columns
+            )
+            .select_from(ContestText)
+            .outerjoin(
+                ContestTextTally,
+                and_(
+                    ContestTextTally.contest_id == ContestText.contest_id,
+                    ContestTextTally.text_id == ContestText.text_id
+                )
+            )
+            .order_by(ContestText.contest_id, points.desc(), ContestText.submission_date, ContestText.id)
+        )
+
+    @staticmethod
+    async def get_contest_tallies(db: AsyncSession, contest_id: int) -> List[Any]:
+        """
+        Get every submission of a contest with its running tally and rank, in one query, in
+        standings order. Rows are (points, ranking, ContestText, title, first_places, second_places,
+        third_places, vote_count); the place counters are None for submissions without votes yet.
+        """
+        stmt = (
+            VoteRepository.ranked_submissions(
+                ContestText,
+                Text.title,
+                ContestTextTally.first_places,
+                ContestTextTally.second_places,
+                ContestTextTally.third_places,
+                ContestTextTally.vote_count
+            )
+            .join(Text, Text.id == ContestText.text_id)
+            .where(ContestText.contest_id == contest_id)
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
     @staticmethod
     async def get_vote(db: AsyncSession, vote_id: int) -> Optional[Vote]:
         """Get a single vote by ID."""
@@ -104,6 +207,43 @@ class VoteRepository:
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    async def get_votes_with_judge_identities(
+        db: AsyncSession,
+        contest_ids: Optional[List[int]] = None,
+        pairs: Optional[List[Tuple[int, int]]] = None
+    ) -> List[Any]:
+        """
+        Get votes together with the identity of the judge that cast them, either for whole
+        contests (contest_ids) or for specific submissions ((contest_id, text_id) pairs).
+
+        Returns rows of (Vote, contest_judge_id, user_judge_id, agent_judge_id, username, agent_name)
+        in a single query. The judge columns are None when the ContestJudge entry (or the
+        user/agent it points to) no longer exists.
+        """
+        if not contest_ids and not pairs:
+            return []
+        stmt = (
+            select(
+                Vote,
+                ContestJudge.id,
+                ContestJudge.user_judge_id,
+                ContestJudge.agent_judge_id,
+                User.username,
+                Agent.name
+            )
+            .outerjoin(ContestJudge, Vote.contest_judge_id == ContestJudge.id)
+            .outerjoin(User, ContestJudge.user_judge_id == User.id)
+            .outerjoin(Agent, ContestJudge.agent_judge_id == Agent.id)
+            .order_by(Vote.id)
+        )
+        if contest_ids:
+            stmt = stmt.filter(Vote.contest_id.in_(contest_ids))
+        if pairs:
+            stmt = stmt.filter(tuple_(Vote.contest_id, Vote.text_id).in_(list(pairs)))
+        result = await db.execute(stmt)
+        return result.all()
+
     @staticmethod
     async def get_votes_by_contest_judge_id(db: AsyncSession, contest_judge_id: int) -> List[Vote]:
         """Get all votes by a specific contest_judge_id."""
@@ -129,99 +269,63 @@ class VoteRepository:
         """Delete a vote."""
         vote = await VoteRepository.get_vote(db, vote_id)
         if vote:
-            await db.delete(vote)
-            await db.commit()
+            await VoteRepository.remove_vote(db, vote)
             return True
         return False
 
+    @staticmethod
+    async def remove_vote(db: AsyncSession, vote: Vote) -> None:
+        """Delete an already loaded vote and take it out of the contest tallies."""
+        await VoteRepository.apply_votes_to_tallies(db, Vote.id == vote.id, sign=-1)
+        await db.delete(vote)
+        await db.commit()
+
     @staticmethod
     async def calculate_contest_results(db: AsyncSession, contest_id: int) -> None:
         """
-        Calculate contest results based on votes and update the contest_texts table.
+        Calculate contest results and update the contest_texts table.
         This should be called when a contest is ready to be closed.
-        Points are derived from vote.text_place (1st place = 3 points, 2nd = 2, 3rd = 1).
         """
-        # Get all contest texts in one query to minimize database round trips
-        contest_texts_stmt = select(ContestText).filter(ContestText.contest_id == contest_id)
-        contest_texts_result = await db.execute(contest_texts_stmt)
-        contest_texts = contest_texts_result.scalars().all()
-        
-        if not contest_texts:
-            return  # No submissions to rank
-        
-        # Initialize submission data structure
-        submission_data = {
-            ct.text_id: {'points': 0, 'contest_text_obj': ct}
-            for ct in contest_texts
-        }
+        await VoteRepository.calculate_results_for_contests(db, [contest_id])
 
-        # Get all votes for this contest - using direct column access to avoid lazy loading
-        all_votes_stmt = select(
-            Vote.text_id, 
-            Vote.text_place,
-            Vote.id,
-            Vote.contest_judge_id,
-            Vote.agent_execution_id
-        ).filter(Vote.contest_id == contest_id)
-        all_votes_result = await db.execute(all_votes_stmt)
-        all_votes = all_votes_result.all()
-
-        # Debug logging to understand what votes we have
-        print(f"DEBUG: calculate_contest_results - Found {len(all_votes)} votes for contest {contest_id}")
-        for vote_row in all_votes:
-            print(f"DEBUG: Vote - text_id={vote_row.text_id}, text_place={vote_row.text_place}, vote_id={vote_row.id}, contest_judge_id={vote_row.contest_judge_id}, agent_execution_id={vote_row.agent_execution_id}")
-
-        # Handle case with no votes: set points to 0 and ranking to None
-        if not all_votes:
-            for ct in contest_texts:
-                ct.total_points = 0
-                ct.ranking = None
-            await db.commit()
-            return
+    @staticmethod
+    async def calculate_results_for_contests(db: AsyncSession, contest_ids: List[int], commit: bool = True) -> int:
+        """
+        Calculate the results of many contests with a single UPDATE ... FROM statement, storing
+        the points and ranks of ranked_submissions. Contests without any votes get 0 points and
+        no ranking. Works on PostgreSQL and SQLite.
+        With commit=False the caller commits (e.g. together with closing the contest).
+        Returns the number of submissions updated.
+        """
+        if not contest_ids:
+            return 0
 
-        # Calculate points for each text using raw column data
-        for vote_row in all_votes:
-            text_id = vote_row.text_id
-            text_place = vote_row.text_place
-            
-            if text_id in submission_data and text_place is not None:
-                points_to_add = 0
-                if text_place == 1:
-                    points_to_add = 3
-                elif text_place == 2:
-                    points_to_add = 2
-                elif text_place == 3:
-                    points_to_add = 1
-                
-                if points_to_add > 0:
-                    submission_data[text_id]['points'] += points_to_add
-
-        # Sort submissions by points (descending), then by submission_date (ascending) as tie-breaker
-        sorted_submissions = sorted(
-            submission_data.values(),
-            key=lambda x: (x['points'], -x['contest_text_obj'].submission_date.timestamp()),
-            reverse=True
+        ranked = (
+            VoteRepository.ranked_submissions(ContestText.id.label("contest_text_id"))
+            .where(ContestText.contest_id.in_(contest_ids))
+            .subquery()
         )
+        stmt = (
+            update(ContestText)
+            .where(ContestText.id == ranked.c.contest_text_id)
+            .values(total_points=ranked.c.points, ranking=ranked.c.ranking)
+            .returning(ContestText.id, ContestText.total_points, ContestText.ranking)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        updated = result.all()
 
-        # Assign rankings and total points
-        current_rank = 0
-        last_score = -1
-
-        for i, sub_info in enumerate(sorted_submissions):
-            contest_text_obj = sub_info['contest_text_obj']
-            current_score = sub_info['points']
-
-            # Update total points
-            contest_text_obj.total_points = current_score
-
-            # Assign ranking (texts with same points get same rank)
-            if current_score != last_score:
-                current_rank = i + 1  # Standard ranking (1, 2, 2, 4)
-                last_score = current_score
-            
-            contest_text_obj.ranking = current_rank
+        # Bring submissions already loaded in this session up to date without reloading them
+        identity_map = db.sync_session.identity_map
+        for row in updated:
+            contest_text = identity_map.get(db.sync_session.identity_key(ContestText, row.id))
+            if contest_text is not None:
+                set_committed_value(contest_text, "total_points", row.total_points)
+                set_committed_value(contest_text, "ranking", row.ranking)
 
-        await db.commit()
+        if commit:
+            await db.commit()
+        return len(updated)
 
     @staticmethod
     async def delete_votes_by_contest_judge(db: AsyncSession, contest_judge_id: int, contest_id: int, ai_model: Optional[str] = None) -> int:
@@ -241,9 +345,13 @@ class VoteRepository:
             if not vote_ids_to_delete:
                 return 0
 
+            await VoteRepository.apply_votes_to_tallies(db, Vote.id.in_(vote_ids_to_delete), sign=-1)
             stmt_delete = delete(Vote).where(Vote.id.in_(vote_ids_to_delete))
         else:
             # For human judges or all AI votes from this contest_judge, delete all votes
+            await VoteRepository.apply_votes_to_tallies(
+                db, Vote.contest_judge_id == contest_judge_id, Vote.contest_id == contest_id, sign=-1
+            )
             stmt_delete = delete(Vote).where(
                 Vote.contest_judge_id == contest_judge_id,
                 Vote.contest_id == contest_id
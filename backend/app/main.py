@@ -1,3 +1,8 @@
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -8,11 +13,43 @@ from app.api.routes import auth, users, texts, contests, votes, admin, dashboard
 # Import other routers as they become available
 
 from app.core.config import settings
+from app.core.tracing import TracingMiddleware, configure_trace_logging, install_sql_tracing
+from app.core.warmup import StartupReport, warm_up
+from app.core.cache import get_cache
+from app.db.database import engine
+from app.services.contest_scheduler import ContestLifecycleScheduler
+from app.utils.debug_logger import debug_log_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Creates the cache backend now, so a misconfigured one fails the startup
+    get_cache()
+    startup_report = StartupReport(import_seconds=_import_seconds)
+    if settings.STARTUP_WARMUP_ENABLED:
+        await warm_up(startup_report, timeout=settings.STARTUP_WARMUP_TIMEOUT_SECONDS)
+    app.state.startup_report = startup_report
+    print(startup_report.summary())
+
+    scheduler = None
+    if settings.CONTEST_SCHEDULER_ENABLED:
+        scheduler = ContestLifecycleScheduler(
+            poll_seconds=settings.CONTEST_SCHEDULER_POLL_SECONDS,
+            batch_size=settings.CONTEST_SCHEDULER_BATCH_SIZE,
+            ai_judge_model=settings.CONTEST_AUTO_AI_JUDGE_MODEL
+        )
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    await debug_log_writer.stop()
+
 
 app = FastAPI(
     title="Duelo de Plumas API",
     description="API for literary contests with AI assistance",
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -24,7 +61,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "Accept"],
-    expose_headers=["Content-Length"],
+    expose_headers=["Content-Length", "ETag", "Last-Modified"],
 )
 
 @app.middleware("http")
@@ -43,6 +80,17 @@ async def add_debug_middleware(request: Request, call_next):
             content={"detail": "Internal server error"},
         )
 
+# Added last so it wraps everything else and times the whole request
+if settings.TRACING_ENABLED:
+    configure_trace_logging()
+    install_sql_tracing(engine)
+    app.add_middleware(
+        TracingMiddleware,
+        sample_rate=settings.TRACE_LOG_SAMPLE_RATE,
+        slow_request_ms=settings.TRACE_SLOW_REQUEST_MS,
+        server_timing=settings.TRACE_SERVER_TIMING
+    )
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/users", tags=["users"])
@@ -56,6 +104,8 @@ app.include_router(llm_models.router, prefix="/models", tags=["llm_models"])
 app.include_router(debug_logs.router, prefix="", tags=["debug_logs"])  # No prefix since routes already include /admin
 # Include other routers as they become available
 
+_import_seconds = time.perf_counter() - _import_started
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Duelo de Plumas API"}
@@ -3,12 +3,24 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 
 
+class ModelRoutingPolicy(BaseModel):
+    """Models to fall back to when the requested one is slow or failing"""
+    fallback_models: List[str] = Field(..., description="Model IDs to try, in order, after the requested model")
+    latency_budget_seconds: Optional[float] = Field(
+        None, gt=0, description="Switch to the next model when a call takes longer than this"
+    )
+    max_error_rate: Optional[float] = Field(
+        None, ge=0, le=1, description="Skip models whose provider's recent error rate is above this"
+    )
+
+
 class AgentBase(BaseModel):
     name: str
     description: str
     prompt: str
     type: str  # "judge" or "writer"
     is_public: bool = False
+    routing: Optional[ModelRoutingPolicy] = None
 
 
 class AgentCreate(AgentBase):
@@ -31,12 +43,14 @@ class AgentUpdate(BaseModel):
     description: Optional[str] = None
     prompt: Optional[str] = None
     is_public: Optional[bool] = None
+    routing: Optional[ModelRoutingPolicy] = None
 
 
 class AgentExecuteJudge(BaseModel):
     agent_id: int
     model: str = Field(..., description="The LLM model to use for execution")
     contest_id: int = Field(..., description="The contest to judge")
+    routing: Optional[ModelRoutingPolicy] = Field(None, description="Overrides the agent's model routing policy")
 
 
 class AgentExecuteWriter(BaseModel):
@@ -45,6 +59,7 @@ class AgentExecuteWriter(BaseModel):
     title: Optional[str] = Field(None, description="Optional title for the generated text")
     description: Optional[str] = Field(None, description="Optional description/instructions for the generated text")
     contest_description: Optional[str] = Field(None, description="Optional contest description for context")
+    routing: Optional[ModelRoutingPolicy] = Field(None, description="Overrides the agent's model routing policy")
 
 
 class AgentExecutionResponse(BaseModel):
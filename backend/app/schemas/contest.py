@@ -1,6 +1,6 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from app.schemas.vote import VoteEvaluationResponse
 
@@ -129,6 +129,43 @@ class TextSubmissionResponse(BaseModel):
         from_attributes = True
 
 
+# For submitting many texts (possibly to many contests) in one request
+class BatchSubmissionItem(BaseModel):
+    contest_id: int
+    text_id: int
+
+
+class BatchTextSubmission(BaseModel):
+    submissions: List[BatchSubmissionItem] = Field(..., min_length=1, max_length=500)
+    # Passwords for password-protected contests, keyed by contest ID
+    contest_passwords: Dict[int, str] = {}
+
+
+class BatchSubmissionRejection(BaseModel):
+    contest_id: int
+    text_id: int
+    status_code: int
+    detail: str
+
+
+class BatchSubmissionResponse(BaseModel):
+    submitted: List[TextSubmissionResponse] = []
+    rejected: List[BatchSubmissionRejection] = []
+
+
+# Running standings of a contest, computed from the vote tallies
+class ContestStandingEntry(BaseModel):
+    submission_id: int
+    text_id: int
+    title: str
+    rank: Optional[int] = None  # None while no votes have been cast
+    points: int = 0
+    first_places: int = 0
+    second_places: int = 0
+    third_places: int = 0
+    vote_count: int = 0
+
+
 # For text details within a contest context
 class ContestTextResponse(BaseModel):
     id: int
@@ -1,11 +1,26 @@
+import importlib
+
 # from app.services.auth_service import AuthService  # Commented out due to AuthService not being defined
-from app.services.user_service import UserService
-from app.services.text_service import TextService
-from app.services.contest_service import ContestService
-from app.services.vote_service import VoteService
-from app.services.agent_service import AgentService
-from app.services.ai_service import AIService
-from app.services.credit_service import CreditService
+
+# Service classes are imported on first access, so importing a single service module
+# (or a script that needs one service) doesn't load every service and the AI layer.
+_SERVICE_MODULES = {
+    "UserService": "app.services.user_service",
+    "TextService": "app.services.text_service",
+    "ContestService": "app.services.contest_service",
+    "VoteService": "app.services.vote_service",
+    "AgentService": "app.services.agent_service",
+    "AIService": "app.services.ai_service",
+    "CreditService": "app.services.credit_service",
+}
+
+
+def __getattr__(name):
+    module_name = _SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
 
 # auth_service = AuthService() # Commented out
 # user_service = UserService() # No longer instantiating here
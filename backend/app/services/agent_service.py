@@ -22,9 +22,11 @@ from app.services.credit_service import CreditService
 from app.services.text_service import TextService
 from app.services.vote_service import VoteService
 from app.db.repositories.user_repository import UserRepository
+from app.services.auth_context import get_auth_context
 from app.db.models.contest_judge import ContestJudge
 from app.db.models.text import Text as TextModel
 from app.utils.ai_models import estimate_credits, estimate_cost_usd
+from app.services.model_router import candidate_models, resolve_routing_policy, validate_routing_policy
 from app.core.config import settings
 
 class AgentService:
@@ -44,6 +46,7 @@ class AgentService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Agent type must be either 'judge' or 'writer'"
             )
+        validate_routing_policy(agent_data.routing)
 
         agent = await AgentRepository.create_agent(db, agent_data, owner_id)
         return agent
@@ -63,8 +66,7 @@ class AgentService:
         
         if not skip_auth_check:
             if agent.owner_id != current_user_id and not agent.is_public:
-                user_repo = UserRepository(db)
-                is_admin = await user_repo.is_admin(current_user_id)
+                is_admin = await get_auth_context(db, current_user_id).is_admin()
                 if not is_admin:
                     raise HTTPException(
                         status_code=status.HTTP_403_FORBIDDEN,
@@ -131,8 +133,7 @@ class AgentService:
                 detail=f"Agent with id {agent_id} not found"
             )
         
-        user_repo = UserRepository(db)
-        is_admin = await user_repo.is_admin(current_user_id)
+        is_admin = await get_auth_context(db, current_user_id).is_admin()
 
         if agent.owner_id != current_user_id and not is_admin:
             raise HTTPException(
@@ -145,6 +146,7 @@ class AgentService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only administrators can make agents public"
             )
+        validate_routing_policy(agent_data.routing)
         
         updated_agent = await AgentRepository.update_agent(db, agent_id, agent_data)
         if not updated_agent: # Should not happen if get_agent_by_id succeeded before
@@ -164,8 +166,7 @@ class AgentService:
                 detail=f"Agent with id {agent_id} not found"
             )
         
-        user_repo = UserRepository(db)
-        is_admin = await user_repo.is_admin(current_user_id)
+        is_admin = await get_auth_context(db, current_user_id).is_admin()
         if agent.owner_id != current_user_id and not is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -192,14 +193,16 @@ class AgentService:
                 detail=f"Agent with id {request.agent_id} is not a writer agent"
             )
         
-        user_repo = UserRepository(db)
-        is_admin = await user_repo.is_admin(current_user_id)
+        is_admin = await get_auth_context(db, current_user_id).is_admin()
         if agent.owner_id != current_user_id and not is_admin and not agent.is_public:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to use this private agent"
             )
         
+        validate_routing_policy(request.routing)
+        routing = resolve_routing_policy(request.routing, agent.routing)
+        
         # --- Credit Pre-check for Writer ---
         estimated_input_tokens, estimated_output_tokens = AgentService.estimate_writer_tokens(
             agent.prompt, 
@@ -209,7 +212,13 @@ class AgentService:
             request.contest_description
         )
         
-        estimated_cost = estimate_credits(request.model, estimated_input_tokens, estimated_output_tokens)
+        # The call may be served by any of the fallback models, so check against the priciest one
+        estimated_cost = 0
+        for model_id in candidate_models(request.model, routing, estimated_input_tokens + estimated_output_tokens):
+            model_input_tokens, model_output_tokens = AgentService.estimate_writer_tokens(
+                agent.prompt, model_id, request.title, request.description, request.contest_description
+            )
+            estimated_cost = max(estimated_cost, estimate_credits(model_id, model_input_tokens, model_output_tokens))
 
         has_credits = await CreditService.has_sufficient_credits(db, current_user_id, estimated_cost)
         
@@ -223,7 +232,11 @@ class AgentService:
         generated_content_text: Optional[str] = None
         actual_prompt_tokens: int = 0
         actual_completion_tokens: int = 0
+        actual_cached_prompt_tokens: int = 0
+        actual_cache_write_tokens: int = 0
         actual_credits_used: int = 0
+        # The model that served the call, which differs from request.model after a fallback
+        served_model: str = request.model
         exec_status: str = "failed"
         error_msg_for_exec: Optional[str] = None
         result_id_for_exec: Optional[int] = None
@@ -231,33 +244,43 @@ class AgentService:
         execution_record: Optional[AgentExecution] = None
 
         # Fetch user object to get username for author field
-        user = await user_repo.get_by_id(current_user_id)
+        user = await get_auth_context(db, current_user_id).get_user()
         if not user:
             # This should ideally not happen if the request was authenticated
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Executing user not found")
 
         try:
-            generated_content_text, actual_prompt_tokens, actual_completion_tokens = await AIService.generate_text(
+            (generated_content_text, actual_prompt_tokens, actual_completion_tokens,
+             actual_cached_prompt_tokens, actual_cache_write_tokens, served_model) = await AIService.generate_text(
                 model=request.model,
                 personality_prompt=agent.prompt,
                 user_guidance_title=request.title,
                 user_guidance_description=request.description,
                 contest_description=request.contest_description,
+                routing=routing,
                 # Debug parameters
                 db_session=db,
                 user_id=current_user_id,
                 agent_id=agent.id
             )
             
-            actual_credits_used = estimate_credits(request.model, actual_prompt_tokens, actual_completion_tokens)
-            real_cost_usd = estimate_cost_usd(request.model, actual_prompt_tokens, actual_completion_tokens)
+            # Prompt tokens read from the provider's cache are charged at the cached-input price,
+            # and the ones written to it at the cache-write price
+            actual_credits_used = estimate_credits(
+                served_model, actual_prompt_tokens, actual_completion_tokens,
+                actual_cached_prompt_tokens, actual_cache_write_tokens
+            )
+            real_cost_usd = estimate_cost_usd(
+                served_model, actual_prompt_tokens, actual_completion_tokens,
+                actual_cached_prompt_tokens, actual_cache_write_tokens
+            )
             actual_total_tokens_for_deduction = actual_prompt_tokens + actual_completion_tokens
             await CreditService.deduct_credits(
                     db=db,
                     user_id=current_user_id,
                     amount=actual_credits_used,
                     description=f"AI Writer Agent: {agent.name}",
-                    ai_model=request.model,
+                    ai_model=served_model,
                     tokens_used=actual_total_tokens_for_deduction,
                     real_cost_usd=real_cost_usd
                 )
@@ -277,7 +300,7 @@ class AgentService:
                 final_content = clean_text_content(parsed_content) if parsed_content else generated_content_text
                 
                 # Construct author string
-                author_str = f"{user.username} (via AI Agent: {agent.name} | Model: {request.model})"
+                author_str = f"{user.username} (via AI Agent: {agent.name} | Model: {served_model})"
                 
                 text_create_data = TextCreate(
                     title=final_title,
@@ -311,7 +334,7 @@ class AgentService:
                 agent_id=agent.id,
                 owner_id=current_user_id,
                 execution_type="writer",
-                model=request.model,
+                model=served_model,
                 status=exec_status,
                 result_id=result_id_for_exec,
                 error_message=error_msg_for_exec,
@@ -352,7 +375,8 @@ class AgentService:
             description=original_agent.description,
             prompt=original_agent.prompt,
             type=original_agent.type,
-            is_public=False
+            is_public=False,
+            routing=original_agent.routing
         )
         new_agent = await AgentRepository.create_agent(db, cloned_agent_data, current_user_id)
         return new_agent 
@@ -10,47 +10,22 @@ import time
 import uuid
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple, Any, Union
-import aiohttp
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Try importing tiktoken, handle if not available
-try:
-    import tiktoken
-    tiktoken_available = True
-except ImportError:
-    tiktoken = None
-    tiktoken_available = False
-    logger.warning("tiktoken library not found. Falling back to character-based token estimation.")
-
+from app.core.tracing import trace_llm_call
 from app.utils.ai_models import ModelProvider
+from app.utils.tokens import approximate_token_count
 
-# Approximation function for token counting
-def estimate_token_count(text: str, model_id: str = "gpt-4") -> int:
-    """
-    Estimate the number of tokens in a text.
-    Uses tiktoken for compatible models if available, otherwise approximates.
-    """
-    if tiktoken_available:
-        try:
-            # Attempt to get encoding for the specified model or a default
-            encoding = tiktoken.encoding_for_model(model_id)
-            return len(encoding.encode(text))
-        except KeyError:
-            try:
-                 # Fallback for models not directly mapped in tiktoken, e.g., use cl100k_base
-                encoding = tiktoken.get_encoding("cl100k_base")
-                return len(encoding.encode(text))
-            except Exception as e:
-                logger.warning(f"tiktoken encoding failed for model '{model_id}' and fallback 'cl100k_base': {e}. Using character approximation.")
-        except Exception as e:
-            # Catch other potential tiktoken errors
-            logger.warning(f"tiktoken failed for model '{model_id}': {e}. Using character approximation.")
-            
-    # Fallback approximation: 1 token ≈ 4 characters
-    return max(1, len(text) // 4)
+
+# aiohttp is the heaviest import of the provider layer, so it is imported on first use
+# (or by the startup warmup) rather than with the module.
+def _http_session():
+    """A new aiohttp client session, importing aiohttp on first use."""
+    import aiohttp
+    return aiohttp.ClientSession()
 
 
 class AIProviderInterface(ABC):
@@ -70,20 +45,26 @@ class AIProviderInterface(ABC):
         prompt: str,
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> Tuple[str, int, int]:
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
+    ) -> Tuple[str, int, int, int, int]:
         """
         Generate text using the provider's API.
         
         Args:
             model_id: The specific model ID to use
-            prompt: The prompt to generate from
+            prompt: The prompt to generate from (the variable part, if a prefix is given)
             system_message: Optional system message to include
             temperature: The temperature parameter (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
+            cacheable_prefix: Optional stable start of the prompt, sent before `prompt`
+                and marked for the provider's prompt cache where that is supported
             
         Returns:
-            Tuple of (generated_text, prompt_tokens, completion_tokens)
+            Tuple of (generated_text, prompt_tokens, completion_tokens, cached_prompt_tokens,
+            cache_write_tokens), where prompt_tokens counts all input tokens, cached_prompt_tokens
+            how many of them were read from the prompt cache and cache_write_tokens how many
+            were written to it
         """
         pass
     
@@ -95,8 +76,9 @@ class AIProviderInterface(ABC):
         prompts: List[str],
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> List[Tuple[str, int, int]]:
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
+    ) -> List[Tuple[str, int, int, int, int]]:
         """
         Generate multiple completions in a batch.
         
@@ -106,9 +88,11 @@ class AIProviderInterface(ABC):
             system_message: Optional system message to include for all prompts
             temperature: The temperature parameter (0.0 to 1.0)
             max_tokens: Maximum tokens per generation
+            cacheable_prefix: Optional stable prompt start shared by all prompts
             
         Returns:
-            List of tuples (generated_text, prompt_tokens, completion_tokens)
+            List of tuples (generated_text, prompt_tokens, completion_tokens, cached_prompt_tokens,
+            cache_write_tokens)
         """
         pass
 
@@ -126,7 +110,7 @@ class OpenAIProvider(AIProviderInterface):
             
         # Simple validation by making a minimal API call
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _http_session() as session:
                 headers = {
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json"
@@ -144,15 +128,21 @@ class OpenAIProvider(AIProviderInterface):
             return False
     
     @classmethod
+    @trace_llm_call
     async def generate_text(
         cls, 
         model_id: str,
         prompt: str,
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> Tuple[str, int, int]:
-        """Generate text using OpenAI API."""
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
+    ) -> Tuple[str, int, int, int, int]:
+        """
+        Generate text using OpenAI API.
+        OpenAI caches long prompt prefixes automatically, so the prefix is just sent first
+        and the cached part is read from the usage details.
+        """
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OpenAI API key not configured")
@@ -161,7 +151,7 @@ class OpenAIProvider(AIProviderInterface):
         if system_message:
             messages.append({"role": "system", "content": system_message})
         
-        messages.append({"role": "user", "content": prompt})
+        messages.append({"role": "user", "content": (cacheable_prefix or "") + prompt})
         
         body = {
             "model": model_id,
@@ -173,7 +163,7 @@ class OpenAIProvider(AIProviderInterface):
             body["max_tokens"] = max_tokens
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _http_session() as session:
                 headers = {
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json"
@@ -190,23 +180,22 @@ class OpenAIProvider(AIProviderInterface):
                     response_data = await response.json()
                     
                     generated_text = response_data["choices"][0]["message"]["content"]
-                    prompt_tokens = response_data["usage"]["prompt_tokens"]
-                    completion_tokens = response_data["usage"]["completion_tokens"]
-                    
-                    return generated_text, prompt_tokens, completion_tokens
+                    return (generated_text, *cls._usage(response_data["usage"]))
         except Exception as e:
             logger.error(f"Error calling OpenAI API: {e}")
             raise
     
     @classmethod
+    @trace_llm_call
     async def generate_batch(
         cls,
         model_id: str,
         prompts: List[str],
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> List[Tuple[str, int, int]]:
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
+    ) -> List[Tuple[str, int, int, int, int]]:
         """
         Generate a batch of completions using OpenAI's batch API.
         
@@ -223,7 +212,7 @@ class OpenAIProvider(AIProviderInterface):
             messages = []
             if system_message:
                 messages.append({"role": "system", "content": system_message})
-            messages.append({"role": "user", "content": prompt})
+            messages.append({"role": "user", "content": (cacheable_prefix or "") + prompt})
             messages_list.append(messages)
         
         # Create the batch request body
@@ -243,7 +232,7 @@ class OpenAIProvider(AIProviderInterface):
                 request["max_tokens"] = max_tokens
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _http_session() as session:
                 headers = {
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json"
@@ -265,17 +254,15 @@ class OpenAIProvider(AIProviderInterface):
                     for completion in response_data["batch_completions"]:
                         if "error" in completion:
                             logger.error(f"Error in batch item: {completion['error']}")
-                            results.append(("Error generating text", 0, 0))
+                            results.append(("Error generating text", 0, 0, 0, 0))
                         else:
                             generated_text = completion["choices"][0]["message"]["content"]
-                            prompt_tokens = completion["usage"]["prompt_tokens"]
-                            completion_tokens = completion["usage"]["completion_tokens"]
-                            results.append((generated_text, prompt_tokens, completion_tokens))
+                            results.append((generated_text, *cls._usage(completion["usage"])))
                     
                     # Ensure we have the right number of results
                     if len(results) < len(prompts):
                         for _ in range(len(prompts) - len(results)):
-                            results.append(("Error: Missing batch result", 0, 0))
+                            results.append(("Error: Missing batch result", 0, 0, 0, 0))
                     
                     return results
                     
@@ -290,7 +277,8 @@ class OpenAIProvider(AIProviderInterface):
                     prompt=prompt,
                     system_message=system_message,
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    cacheable_prefix=cacheable_prefix
                 ))
             
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -300,11 +288,20 @@ class OpenAIProvider(AIProviderInterface):
             for i, result in enumerate(results):
                 if isinstance(result, Exception):
                     logger.error(f"Error in batch item {i}: {result}")
-                    processed_results.append(("Error generating text", 0, 0))
+                    processed_results.append(("Error generating text", 0, 0, 0, 0))
                 else:
                     processed_results.append(result)
                     
             return processed_results
+    
+    @staticmethod
+    def _usage(usage: Dict[str, Any]) -> Tuple[int, int, int, int]:
+        """
+        (prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens) of an OpenAI
+        usage object. OpenAI caches prompts automatically and doesn't bill cache writes.
+        """
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return usage["prompt_tokens"], usage["completion_tokens"], cached_tokens, 0
 
 
 class AnthropicProvider(AIProviderInterface):
@@ -313,6 +310,8 @@ class AnthropicProvider(AIProviderInterface):
     ANTHROPIC_API_VERSION = "2023-06-01"
     MAX_POLL_ATTEMPTS = 20
     POLL_INTERVAL_SECONDS = 10
+    # Shortest prefix Anthropic will cache (Haiku models need twice as many tokens)
+    MIN_CACHEABLE_PREFIX_TOKENS = 1024
     
     @classmethod
     async def validate_credentials(cls) -> bool:
@@ -324,7 +323,7 @@ class AnthropicProvider(AIProviderInterface):
             
         # Simple validation by making a minimal API call
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _http_session() as session:
                 headers = {
                     "x-api-key": api_key,
                     "anthropic-version": cls.ANTHROPIC_API_VERSION,
@@ -343,22 +342,27 @@ class AnthropicProvider(AIProviderInterface):
             return False
     
     @classmethod
+    @trace_llm_call
     async def generate_text(
         cls, 
         model_id: str,
         prompt: str,
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> Tuple[str, int, int]:
-        """Generate text using Anthropic Claude API."""
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
+    ) -> Tuple[str, int, int, int, int]:
+        """
+        Generate text using Anthropic Claude API.
+        The prefix is sent as its own content block with a cache breakpoint.
+        """
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("Anthropic API key not configured")
         
         body = {
             "model": model_id,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": [{"role": "user", "content": cls._user_content(model_id, prompt, cacheable_prefix)}],
             "temperature": temperature,
             "max_tokens": max_tokens or 2048
         }
@@ -367,7 +371,7 @@ class AnthropicProvider(AIProviderInterface):
             body["system"] = system_message
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _http_session() as session:
                 headers = {
                     "x-api-key": api_key,
                     "anthropic-version": cls.ANTHROPIC_API_VERSION,
@@ -387,23 +391,22 @@ class AnthropicProvider(AIProviderInterface):
                     generated_text = response_data["content"][0]["text"]
                     
                     # Anthropic now includes token counts in response
-                    prompt_tokens = response_data["usage"]["input_tokens"]
-                    completion_tokens = response_data["usage"]["output_tokens"]
-                    
-                    return generated_text, prompt_tokens, completion_tokens
+                    return (generated_text, *cls._usage(response_data["usage"]))
         except Exception as e:
             logger.error(f"Error calling Anthropic API: {e}")
             raise
     
     @classmethod
+    @trace_llm_call
     async def generate_batch(
         cls,
         model_id: str,
         prompts: List[str],
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> List[Tuple[str, int, int]]:
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
+    ) -> List[Tuple[str, int, int, int, int]]:
         """
         Generate a batch of completions using Anthropic Message Batches API.
         
@@ -421,7 +424,7 @@ class AnthropicProvider(AIProviderInterface):
                 "custom_id": f"request_{i}_{uuid.uuid4().hex[:8]}",
                 "params": {
                     "model": model_id,
-                    "messages": [{"role": "user", "content": prompt}],
+                    "messages": [{"role": "user", "content": cls._user_content(model_id, prompt, cacheable_prefix)}],
                     "temperature": temperature,
                     "max_tokens": max_tokens or 1024
                 }
@@ -445,7 +448,7 @@ class AnthropicProvider(AIProviderInterface):
     async def _create_batch(cls, api_key: str, requests: List[Dict]) -> str:
         """Create a new message batch."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _http_session() as session:
                 headers = {
                     "x-api-key": api_key,
                     "anthropic-version": cls.ANTHROPIC_API_VERSION,
@@ -477,7 +480,7 @@ class AnthropicProvider(AIProviderInterface):
         """Poll the batch status until it's complete or max attempts are reached."""
         for attempt in range(cls.MAX_POLL_ATTEMPTS):
             try:
-                async with aiohttp.ClientSession() as session:
+                async with _http_session() as session:
                     headers = {
                         "x-api-key": api_key,
                         "anthropic-version": cls.ANTHROPIC_API_VERSION
@@ -520,7 +523,7 @@ class AnthropicProvider(AIProviderInterface):
         raise TimeoutError(f"Batch {batch_id} did not complete within the maximum number of polling attempts")
     
     @classmethod
-    def _process_batch_results(cls, batch_results: List[Dict], expected_count: int) -> List[Tuple[str, int, int]]:
+    def _process_batch_results(cls, batch_results: List[Dict], expected_count: int) -> List[Tuple[str, int, int, int, int]]:
         """Process the batch results into the expected format."""
         # Sort results by custom_id to maintain original order
         sorted_results = sorted(batch_results, key=lambda x: int(x["custom_id"].split("_")[1]))
@@ -530,23 +533,49 @@ class AnthropicProvider(AIProviderInterface):
             if result["result"]["type"] == "succeeded":
                 message = result["result"]["message"]
                 text = message["content"][0]["text"]
-                input_tokens = message["usage"]["input_tokens"]
-                output_tokens = message["usage"]["output_tokens"]
-                processed_results.append((text, input_tokens, output_tokens))
+                processed_results.append((text, *cls._usage(message["usage"])))
             else:
                 # Handle errors
                 error_message = "Error generating text"
                 if result["result"]["type"] == "errored" and "error" in result["result"]:
                     error_message = f"Error: {result['result']['error']['message']}"
-                processed_results.append((error_message, 0, 0))
+                processed_results.append((error_message, 0, 0, 0, 0))
         
         # Ensure we have the right number of results
         if len(processed_results) < expected_count:
             # Fill in missing results if needed
             for _ in range(expected_count - len(processed_results)):
-                processed_results.append(("Error: Missing batch result", 0, 0))
+                processed_results.append(("Error: Missing batch result", 0, 0, 0, 0))
         
         return processed_results
+    
+    @classmethod
+    def _user_content(
+        cls, model_id: str, prompt: str, cacheable_prefix: Optional[str] = None
+    ) -> Union[str, List[Dict[str, Any]]]:
+        """
+        The user message content, with a cache breakpoint after the prefix when there is one
+        long enough to be cached. Shorter prefixes are sent inline, as part of the prompt.
+        """
+        min_tokens = cls.MIN_CACHEABLE_PREFIX_TOKENS * (2 if "haiku" in model_id else 1)
+        if not cacheable_prefix or approximate_token_count(len(cacheable_prefix)) < min_tokens:
+            return (cacheable_prefix or "") + prompt
+        return [
+            {"type": "text", "text": cacheable_prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt}
+        ]
+    
+    @staticmethod
+    def _usage(usage: Dict[str, Any]) -> Tuple[int, int, int, int]:
+        """
+        (prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens) of an
+        Anthropic usage object. Anthropic's input_tokens only counts the tokens after the last
+        cache breakpoint, so the tokens written to and read from the cache are added to get
+        the whole prompt; writes are billed above the input price, so they are kept apart.
+        """
+        cache_write = usage.get("cache_creation_input_tokens") or 0
+        cache_read = usage.get("cache_read_input_tokens") or 0
+        return usage["input_tokens"] + cache_write + cache_read, usage["output_tokens"], cache_read, cache_write
 
 
 # Provider registry
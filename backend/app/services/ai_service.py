@@ -13,9 +13,11 @@ from app.utils.ai_models import (
 )
 from app.services.ai_provider_service import (
     get_provider_for_model,
-    estimate_token_count,
     AIProviderInterface
 )
+from app.utils.tokens import approximate_token_count, estimate_token_count
+from app.schemas.agent import ModelRoutingPolicy
+from app.services.model_router import route_model_call
 from app.core.config import settings
 
 # Configure logger
@@ -77,12 +79,17 @@ class AIService:
         temperature: Optional[float] = None, 
         max_tokens: Optional[int] = None,
         strategy_name: str = "default",
+        routing: Optional[ModelRoutingPolicy] = None,
         # Debug logging parameters (optional)
         db_session=None,
         user_id: Optional[int] = None,
         agent_id: Optional[int] = None
-    ) -> Tuple[str, int, int]:
-        
+    ) -> Tuple[str, int, int, int, int, str]:
+        """
+        Returns (generated_content, prompt_tokens, completion_tokens, cached_prompt_tokens,
+        cache_write_tokens, model),
+        where model is the one that served the call (a fallback of `model` under a routing policy).
+        """
         provider = cls._get_provider(model)
         
         # Strategy selection for future extensibility
@@ -99,23 +106,36 @@ class AIService:
         actual_temperature = temperature if temperature is not None else settings.DEFAULT_WRITER_TEMPERATURE
         actual_max_tokens = max_tokens if max_tokens is not None else settings.DEFAULT_WRITER_MAX_TOKENS
 
+        # Fallback models must fit the prompt and the completion in their context window
+        prompt_chars = sum(len(part or "") for part in (
+            personality_prompt, user_guidance_title, user_guidance_description, contest_description
+        ))
+        required_tokens = approximate_token_count(prompt_chars) + (actual_max_tokens or 0)
+
         try:
-            generated_content, prompt_tokens, completion_tokens = await writer_strategy.generate(
-                provider=provider,
-                model_id=model,
-                personality_prompt=personality_prompt,
-                contest_description=contest_description,
-                user_guidance_title=user_guidance_title,
-                user_guidance_description=user_guidance_description,
-                temperature=actual_temperature, 
-                max_tokens=actual_max_tokens,
-                # Pass debug logging parameters
-                db_session=db_session,
-                user_id=user_id,
-                agent_id=agent_id
+            (generated_content, prompt_tokens, completion_tokens, cached_prompt_tokens,
+             cache_write_tokens), served_model = await route_model_call(
+                model,
+                routing,
+                lambda model_id: writer_strategy.generate(
+                    provider=provider if model_id == model else cls._get_provider(model_id),
+                    model_id=model_id,
+                    personality_prompt=personality_prompt,
+                    contest_description=contest_description,
+                    user_guidance_title=user_guidance_title,
+                    user_guidance_description=user_guidance_description,
+                    temperature=actual_temperature, 
+                    max_tokens=actual_max_tokens,
+                    # Pass debug logging parameters
+                    db_session=db_session,
+                    user_id=user_id,
+                    agent_id=agent_id
+                ),
+                required_tokens
             )
             
-            return generated_content, prompt_tokens, completion_tokens
+            return (generated_content, prompt_tokens, completion_tokens, cached_prompt_tokens,
+                    cache_write_tokens, served_model)
         except Exception as e:
             logger.error(f"Error in AIService.generate_text with strategy {strategy_name}: {str(e)}")
             # Re-raise or handle more gracefully if the exception is from the provider vs strategy
@@ -136,13 +156,18 @@ class AIService:
         temperature: Optional[float] = None, 
         max_tokens: Optional[int] = None,    
         strategy_name: str = "default",
+        routing: Optional[ModelRoutingPolicy] = None,
         # Debug logging parameters (optional)
         db_session=None,
         user_id: Optional[int] = None,
         agent_id: Optional[int] = None,
         contest_id: Optional[int] = None
-    ) -> Tuple[List[Dict[str, Any]], int, int]:
-        
+    ) -> Tuple[List[Dict[str, Any]], int, int, int, int, str]:
+        """
+        Returns (parsed_votes, prompt_tokens, completion_tokens, cached_prompt_tokens,
+        cache_write_tokens, model),
+        where model is the one that served the call (a fallback of `model` under a routing policy).
+        """
         provider = cls._get_provider(model)
 
         judge_strategy: JudgeStrategyInterface
@@ -158,21 +183,33 @@ class AIService:
         actual_temperature = temperature if temperature is not None else settings.DEFAULT_JUDGE_TEMPERATURE
         actual_max_tokens = max_tokens if max_tokens is not None else settings.DEFAULT_JUDGE_MAX_TOKENS
 
+        # Fallback models must fit the prompt and the completion in their context window
+        prompt_chars = len(personality_prompt or "") + len(contest_description or "") + sum(
+            len(text.get("title") or "") + len(text.get("content") or "") for text in texts
+        )
+        required_tokens = approximate_token_count(prompt_chars) + (actual_max_tokens or 0)
+
         try:
             # Strategy now handles its default temperature/max_tokens if these are None
-            parsed_votes, prompt_tokens, completion_tokens = await judge_strategy.judge(
-                provider=provider,
-                model_id=model,
-                personality_prompt=personality_prompt,
-                contest_description=contest_description,
-                texts=texts,
-                temperature=actual_temperature,
-                max_tokens=actual_max_tokens,
-                # Pass debug logging parameters
-                db_session=db_session,
-                user_id=user_id,
-                agent_id=agent_id,
-                contest_id=contest_id
+            (parsed_votes, prompt_tokens, completion_tokens, cached_prompt_tokens,
+             cache_write_tokens), served_model = await route_model_call(
+                model,
+                routing,
+                lambda model_id: judge_strategy.judge(
+                    provider=provider if model_id == model else cls._get_provider(model_id),
+                    model_id=model_id,
+                    personality_prompt=personality_prompt,
+                    contest_description=contest_description,
+                    texts=texts,
+                    temperature=actual_temperature,
+                    max_tokens=actual_max_tokens,
+                    # Pass debug logging parameters
+                    db_session=db_session,
+                    user_id=user_id,
+                    agent_id=agent_id,
+                    contest_id=contest_id
+                ),
+                required_tokens
             )
 
             total_tokens = prompt_tokens + completion_tokens
@@ -184,8 +221,9 @@ class AIService:
             #         model_info.output_cost_usd_per_1k_tokens * completion_tokens # Removed
             #     ) / total_tokens * 1000 # Removed
             
-            # Return prompt and completion tokens separately for accurate cost calculation later
-            return parsed_votes, prompt_tokens, completion_tokens # Changed return value
+            # Return prompt, completion and cache read/write tokens separately for accurate cost calculation later
+            return (parsed_votes, prompt_tokens, completion_tokens, cached_prompt_tokens,
+                    cache_write_tokens, served_model)
         except Exception as e:
             logger.error(f"Error in AIService.judge_contest with strategy {strategy_name}: {str(e)}")
             if isinstance(e, HTTPException):
@@ -15,7 +15,7 @@ class WriterStrategyInterface(ABC):
         user_guidance_description: Optional[str],
         temperature: float,
         max_tokens: Optional[int]
-    ) -> Tuple[str, int, int]:  # Returns: generated_content, prompt_tokens, completion_tokens
+    ) -> Tuple[str, int, int, int, int]:  # Returns: generated_content, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens
         """Generates text based on the implemented strategy."""
         pass
 
@@ -31,6 +31,6 @@ class JudgeStrategyInterface(ABC):
         texts: List[Dict[str, Any]], # List of dicts with 'id', 'title', 'content'
         temperature: float,
         max_tokens: Optional[int]
-    ) -> Tuple[List[Dict[str, Any]], int, int]:  # Returns: parsed_votes, prompt_tokens, completion_tokens
+    ) -> Tuple[List[Dict[str, Any]], int, int, int, int]:  # Returns: parsed_votes, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens
         """Judges texts based on the implemented strategy."""
         pass 
\ No newline at end of file
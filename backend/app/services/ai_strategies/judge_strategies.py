@@ -7,7 +7,7 @@ from app.services.ai_strategies.base_strategy import JudgeStrategyInterface
 from app.services.ai_provider_service import AIProviderInterface
 from app.services.ai_strategies.judge_prompts import JUDGE_BASE_PROMPT
 # Version constant for tracking AI judge strategy changes
-JUDGE_VERSION = "1.0"
+JUDGE_VERSION = "1.1"
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -46,7 +46,7 @@ class JudgeStrategy(JudgeStrategyInterface):
         user_id: Optional[int] = None,
         agent_id: Optional[int] = None,
         contest_id: Optional[int] = None
-    ) -> Tuple[List[Dict[str, Any]], int, int]:
+    ) -> Tuple[List[Dict[str, Any]], int, int, int, int]:
         """
         Generate structured judge output with enhanced parsing and validation.
         """
@@ -63,11 +63,10 @@ class JudgeStrategy(JudgeStrategyInterface):
         
         texts_input_block = "\\n\\n".join(texts_to_judge_blocks)
 
-        # Enhanced prompt with better structure
-        enhanced_prompt = f"""{JUDGE_BASE_PROMPT}
-
-Personality Instructions:
-{personality_prompt}
+        # Enhanced prompt with better structure. The base prompt and the contest (description and
+        # texts) are the same for every judge of a contest, and the texts make the prefix long
+        # enough for the provider to cache; only the personality follows it.
+        cacheable_prefix = f"""{JUDGE_BASE_PROMPT}
 
 Judging Context:
 Contest Description:
@@ -76,7 +75,12 @@ Contest Description:
 Texts to Judge:
 {texts_input_block}
 
+"""
+        variable_prompt = f"""Personality Instructions:
+{personality_prompt}
+
 Remember: Follow the exact ranking format specified above. Provide commentary for each text and rank them clearly."""
+        enhanced_prompt = cacheable_prefix + variable_prompt
 
         # Use system message for better instruction following
         system_message = "You are a professional judge for writing contests. Always follow the exact output format specified in the prompt."
@@ -84,12 +88,13 @@ Remember: Follow the exact ranking format specified above. Provide commentary fo
         # Track execution time for debug logging
         start_time = time.time()
 
-        raw_response, prompt_tokens, completion_tokens = await provider.generate_text(
+        raw_response, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens = await provider.generate_text(
             model_id=model_id,
-            prompt=enhanced_prompt,
+            prompt=variable_prompt,
             system_message=system_message,
             temperature=temperature, 
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            cacheable_prefix=cacheable_prefix
         )
 
         execution_time_ms = int((time.time() - start_time) * 1000)
@@ -103,7 +108,9 @@ Remember: Follow the exact ranking format specified above. Provide commentary fo
             from app.utils.ai_models import estimate_cost_usd
             
             # Calculate cost
-            cost_usd = estimate_cost_usd(model_id, prompt_tokens, completion_tokens)
+            cost_usd = estimate_cost_usd(
+                model_id, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens
+            )
             
             # Prepare strategy input for logging
             strategy_input = {
@@ -136,7 +143,7 @@ Remember: Follow the exact ranking format specified above. Provide commentary fo
                 cost_usd=cost_usd
             )
         
-        return judge_output.votes, prompt_tokens, completion_tokens
+        return judge_output.votes, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens
 
     def _clean_text_for_judging(self, content: str) -> str:
         """
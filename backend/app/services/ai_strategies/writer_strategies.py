@@ -48,7 +48,7 @@ class WriterStrategy(WriterStrategyInterface):
         db_session=None,
         user_id: Optional[int] = None,
         agent_id: Optional[int] = None
-    ) -> Tuple[str, int, int]:
+    ) -> Tuple[str, int, int, int, int]:
         """
         Generate structured writer output with enhanced parsing and validation.
         """
@@ -71,28 +71,32 @@ class WriterStrategy(WriterStrategyInterface):
         
         input_block = "\n\n".join(input_sections) if input_sections else "No specific requirements provided."
         
-        # Enhanced prompt with better structure
-        enhanced_prompt = f"""{WRITER_BASE_PROMPT}
+        # Enhanced prompt with better structure. The base prompt and the personality are the
+        # same on every run of an agent, so they form the prefix the provider can cache.
+        cacheable_prefix = f"""{WRITER_BASE_PROMPT}
 
 Personality Instructions:
 {personality_prompt}
 
-Writing Context:
+"""
+        variable_prompt = f"""Writing Context:
 {input_block}
 
 Remember: Your response must follow the exact format specified above. Start with "Title:" followed by your title, then "Text:" followed by your creative content."""
+        enhanced_prompt = cacheable_prefix + variable_prompt
         
         # Use system message for better instruction following
         system_message = "You are a professional creative writer. Always follow the exact output format specified in the prompt."
         
         start_time = time.time()
         
-        raw_response, prompt_tokens, completion_tokens = await provider.generate_text(
+        raw_response, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens = await provider.generate_text(
             model_id=model_id,
-            prompt=enhanced_prompt,
+            prompt=variable_prompt,
             system_message=system_message,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            cacheable_prefix=cacheable_prefix
         )
         
         execution_time_ms = int((time.time() - start_time) * 1000)
@@ -108,7 +112,9 @@ Remember: Your response must follow the exact format specified above. Start with
             from app.utils.debug_logger import AIDebugLogger
             from app.utils.ai_models import estimate_cost_usd
             
-            cost_usd = estimate_cost_usd(model_id, prompt_tokens, completion_tokens)
+            cost_usd = estimate_cost_usd(
+                model_id, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens
+            )
             
             strategy_input = {
                 "strategy_type": "structured",
@@ -136,7 +142,7 @@ Remember: Your response must follow the exact format specified above. Start with
                 cost_usd=cost_usd
             )
         
-        return generated_content, prompt_tokens, completion_tokens
+        return generated_content, prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens
     
     def _parse_and_validate_response(self, raw_response: str, fallback_title: Optional[str] = None) -> WriterOutput:
         """
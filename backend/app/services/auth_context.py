@@ -0,0 +1,90 @@
+from typing import Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.contest_judge import ContestJudge
+from app.db.models.user import User
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.user_repository import UserRepository
+
+
+class AuthContext:
+    """
+    Authorization facts about the requesting user, fetched at most once per request.
+
+    The context lives in the request's session (`db.info`), which every service already
+    receives, so facts such as the admin flag or contest membership are memoized for the
+    whole request without threading a new argument through each call.
+    get_current_user seeds it with the already-loaded user, so the admin check is free.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: Optional[int], user: Optional[User] = None):
+        self.db = db
+        self.user_id = user_id
+        self._user = user
+        self._user_loaded = user is not None
+        self._memberships: Dict[int, bool] = {}
+        self._judge_assignments: Dict[int, bool] = {}
+
+    async def get_user(self) -> Optional[User]:
+        if not self._user_loaded:
+            if self.user_id is not None:
+                self._user = await UserRepository(self.db).get_by_id(self.user_id)
+            self._user_loaded = True
+        return self._user
+
+    async def is_admin(self) -> bool:
+        user = await self.get_user()
+        return bool(user and user.is_admin)
+
+    def is_creator(self, contest) -> bool:
+        return self.user_id is not None and contest.creator_id == self.user_id
+
+    async def is_creator_or_admin(self, contest) -> bool:
+        return self.is_creator(contest) or await self.is_admin()
+
+    async def is_contest_member(self, contest_id: int) -> bool:
+        if self.user_id is None:
+            return False
+        if contest_id not in self._memberships:
+            self._memberships[contest_id] = await ContestRepository.is_contest_member(
+                self.db, contest_id, self.user_id
+            )
+        return self._memberships[contest_id]
+
+    async def is_contest_judge(self, contest_id: int) -> bool:
+        """Whether the user is assigned as a (human) judge of the contest."""
+        if self.user_id is None:
+            return False
+        if contest_id not in self._judge_assignments:
+            stmt = select(ContestJudge.id).filter(
+                ContestJudge.contest_id == contest_id,
+                ContestJudge.user_judge_id == self.user_id
+            ).limit(1)
+            result = await self.db.execute(stmt)
+            self._judge_assignments[contest_id] = result.scalar_one_or_none() is not None
+        return self._judge_assignments[contest_id]
+
+    def forget_contest(self, contest_id: int) -> None:
+        """Drop memoized membership/judge facts after they change within the request."""
+        self._memberships.pop(contest_id, None)
+        self._judge_assignments.pop(contest_id, None)
+
+
+def get_auth_context(db: AsyncSession, user_id: Optional[int], user: Optional[User] = None) -> AuthContext:
+    """Get (or create) the authorization context for `user_id` in this request's session."""
+    contexts = db.info.setdefault("auth_contexts", {})
+    context = contexts.get(user_id)
+    if context is None:
+        context = AuthContext(db, user_id, user)
+        contexts[user_id] = context
+    elif user is not None and not context._user_loaded:
+        context._user = user
+        context._user_loaded = True
+    return context
+
+
+def forget_contest_facts(db: AsyncSession, contest_id: int) -> None:
+    """Drop memoized facts about a contest for every principal in this session."""
+    for context in db.info.get("auth_contexts", {}).values():
+        context.forget_contest(contest_id)
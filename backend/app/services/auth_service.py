@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 
 from app.db.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import verify_password, get_password_hash
+from app.core.security import verify_and_update_password
 from app.db.repositories.user_repository import UserRepository # Import UserRepository
 
 # These functions can be removed if all calls are routed through UserRepository
@@ -30,9 +30,15 @@ async def authenticate_user(db: AsyncSession, username: str, password: str) -> U
     if not user:
         return False
 
-    if not verify_password(password, user.hashed_password):
+    # bcrypt runs in the password hashing pool, off the event loop
+    is_valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not is_valid:
         return False
 
+    if new_hash:
+        # Transparently upgrade hashes made with an older scheme or work factor
+        await user_repo.update_password_hash(user.id, new_hash)
+
     return user
 
 async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
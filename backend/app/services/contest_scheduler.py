@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from app.db.database import AsyncSessionLocal
+from app.db.repositories.contest_repository import ContestRepository
+from app.schemas.agent import AgentExecuteJudge
+from app.services.judge_service import JudgeService
+from app.services.vote_service import VoteService
+
+logger = logging.getLogger(__name__)
+
+
+class ContestLifecycleScheduler:
+    """
+    Moves open contests to evaluation once their end_date has passed, and closes
+    contests whose judges have all voted but whose closing transaction failed.
+
+    Every worker process can run its own scheduler. Contests are claimed with a single
+    conditional UPDATE, so each one is transitioned by exactly one worker. Between runs the
+    scheduler sleeps until the next deadline, read from the open-contests end_date index,
+    but never longer than `poll_seconds`, so deadlines set by other workers are picked up too.
+
+    The AI judges of claimed contests are written to scheduled_judge_runs in the claiming
+    transaction. Any worker leases and runs them from there, so they outlive restarts and
+    crashes; a run that fails is retried when its lease expires, up to `max_judge_attempts`.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: int = 30,
+        batch_size: int = 50,
+        ai_judge_model: str = "",
+        judge_lease_seconds: int = 900,
+        max_judge_attempts: int = 3,
+        session_factory=AsyncSessionLocal
+    ):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.ai_judge_model = ai_judge_model
+        self.judge_lease_seconds = judge_lease_seconds
+        self.max_judge_attempts = max_judge_attempts
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._judge_task: Optional[asyncio.Task] = None
+        self._judges_scheduled = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            if self.ai_judge_model:
+                self._judge_task = asyncio.create_task(self._run_ai_judges())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._judge_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._judge_task = None
+
+    async def run_once(self) -> List[int]:
+        """Transition every contest that is due now; returns the IDs this worker claimed."""
+        claimed_ids: List[int] = []
+        while True:
+            async with self.session_factory() as db:
+                claimed = await ContestRepository.claim_due_contests(
+                    db, datetime.now(timezone.utc), self.batch_size,
+                    schedule_ai_judges=bool(self.ai_judge_model)
+                )
+            claimed_ids.extend(row.id for row in claimed)
+            if len(claimed) < self.batch_size:
+                break
+        if claimed_ids and self.ai_judge_model:
+            self._judges_scheduled.set()
+        if claimed_ids:
+            logger.info("Moved contests %s to evaluation (end_date reached)", claimed_ids)
+        return claimed_ids
+
+    async def close_completed_contests(self) -> List[int]:
+        """Retry the close of contests in evaluation whose judges have all voted; returns their IDs."""
+        async with self.session_factory() as db:
+            contest_ids = await ContestRepository.get_completed_evaluation_contest_ids(db, self.batch_size)
+            for contest_id in contest_ids:
+                try:
+                    await VoteService.check_contest_completion(db, contest_id)
+                except Exception:
+                    logger.exception("Closing contest %s failed", contest_id)
+        if contest_ids:
+            logger.info("Retried closing contests %s (all judges had voted)", contest_ids)
+        return contest_ids
+
+    async def _seconds_until_next_deadline(self) -> float:
+        async with self.session_factory() as db:
+            next_end_date = await ContestRepository.get_next_end_date(db)
+        if next_end_date is None:
+            return self.poll_seconds
+        if next_end_date.tzinfo is None:
+            next_end_date = next_end_date.replace(tzinfo=timezone.utc)
+        remaining = (next_end_date - datetime.now(timezone.utc)).total_seconds()
+        # Contests locked by another worker may still look due; don't spin on them
+        return min(self.poll_seconds, max(remaining, 1.0))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+                await self.close_completed_contests()
+                delay = await self._seconds_until_next_deadline()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Contest lifecycle scheduler run failed")
+                delay = self.poll_seconds
+            await asyncio.sleep(delay)
+
+    async def run_next_judge(self) -> bool:
+        """
+        Lease one scheduled AI judge run and execute it, billed to the contest creator.
+        Returns False when no run is free. Runs rejected by the judge service (e.g. the judge
+        has already voted, or the creator is out of credits) are dropped; other failures are
+        left to be retried when the lease expires.
+        """
+        async with self.session_factory() as db:
+            run = await ContestRepository.claim_judge_run(db, datetime.now(timezone.utc), self.judge_lease_seconds)
+            if run is None:
+                return False
+            if run.attempts > self.max_judge_attempts:
+                logger.error("Giving up on scheduled AI judge %s for contest %s after %s attempts",
+                             run.agent_id, run.contest_id, self.max_judge_attempts)
+                await ContestRepository.delete_judge_run(db, run.id)
+                return True
+            try:
+                await JudgeService.execute_ai_judge(
+                    db,
+                    AgentExecuteJudge(agent_id=run.agent_id, model=self.ai_judge_model, contest_id=run.contest_id),
+                    run.creator_id
+                )
+            except HTTPException as e:
+                await db.rollback()
+                logger.warning("Scheduled AI judge %s for contest %s was rejected: %s",
+                               run.agent_id, run.contest_id, e.detail)
+            except Exception:
+                await db.rollback()
+                logger.exception("Scheduled AI judge %s failed for contest %s (attempt %s)",
+                                 run.agent_id, run.contest_id, run.attempts)
+                return True
+            await ContestRepository.delete_judge_run(db, run.id)
+        return True
+
+    async def _run_ai_judges(self) -> None:
+        """Run scheduled AI judges one at a time, waking up when this worker claims contests."""
+        while True:
+            self._judges_scheduled.clear()
+            try:
+                ran = await self.run_next_judge()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scheduled AI judge run failed")
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._judges_scheduled.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
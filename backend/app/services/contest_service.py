@@ -5,7 +5,9 @@ from sqlalchemy import select
 
 from app.schemas.contest import (
     ContestCreate, ContestUpdate,  
-    TextSubmission, JudgeAssignment, ContestResponse, JudgeAssignmentResponse, ContestTextResponse, ContestMemberResponse
+    TextSubmission, JudgeAssignment, ContestResponse, JudgeAssignmentResponse, ContestTextResponse, ContestMemberResponse,
+    BatchTextSubmission, BatchSubmissionResponse, BatchSubmissionRejection, TextSubmissionResponse,
+    ContestStandingEntry
 )
 from app.db.repositories.contest_repository import ContestRepository
 from app.db.repositories.text_repository import TextRepository
@@ -14,9 +16,12 @@ from app.db.repositories.agent_repository import AgentRepository
 from app.db.models.contest import Contest
 from app.db.models.contest_text import ContestText
 from app.db.models.contest_judge import ContestJudge
-from app.db.models.vote import Vote
 from app.db.repositories.vote_repository import VoteRepository
+from app.db.repositories.results_snapshot_repository import ResultsSnapshotRepository
+from app.db.models.contest_result_snapshot import ContestResultSnapshot
 from app.schemas.vote import VoteEvaluationResponse
+from app.utils.http_cache import make_etag
+from app.services.auth_context import get_auth_context, forget_contest_facts
 
 # Import UserModel for author details
 from app.db.models.user import User as UserModel
@@ -154,13 +159,14 @@ class ContestService:
         contest = await ContestService.get_contest(db=db, contest_id=contest_id)
         
         # Check if user is the contest creator or an admin
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         if contest.creator_id != current_user_id and not is_admin_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to update this contest"
             )
+        previous_status = contest.status.lower()
         
         # Prepare a mutable copy of contest_update data for potential modification
         update_data_dict = contest_update.model_dump(exclude_unset=True)
@@ -198,12 +204,16 @@ class ContestService:
         # Check if the contest is now closed and trigger result computation
         if updated_contest_orm and updated_contest_orm.status.lower() == "closed":
             await VoteRepository.calculate_contest_results(db, contest_id)
+            await ContestService.build_results_snapshot(db, contest_id)
             # Fetch the updated contest data again AFTER results computation to ensure response reflects ranks
             # This is important because the contest_orm might be stale regarding submission ranks
             updated_contest_data = await ContestRepository.get_contest_with_counts(db=db, contest_id=contest_id)
         else:
+            # A reopened contest no longer has final results
+            if updated_contest_orm and previous_status == "closed":
+                await ResultsSnapshotRepository.delete_snapshot(db, contest_id)
             # If not newly closed or update failed, get data as before
-             updated_contest_data = await ContestRepository.get_contest_with_counts(db=db, contest_id=contest_id)
+            updated_contest_data = await ContestRepository.get_contest_with_counts(db=db, contest_id=contest_id)
 
         if not updated_contest_orm:
             # This case should ideally not happen if get_contest succeeded earlier
@@ -225,8 +235,8 @@ class ContestService:
         contest = await ContestService.get_contest(db=db, contest_id=contest_id)
         
         # Check if user is the contest creator or an admin
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         if contest.creator_id != current_user_id and not is_admin_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -270,12 +280,15 @@ class ContestService:
                     detail="Authentication required to access this contest"
                 )
             
-            user_repo = UserRepository(db)
-            is_admin_user = await user_repo.is_admin(current_user_id)
-            is_creator = contest.creator_id == current_user_id
-            is_member = await ContestRepository.is_contest_member(db, contest_id, current_user_id)
+            auth = get_auth_context(db, current_user_id)
+            # Membership is only looked up when the cheaper checks fail
+            has_access = (
+                auth.is_creator(contest)
+                or await auth.is_admin()
+                or await auth.is_contest_member(contest_id)
+            )
             
-            if not (is_admin_user or is_creator or is_member):
+            if not has_access:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You don't have access to this contest"
@@ -285,8 +298,8 @@ class ContestService:
         if contest.password_protected:
             # If user is contest creator or admin, allow access without password
             if current_user_id:
-                user_repo = UserRepository(db)
-                is_admin_user = await user_repo.is_admin(current_user_id)
+                auth = get_auth_context(db, current_user_id)
+                is_admin_user = await auth.is_admin()
                 is_creator = contest.creator_id == current_user_id
                 
                 if is_admin_user or is_creator:
@@ -345,30 +358,24 @@ class ContestService:
             )
             
         # Check text ownership (unless user is admin)
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         if text.owner_id != current_user_id and not is_admin_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to submit this text"
             )
             
-        # Check contest restrictions
-        if contest.author_restrictions:
-            # Check if user has already submitted a text
-            existing_submissions = await ContestRepository.get_contest_texts(db=db, contest_id=contest_id)
-            for sub_item in existing_submissions:
-                text_obj = await text_repo.get_text(sub_item.text_id)
-                if text_obj and text_obj.owner_id == current_user_id and not is_admin_user:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Contest only allows one submission per author"
-                    )
-        
-        # If judge restrictions enabled, check if user is a judge
-        if contest.judge_restrictions:
-            judges = await ContestRepository.get_contest_judges(db=db, contest_id=contest_id)
-            if any(judge.user_judge_id == current_user_id for judge in judges) and not is_admin_user:
+        # Check contest restrictions (one query for both, as in submit_texts_batch)
+        if (contest.author_restrictions or contest.judge_restrictions) and not is_admin_user:
+            eligibility = await ContestRepository.get_submission_eligibility(db, [contest_id], current_user_id)
+            if contest.author_restrictions and eligibility[0].has_own_submission:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Contest only allows one submission per author"
+                )
+            # If judge restrictions enabled, check if user is a judge
+            if contest.judge_restrictions and eligibility[0].is_judge:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Judges cannot submit texts to this contest"
@@ -389,6 +396,104 @@ class ContestService:
             
         return contest_text
     
+    @staticmethod
+    async def submit_texts_batch(
+        db: AsyncSession,
+        batch: BatchTextSubmission,
+        current_user_id: int
+    ) -> BatchSubmissionResponse:
+        """
+        Submit many (contest, text) pairs at once. Each pair goes through the same checks as
+        submit_text_to_contest, but the checks run as a couple of set-based queries and the
+        accepted pairs are inserted with a single statement. Pairs that fail a check are
+        reported in `rejected` instead of failing the whole batch.
+        """
+        from datetime import datetime, timezone
+
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
+
+        # Unique pairs, in request order
+        pairs = list(dict.fromkeys((item.contest_id, item.text_id) for item in batch.submissions))
+        eligibility = await ContestRepository.get_submission_eligibility(
+            db, {contest_id for contest_id, _ in pairs}, current_user_id
+        )
+        contests = {row.Contest.id: row for row in eligibility}
+        text_owners = await TextRepository(db).get_owner_ids({text_id for _, text_id in pairs})
+
+        current_time = datetime.now(timezone.utc)
+        rejected: List[BatchSubmissionRejection] = []
+        accepted = []
+        # Contests with author restrictions the user gets a submission into within this batch
+        authored_contests = set()
+
+        def reject(contest_id: int, text_id: int, status_code: int, detail: str) -> None:
+            rejected.append(BatchSubmissionRejection(
+                contest_id=contest_id, text_id=text_id, status_code=status_code, detail=detail
+            ))
+
+        for contest_id, text_id in pairs:
+            row = contests.get(contest_id)
+            if row is None:
+                reject(contest_id, text_id, status.HTTP_404_NOT_FOUND, f"Contest with id {contest_id} not found")
+                continue
+            contest = row.Contest
+            is_privileged = is_admin_user or contest.creator_id == current_user_id
+
+            if not contest.publicly_listed and not (is_privileged or row.is_member):
+                reject(contest_id, text_id, status.HTTP_403_FORBIDDEN, "You don't have access to this contest")
+                continue
+            if contest.password_protected and not is_privileged:
+                password = batch.contest_passwords.get(contest_id)
+                if not password or password != contest.password:
+                    reject(contest_id, text_id, status.HTTP_403_FORBIDDEN, "Invalid password for password protected contest")
+                    continue
+            if contest.status != "open":
+                reject(contest_id, text_id, status.HTTP_400_BAD_REQUEST, "Contest is not open for submissions")
+                continue
+            if contest.end_date and current_time > contest.end_date:
+                reject(contest_id, text_id, status.HTTP_400_BAD_REQUEST, "Contest deadline has passed")
+                continue
+
+            owner_id = text_owners.get(text_id)
+            if owner_id is None:
+                reject(contest_id, text_id, status.HTTP_404_NOT_FOUND, f"Text with id {text_id} not found")
+                continue
+            if owner_id != current_user_id and not is_admin_user:
+                reject(contest_id, text_id, status.HTTP_403_FORBIDDEN, "You don't have permission to submit this text")
+                continue
+
+            if contest.author_restrictions and not is_admin_user:
+                if row.has_own_submission or contest_id in authored_contests:
+                    reject(contest_id, text_id, status.HTTP_403_FORBIDDEN, "Contest only allows one submission per author")
+                    continue
+            if contest.judge_restrictions and row.is_judge and not is_admin_user:
+                reject(contest_id, text_id, status.HTTP_403_FORBIDDEN, "Judges cannot submit texts to this contest")
+                continue
+
+            if contest.author_restrictions:
+                authored_contests.add(contest_id)
+            accepted.append((contest_id, text_id))
+
+        inserted = await ContestRepository.bulk_submit_texts(db, accepted)
+        inserted_pairs = {(row.contest_id, row.text_id) for row in inserted}
+        for contest_id, text_id in accepted:
+            if (contest_id, text_id) not in inserted_pairs:
+                reject(contest_id, text_id, status.HTTP_400_BAD_REQUEST, "Text has already been submitted to this contest")
+
+        return BatchSubmissionResponse(
+            submitted=[
+                TextSubmissionResponse(
+                    submission_id=row.id,
+                    contest_id=row.contest_id,
+                    text_id=row.text_id,
+                    submission_date=row.submission_date
+                )
+                for row in inserted
+            ],
+            rejected=rejected
+        )
+
     @staticmethod
     async def remove_submission(
         db: AsyncSession, 
@@ -427,8 +532,8 @@ class ContestService:
             )
         
         # Check permissions: current user must be text owner, contest creator, or an admin
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         is_text_owner = text.owner_id == current_user_id
         is_contest_creator = contest.creator_id == current_user_id
         
@@ -458,8 +563,8 @@ class ContestService:
     ) -> JudgeAssignmentResponse:
         contest = await ContestService.get_contest(db=db, contest_id=contest_id)
         
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         if contest.creator_id != current_user_id and not is_admin_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -470,7 +575,7 @@ class ContestService:
         agent_judge_id_to_assign: Optional[int] = None
 
         if assignment.user_judge_id is not None:
-            judge_user = await user_repo.get_by_id(assignment.user_judge_id)
+            judge_user = await UserRepository(db).get_by_id(assignment.user_judge_id)
             if not judge_user:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -539,8 +644,8 @@ class ContestService:
         is_admin_user = False
         is_creator = False
         if current_user_id:
-            user_repo = UserRepository(db)
-            is_admin_user = await user_repo.is_admin(current_user_id)
+            auth = get_auth_context(db, current_user_id)
+            is_admin_user = await auth.is_admin()
             is_creator = current_user_id and contest.creator_id == current_user_id
         
         judges = await ContestRepository.get_contest_judges(db=db, contest_id=contest_id)
@@ -566,8 +671,8 @@ class ContestService:
         contest = await ContestService.get_contest(db=db, contest_id=contest_id)
         
         # Check permissions (contest creator or admin)
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         is_creator = contest.creator_id == current_user_id
         
         if not (is_admin_user or is_creator):
@@ -649,6 +754,51 @@ class ContestService:
 
         return await ContestRepository.get_contests_for_member(db, user_id=user_id, skip=skip, limit=limit)
 
+    @staticmethod
+    def _judge_identifier(
+        contest_judge_id: Optional[int],
+        judge_entry_id: Optional[int],
+        user_judge_id: Optional[int],
+        agent_judge_id: Optional[int],
+        username: Optional[str],
+        agent_name: Optional[str]
+    ) -> str:
+        """Resolve the public identifier of the judge behind a vote."""
+        if not contest_judge_id:
+            return f"Judge (ID: {contest_judge_id})"
+        if judge_entry_id is None:
+            return "ContestJudge entry not found"
+        if user_judge_id:
+            return username if username else "Unknown User Judge"
+        if agent_judge_id:
+            return agent_name if agent_name else "Unknown Agent Judge"
+        return f"Judge (ID: {contest_judge_id})"
+
+    @staticmethod
+    async def _load_evaluations(
+        db: AsyncSession,
+        contest_ids: Optional[List[int]] = None,
+        pairs: Optional[List[tuple]] = None
+    ) -> Dict[tuple, List[VoteEvaluationResponse]]:
+        """
+        Batched evaluation loader: fetch the evaluations of whole contests or of specific
+        (contest_id, text_id) submissions in one query, keyed by (contest_id, text_id).
+        """
+        rows = await VoteRepository.get_votes_with_judge_identities(db, contest_ids=contest_ids, pairs=pairs)
+        evaluations: Dict[tuple, List[VoteEvaluationResponse]] = {}
+        for vote_obj, judge_entry_id, user_judge_id, agent_judge_id, username, agent_name in rows:
+            evaluations.setdefault((vote_obj.contest_id, vote_obj.text_id), []).append(
+                VoteEvaluationResponse(
+                    comment=vote_obj.comment,
+                    judge_identifier=ContestService._judge_identifier(
+                        vote_obj.contest_judge_id, judge_entry_id, user_judge_id,
+                        agent_judge_id, username, agent_name
+                    ),
+                    text_place=vote_obj.text_place
+                )
+            )
+        return evaluations
+
     @staticmethod
     async def get_contest_submissions(
         db: AsyncSession,
@@ -663,6 +813,22 @@ class ContestService:
         For evaluation contests, submissions are visible but author/owner are masked
         For closed contests, all details are visible, including evaluations.
         """
+        contest = await ContestService.check_submissions_access(
+            db=db,
+            contest_id=contest_id,
+            current_user_id=current_user_id,
+            password=password
+        )
+        return await ContestService.get_submissions_for_contest(db, contest)
+
+    @staticmethod
+    async def check_submissions_access(
+        db: AsyncSession,
+        contest_id: int,
+        current_user_id: Optional[int] = None,
+        password: Optional[str] = None
+    ) -> Contest:
+        """Check that the user may list the submissions of a contest and return the contest."""
         contest = await ContestService.check_contest_access(
             db=db,
             contest_id=contest_id,
@@ -676,70 +842,84 @@ class ContestService:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Not authenticated"
                 )
-            user_repo = UserRepository(db)
-            is_admin_user = await user_repo.is_admin(current_user_id)
+            auth = get_auth_context(db, current_user_id)
+            is_admin_user = await auth.is_admin()
             is_creator = contest.creator_id == current_user_id
             if not (is_admin_user or is_creator):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Submissions are not visible to participants while the contest is open."
                 )
-        
+        return contest
+
+    @staticmethod
+    async def get_submissions_for_contest(db: AsyncSession, contest: Contest) -> List[ContestTextResponse]:
+        """List the submissions of a contest whose access has already been checked."""
+        if contest.status.lower() != "closed":
+            return await ContestService._build_submission_responses(db, contest)
+
+        # Closed contests are served from their results snapshot. Edits to the texts, submissions
+        # or judge names shown in it drop the snapshot, and the next read rebuilds it.
+        snapshot = await ResultsSnapshotRepository.get_snapshot(db, contest.id)
+        if snapshot and all("title" in item for item in snapshot.submissions):  # Skip older, partial snapshots
+            return [ContestTextResponse.model_validate(item) for item in snapshot.submissions]
+        submissions = await ContestService._build_submission_responses(db, contest)
+        await ResultsSnapshotRepository.save_snapshot(
+            db, contest.id, [submission.model_dump(mode="json") for submission in submissions]
+        )
+        return submissions
+
+    @staticmethod
+    async def get_contest_detail_etag(db: AsyncSession, contest_id: int) -> str:
+        """ETag for the contest detail view, derived from row versions without loading the view."""
+        version = await ContestRepository.get_contest_detail_version(db, contest_id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Contest with id {contest_id} not found"
+            )
+        return make_etag("contest-detail", *version)
+
+    @staticmethod
+    async def get_submissions_etag(db: AsyncSession, contest_id: int) -> str:
+        """ETag for the contest submissions view, derived from row versions without loading the view."""
+        version = await ContestRepository.get_submissions_version(db, contest_id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Contest with id {contest_id} not found"
+            )
+        return make_etag("contest-submissions", *version)
+
+    @staticmethod
+    async def _build_submission_responses(db: AsyncSession, contest: Contest) -> List[ContestTextResponse]:
+        """Build the submissions view for a contest from the live tables, masked by contest state."""
+        # Texts are eager-loaded with the submissions, and all votes for a closed contest
+        # (with their judge identities) come back in one query grouped by text.
+        contest_id = contest.id
         contest_texts = await ContestRepository.get_contest_texts(db=db, contest_id=contest_id)
-        text_repo = TextRepository(db)
-        # Fetch all votes for the contest once if it's closed to optimize DB calls
-        all_contest_votes: List[Vote] = []
-        if contest.status.lower() == "closed":
-            all_contest_votes = await VoteRepository.get_votes_by_contest(db=db, contest_id=contest_id)
+        contest_state = contest.status.lower()
+        evaluations_by_text: Dict[tuple, List[VoteEvaluationResponse]] = {}
+        if contest_state == "closed":
+            evaluations_by_text = await ContestService._load_evaluations(db, contest_ids=[contest_id])
 
         results = []
         for ct in contest_texts:
-            text = await text_repo.get_text(ct.text_id)
+            text = ct.text
             if not text:
                 continue
 
             author_name = text.author
             owner_id_val = text.owner_id
-            submission_evaluations: List[VoteEvaluationResponse] = [] # Ensure type
 
-            contest_state = contest.status.lower()
             # Mask or reveal owner/author based on contest state
             if contest_state == "evaluation":
                 author_name = "[Hidden]"
                 owner_id_val = None
             # For "open" state, author and owner are revealed only to creator/admin, handled by initial check.
             # For "closed" state, author and owner are revealed to all with access.
-            
-            if contest_state == "closed":
-                text_specific_votes = [v for v in all_contest_votes if v.text_id == ct.text_id]
-                for vote_obj in text_specific_votes:
-                    judge_identifier_str = f"Judge (ID: {vote_obj.contest_judge_id})" # Default/fallback
-                    if vote_obj.contest_judge_id:
-                        contest_judge_entry = await ContestRepository.get_contest_judge_by_id(db, vote_obj.contest_judge_id)
-                        if contest_judge_entry:
-                            if contest_judge_entry.user_judge_id:
-                                user_repo = UserRepository(db)
-                                user_judge = await user_repo.get_by_id(contest_judge_entry.user_judge_id)
-                                if user_judge:
-                                    judge_identifier_str = user_judge.username
-                                else:
-                                    judge_identifier_str = "Unknown User Judge"
-                            elif contest_judge_entry.agent_judge_id:
-                                agent_judge = await AgentRepository.get_agent_by_id(db, contest_judge_entry.agent_judge_id)
-                                if agent_judge:
-                                    judge_identifier_str = agent_judge.name
-                                else:
-                                    judge_identifier_str = "Unknown Agent Judge"
-                        else:
-                            judge_identifier_str = "ContestJudge entry not found"
-                    
-                    submission_evaluations.append(
-                        VoteEvaluationResponse(
-                            comment=vote_obj.comment,
-                            judge_identifier=judge_identifier_str,
-                            text_place=vote_obj.text_place
-                        )
-                    )
+
+            submission_evaluations = evaluations_by_text.get((ct.contest_id, ct.text_id), [])
             
             # Construct the response dictionary for the current submission
             submission_data_dict = {
@@ -760,6 +940,25 @@ class ContestService:
             
         return results
 
+    @staticmethod
+    async def build_results_snapshot(
+        db: AsyncSession, contest_id: int, commit: bool = True
+    ) -> Optional[ContestResultSnapshot]:
+        """
+        Materialize the submissions view of a closed contest (texts, rankings, points and
+        evaluations with judge names) into its snapshot, so reads are a single query.
+        Called when the contest closes and whenever its results are recalculated.
+        With commit=False the caller commits (e.g. together with closing the contest).
+        """
+        # Read past the cache: the contest may have been closed in this very transaction
+        contest = await db.get(Contest, contest_id)
+        if not contest or contest.status.lower() != "closed":
+            return None
+        submissions = await ContestService._build_submission_responses(db, contest)
+        return await ResultsSnapshotRepository.save_snapshot(
+            db, contest_id, [submission.model_dump(mode="json") for submission in submissions], commit=commit
+        )
+
     @classmethod
     async def get_all_my_submissions(
         cls, db: AsyncSession, current_user_id: int, skip: int = 0, limit: int = 100
@@ -787,47 +986,21 @@ class ContestService:
         result = await db.execute(stmt)
         raw_results = result.all()  # List of tuples: (ContestText_instance, TextModel_instance, UserModel_instance, Contest_instance)
 
+        # Evaluations for every closed-contest submission on this page, in one query
+        closed_pairs = [
+            (ct_orm.contest_id, ct_orm.text_id)
+            for ct_orm, _, _, contest_orm in raw_results
+            if contest_orm.status.lower() == "closed"
+        ]
+        evaluations_by_text = await ContestService._load_evaluations(db, pairs=closed_pairs) if closed_pairs else {}
+
         response_list = []
         for ct_orm, text_orm, owner_orm, contest_orm in raw_results:
             # Use the text's author field, which is user-provided text
             author_name = text_orm.author
             
-            submission_evaluations: List[VoteEvaluationResponse] = []
-            
-            # Include evaluations if contest is closed
-            if contest_orm.status.lower() == "closed":
-                # Fetch votes for this specific text in this contest
-                text_votes = await VoteRepository.get_votes_by_contest(db=db, contest_id=ct_orm.contest_id)
-                text_specific_votes = [v for v in text_votes if v.text_id == ct_orm.text_id]
-                
-                for vote_obj in text_specific_votes:
-                    judge_identifier_str = f"Judge (ID: {vote_obj.contest_judge_id})" # Default/fallback
-                    if vote_obj.contest_judge_id:
-                        contest_judge_entry = await ContestRepository.get_contest_judge_by_id(db, vote_obj.contest_judge_id)
-                        if contest_judge_entry:
-                            if contest_judge_entry.user_judge_id:
-                                user_repo = UserRepository(db)
-                                user_judge = await user_repo.get_by_id(contest_judge_entry.user_judge_id)
-                                if user_judge:
-                                    judge_identifier_str = user_judge.username
-                                else:
-                                    judge_identifier_str = "Unknown User Judge"
-                            elif contest_judge_entry.agent_judge_id:
-                                agent_judge = await AgentRepository.get_agent_by_id(db, contest_judge_entry.agent_judge_id)
-                                if agent_judge:
-                                    judge_identifier_str = agent_judge.name
-                                else:
-                                    judge_identifier_str = "Unknown Agent Judge"
-                        else:
-                            judge_identifier_str = "ContestJudge entry not found"
-                    
-                    submission_evaluations.append(
-                        VoteEvaluationResponse(
-                            comment=vote_obj.comment,
-                            judge_identifier=judge_identifier_str,
-                            text_place=vote_obj.text_place
-                        )
-                    )
+            # Only closed contests have evaluations
+            submission_evaluations = evaluations_by_text.get((ct_orm.contest_id, ct_orm.text_id), [])
             
             response_item = ContestTextResponse(
                 id=ct_orm.id,
@@ -846,6 +1019,40 @@ class ContestService:
         
         return response_list
 
+    @staticmethod
+    async def get_live_standings(
+        db: AsyncSession,
+        contest_id: int,
+        current_user_id: int
+    ) -> List[ContestStandingEntry]:
+        """
+        Current standings read from the running vote tallies (no vote scan).
+        Only the contest creator and admins can see them.
+        """
+        contest = await ContestService.get_contest(db=db, contest_id=contest_id)
+        auth = get_auth_context(db, current_user_id)
+        if not await auth.is_creator_or_admin(contest):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the contest creator or an admin can view live standings"
+            )
+
+        rows = await VoteRepository.get_contest_tallies(db, contest_id)
+        return [
+            ContestStandingEntry(
+                submission_id=row.ContestText.id,
+                text_id=row.ContestText.text_id,
+                title=row.title,
+                rank=row.ranking,
+                points=row.points,
+                first_places=row.first_places or 0,
+                second_places=row.second_places or 0,
+                third_places=row.third_places or 0,
+                vote_count=row.vote_count or 0
+            )
+            for row in rows
+        ]
+
     @classmethod
     async def get_my_submissions_for_contest(
         cls, db: AsyncSession, contest_id: int, current_user_id: int
@@ -872,49 +1079,19 @@ class ContestService:
         result = await db.execute(stmt)
         raw_results = result.all() # List of tuples: (ContestText_instance, TextModel_instance, UserModel_instance)
 
-        # Fetch all votes for the contest if it's closed to include evaluations
-        all_contest_votes: List[Vote] = []
-        if contest.status.lower() == "closed":
-            all_contest_votes = await VoteRepository.get_votes_by_contest(db=db, contest_id=contest_id)
+        # Evaluations for all of the user's submissions in this contest, in one query
+        evaluations_by_text: Dict[tuple, List[VoteEvaluationResponse]] = {}
+        if contest.status.lower() == "closed" and raw_results:
+            evaluations_by_text = await ContestService._load_evaluations(
+                db, pairs=[(ct_orm.contest_id, ct_orm.text_id) for ct_orm, _, _ in raw_results]
+            )
 
         response_list = []
         for ct_orm, text_orm, owner_orm in raw_results:
             # Use the text's author field, which is user-provided text
             author_name = text_orm.author
             
-            submission_evaluations: List[VoteEvaluationResponse] = []
-            
-            # Include evaluations if contest is closed
-            if contest.status.lower() == "closed":
-                text_specific_votes = [v for v in all_contest_votes if v.text_id == ct_orm.text_id]
-                for vote_obj in text_specific_votes:
-                    judge_identifier_str = f"Judge (ID: {vote_obj.contest_judge_id})" # Default/fallback
-                    if vote_obj.contest_judge_id:
-                        contest_judge_entry = await ContestRepository.get_contest_judge_by_id(db, vote_obj.contest_judge_id)
-                        if contest_judge_entry:
-                            if contest_judge_entry.user_judge_id:
-                                user_repo = UserRepository(db)
-                                user_judge = await user_repo.get_by_id(contest_judge_entry.user_judge_id)
-                                if user_judge:
-                                    judge_identifier_str = user_judge.username
-                                else:
-                                    judge_identifier_str = "Unknown User Judge"
-                            elif contest_judge_entry.agent_judge_id:
-                                agent_judge = await AgentRepository.get_agent_by_id(db, contest_judge_entry.agent_judge_id)
-                                if agent_judge:
-                                    judge_identifier_str = agent_judge.name
-                                else:
-                                    judge_identifier_str = "Unknown Agent Judge"
-                        else:
-                            judge_identifier_str = "ContestJudge entry not found"
-                    
-                    submission_evaluations.append(
-                        VoteEvaluationResponse(
-                            comment=vote_obj.comment,
-                            judge_identifier=judge_identifier_str,
-                            text_place=vote_obj.text_place
-                        )
-                    )
+            submission_evaluations = evaluations_by_text.get((ct_orm.contest_id, ct_orm.text_id), [])
             
             response_item = ContestTextResponse(
                 id=ct_orm.id, # This is submission_id
@@ -945,8 +1122,8 @@ class ContestService:
         contest = await ContestService.get_contest(db=db, contest_id=contest_id)
         
         # Check permissions: only contest creator or admin can add members
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         if contest.creator_id != current_user_id and not is_admin_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -954,7 +1131,7 @@ class ContestService:
             )
         
         # Check if user exists
-        user_to_add = await user_repo.get_by_id(user_id)
+        user_to_add = await UserRepository(db).get_by_id(user_id)
         if not user_to_add:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -963,6 +1140,7 @@ class ContestService:
         
         # Add member
         member = await ContestRepository.add_member_to_contest(db, contest_id, user_id)
+        forget_contest_facts(db, contest_id)
         if not member:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -989,8 +1167,8 @@ class ContestService:
         contest = await ContestService.get_contest(db=db, contest_id=contest_id)
         
         # Check permissions: only contest creator or admin can remove members
-        user_repo = UserRepository(db)
-        is_admin_user = await user_repo.is_admin(current_user_id)
+        auth = get_auth_context(db, current_user_id)
+        is_admin_user = await auth.is_admin()
         if contest.creator_id != current_user_id and not is_admin_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1006,6 +1184,7 @@ class ContestService:
         
         # Remove member
         removed = await ContestRepository.remove_member_from_contest(db, contest_id, user_id)
+        forget_contest_facts(db, contest_id)
         if not removed:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
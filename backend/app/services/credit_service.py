@@ -26,7 +26,7 @@ class CreditService:
         This operation can only be performed by an admin.
         """
         user_repo = UserRepository(db)
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_by_id(user_id, use_cache=False)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -74,7 +74,7 @@ class CreditService:
             The created transaction record
         """
         user_repo = UserRepository(db)
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_by_id(user_id, use_cache=False)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -110,7 +110,7 @@ class CreditService:
     ) -> List[CreditTransaction]:
         """Get all credit transactions for a specific user."""
         user_repo = UserRepository(db)
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_by_id(user_id, use_cache=False)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -151,7 +151,7 @@ class CreditService:
     async def has_sufficient_credits(db: AsyncSession, user_id: int, required_credits: int) -> bool:
         """Check if a user has sufficient credits for an operation."""
         user_repo = UserRepository(db)
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_by_id(user_id, use_cache=False)
         if not user:
             # Consider if this should return False or raise an error.
             # Raising error seems more appropriate if user must exist.
@@ -182,7 +182,7 @@ class CreditService:
             )
             
         user_repo = UserRepository(db)
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_by_id(user_id, use_cache=False)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -220,7 +220,7 @@ class CreditService:
             )
             
         user_repo = UserRepository(db)
-        user = await user_repo.get_by_id(user_id)
+        user = await user_repo.get_by_id(user_id, use_cache=False)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
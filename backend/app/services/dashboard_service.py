@@ -0,0 +1,50 @@
+from typing import Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.user import User
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.user_repository import UserRepository
+from app.schemas.contest import ContestResponse
+from app.schemas.user import UserResponse
+from app.services.contest_service import ContestService
+
+
+class DashboardService:
+    @staticmethod
+    async def get_user_dashboard(db: AsyncSession, current_user: User) -> Dict[str, Any]:
+        """
+        Assemble the dashboard from a fixed set of queries on the request's session:
+        authored contests, judged contests, pending judge actions and activity counts.
+        The number of queries doesn't depend on how many contests the user judges.
+        """
+        user_id = current_user.id
+
+        author_contests_data = await ContestService.get_contests(db, creator=user_id, limit=100)
+        raw_judge_contests = await ContestRepository.get_contests_for_judge(db, user_judge_id=user_id)
+        pending_contests = await ContestRepository.get_pending_judge_contests(db, user_judge_id=user_id)
+        counts = await UserRepository(db).get_activity_counts(user_id)
+        judge_contests_data = [ContestResponse.model_validate(contest_dict) for contest_dict in raw_judge_contests]
+
+        urgent_actions = [
+            {
+                "type": "judge_contest",
+                "contest_id": contest.id,
+                "contest_title": contest.title,
+            }
+            for contest in pending_contests
+        ]
+
+        return {
+            "user_info": UserResponse.model_validate(current_user),
+            "author_contests": author_contests_data,
+            "judge_contests": judge_contests_data,
+            "credit_balance": current_user.credits,
+            "urgent_actions": urgent_actions,
+            "contest_count": counts["contest_count"],
+            "text_count": counts["text_count"],
+            "agent_count": counts["agent_count"],
+            "participation": {
+                "as_author": counts["contest_count"],
+                "as_judge": len(judge_contests_data)
+            }
+        }
@@ -6,7 +6,7 @@ from sqlalchemy.orm import joinedload
 
 from app.db.repositories.vote_repository import VoteRepository
 from app.db.repositories.contest_repository import ContestRepository
-from app.db.repositories.user_repository import UserRepository
+from app.services.auth_context import get_auth_context
 from app.db.repositories.agent_repository import AgentRepository
 from app.services.credit_service import CreditService
 from app.services.ai_service import AIService
@@ -14,7 +14,9 @@ from app.schemas.vote import VoteCreate
 from app.schemas.agent import AgentExecuteJudge, AgentExecutionResponse
 from app.db.models import Contest, ContestJudge, User, ContestText, Vote, AgentExecution, Agent
 from app.utils.ai_models import estimate_credits, estimate_cost_usd
+from app.utils.tokens import estimate_token_count, tokenizer_for_model
 from app.services.ai_strategies.judge_strategies import JUDGE_VERSION
+from app.services.model_router import resolve_routing_policy, validate_routing_policy
 
 
 class JudgeType:
@@ -32,9 +34,11 @@ class JudgeContext:
         self.judge_id = judge_id      # user_id for human, agent_id for AI
         self.user_id = user_id        # The actual user performing the action (owner for AI agents)
         self.agent_id = agent_id      # None for human, agent_id for AI
-        self.model = model            # None for human, model name for AI
+        self.model = model            # None for human, model name for AI (the one that served the call, after a fallback)
         self.contest_judge_entry = contest_judge_entry
         self.api_version = api_version  # Track API version for AI strategy changes
+        # (prompt_tokens, completion_tokens, cached_prompt_tokens, cache_write_tokens) reported by the provider, AI only
+        self.token_usage: Optional[Tuple[int, int, int, int]] = None
 
 
 class JudgeEstimation:
@@ -117,7 +121,17 @@ class JudgeService:
             
             # Step 5: AI audit stuff (once per judging session, AI only)
             if execution_record and estimation:
-                actual_credits_used = estimation.estimated_credits  # For now, use estimation
+                if judge_context.token_usage:
+                    # Charge what the provider reported, with prompt tokens read from (written to)
+                    # the cache at the cached-input (cache-write) price
+                    actual_credits_used = estimate_credits(judge_context.model, *judge_context.token_usage)
+                    prompt_tokens, completion_tokens, _, _ = judge_context.token_usage
+                    tokens_used = prompt_tokens + completion_tokens
+                    real_cost_usd = estimate_cost_usd(judge_context.model, *judge_context.token_usage)
+                else:
+                    actual_credits_used = estimation.estimated_credits
+                    tokens_used = estimation.estimated_input_tokens + estimation.estimated_output_tokens
+                    real_cost_usd = estimation.estimated_cost_usd
                 execution_record.status = "completed"
                 execution_record.credits_used = actual_credits_used
                 
@@ -128,8 +142,8 @@ class JudgeService:
                     amount=actual_credits_used,
                     description=f"AI Judge Agent: {agent.name}",
                     ai_model=judge_context.model,
-                    tokens_used=estimation.estimated_input_tokens + estimation.estimated_output_tokens,
-                    real_cost_usd=estimation.estimated_cost_usd
+                    tokens_used=tokens_used,
+                    real_cost_usd=real_cost_usd
                 )
                 
                 await db.commit()
@@ -170,18 +184,14 @@ class JudgeService:
                 detail="Contest not found"
             )
         
-        contest_texts = await ContestRepository.get_contest_texts(db, contest_id)
-        
-        # Calculate average text length for estimation
-        if contest_texts:
-            total_length = sum(len(ct.text.content) for ct in contest_texts)
-            avg_text_length = total_length // len(contest_texts)
-        else:
-            avg_text_length = 500  # Default assumption
+        # Summed from the token counts stored on the texts, without loading their content
+        text_count, text_tokens = await ContestRepository.get_contest_text_size(
+            db, contest_id, tokenizer_for_model(model)
+        )
         
         # Estimate tokens
         estimated_input_tokens, estimated_output_tokens = JudgeService._estimate_judge_tokens(
-            agent.prompt, model, contest.description, len(contest_texts), avg_text_length
+            agent.prompt, model, contest.description, text_count, text_tokens
         )
         
         # Calculate costs
@@ -226,7 +236,7 @@ class JudgeService:
         
         # Return execution response
         execution_record = await AgentRepository.get_latest_execution(
-            db, judge_context.agent_id, request.model, "judge"
+            db, judge_context.agent_id, judge_context.model, "judge"
         )
         return [AgentExecutionResponse.model_validate(execution_record)]
     
@@ -354,16 +364,10 @@ class JudgeService:
         judge_context: JudgeContext,
         created_votes: List[Vote]
     ):
-        """Update judge completion status and check for contest completion"""
-        # Count podium votes for this judge using the is_ai column
-        podium_votes_stmt = select(Vote).filter(
-            Vote.contest_judge_id == judge_context.contest_judge_entry.id,
-            Vote.text_place.isnot(None),
-            Vote.is_ai == (judge_context.judge_type == JudgeType.AI)
-        )
-        
-        result = await db.execute(podium_votes_stmt)
-        podium_votes = result.scalars().all()
+        """Update judge completion status and close the contest when the last judge completes"""
+        # The judge's previous votes were replaced in this session, so the podium places
+        # are the ones just created
+        assigned_places = len({vote.text_place for vote in created_votes if vote.text_place is not None})
         
         # Get total texts in contest
         total_texts_stmt = select(func.count(ContestText.id)).filter(ContestText.contest_id == contest_id)
@@ -371,15 +375,14 @@ class JudgeService:
         total_texts = result.scalar_one()
         
         required_places = min(3, total_texts)
-        assigned_places = len(podium_votes)
         
         # Mark judge as completed if they've assigned all required places
         if assigned_places >= required_places:
-            judge_context.contest_judge_entry.has_voted = True
-            await db.commit()
+            judges_remaining = await ContestRepository.set_judge_has_voted(db, judge_context.contest_judge_entry, True)
             
-            # Check if all judges have completed voting
-            await JudgeService._check_contest_completion(db, contest_id)
+            # Only the request that completes the last judge checks for closure
+            if judges_remaining == 0:
+                await JudgeService._check_contest_completion(db, contest_id)
     
     @staticmethod
     async def _check_contest_completion(db: AsyncSession, contest_id: int):
@@ -422,13 +425,13 @@ class JudgeService:
             )
         
         # Check permissions
-        user_repo = UserRepository(db)
-        is_admin = await user_repo.is_admin(user_id)
+        is_admin = await get_auth_context(db, user_id).is_admin()
         if agent.owner_id != user_id and not is_admin and not agent.is_public:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to use this agent"
             )
+        validate_routing_policy(request.routing)
         
         return JudgeContext(
             judge_type=JudgeType.AI,
@@ -459,17 +462,24 @@ class JudgeService:
             })
         
         # Generate AI response using the correct method name and parameters
-        ai_response, actual_prompt_tokens, actual_completion_tokens = await AIService.judge_contest(
+        (ai_response, actual_prompt_tokens, actual_completion_tokens,
+         actual_cached_prompt_tokens, actual_cache_write_tokens, served_model) = await AIService.judge_contest(
             model=request.model,
             personality_prompt=agent.prompt,
             contest_description=contest.description,
             texts=texts_for_ai,
+            routing=resolve_routing_policy(request.routing, agent.routing),
             # Debug parameters
             db_session=db,
             user_id=judge_context.user_id,
             agent_id=judge_context.agent_id,
             contest_id=request.contest_id
         )
+        # Estimation, execution record, credits and votes are all recorded against the served model
+        judge_context.model = served_model
+        judge_context.token_usage = (
+            actual_prompt_tokens, actual_completion_tokens, actual_cached_prompt_tokens, actual_cache_write_tokens
+        )
         
         # Parse AI response into vote data
         votes_data = []
@@ -479,7 +489,7 @@ class JudgeService:
                 text_place=vote_info.get("text_place"),
                 comment=vote_info.get("comment", "AI Judge evaluation"),
                 is_ai_vote=True,
-                ai_model=request.model
+                ai_model=served_model
             )
             votes_data.append(vote_create)
         
@@ -491,18 +501,17 @@ class JudgeService:
         model: str, 
         contest_description: str,
         text_count: int, 
-        avg_text_length: Optional[int] = None
+        text_tokens: Optional[int] = None
     ) -> Tuple[int, int]:
         """Estimate tokens for judge execution"""
-        if avg_text_length is None:
-            avg_text_length = 500
+        if text_tokens is None:
+            text_tokens = (500 // 4) * text_count  # Default assumption: 500 characters per text
         
         # Base input from prompt and contest description
-        base_input = len(agent_prompt) // 4 + len(contest_description) // 4
+        base_input = estimate_token_count(agent_prompt, model_id=model) + estimate_token_count(contest_description, model_id=model)
         
-        # Add estimated tokens per text (title + content + formatting)
-        per_text_input = avg_text_length // 4 + 20  # Content + title + formatting
-        total_input_tokens = base_input + (per_text_input * text_count)
+        # Add the texts' tokens (title + content) plus formatting per text
+        total_input_tokens = base_input + text_tokens + 20 * text_count
         
         # Estimate output tokens (commentary per text + ranking)
         per_text_output = 100  # Estimated commentary per text
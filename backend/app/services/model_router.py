@@ -0,0 +1,140 @@
+"""
+Model fallback routing for AI writer and judge calls.
+
+A routing policy (stored on the agent, or sent with the request) lists the models to
+fall back to when the requested one is slow or failing. A call moves on to the next model
+when it fails or runs over the policy's latency budget, and models whose provider has
+been failing often are skipped up front. The outcome of every call is recorded per
+provider, with or without a policy, so error rates are already known when an incident starts.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.schemas.agent import ModelRoutingPolicy
+from app.services.ai_provider_service import get_provider_for_model
+from app.utils.ai_models import get_model_by_id, is_model_available
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProviderHealth:
+    """Recent call outcomes per provider, kept in memory by each worker process."""
+
+    def __init__(self):
+        self._outcomes: Dict[str, Deque[Tuple[float, bool]]] = defaultdict(deque)
+
+    def _window(self, provider: str, now: float) -> Deque[Tuple[float, bool]]:
+        outcomes = self._outcomes[provider]
+        cutoff = now - settings.MODEL_ROUTING_ERROR_WINDOW_SECONDS
+        while outcomes and outcomes[0][0] < cutoff:
+            outcomes.popleft()
+        return outcomes
+
+    def record(self, provider: str, ok: bool) -> None:
+        now = time.monotonic()
+        self._window(provider, now).append((now, ok))
+
+    def error_rate(self, provider: str) -> Optional[float]:
+        """Share of failed calls in the window, None until it holds MODEL_ROUTING_MIN_CALLS calls."""
+        outcomes = self._window(provider, time.monotonic())
+        if len(outcomes) < settings.MODEL_ROUTING_MIN_CALLS:
+            return None
+        return sum(1 for _, ok in outcomes if not ok) / len(outcomes)
+
+    def reset(self) -> None:
+        self._outcomes.clear()
+
+
+provider_health = ProviderHealth()
+
+
+def _provider_of(model_id: str) -> str:
+    model = get_model_by_id(model_id)
+    return model.provider.value if model else model_id
+
+
+def resolve_routing_policy(
+    request_policy: Optional[ModelRoutingPolicy], agent_routing: Optional[dict]
+) -> Optional[ModelRoutingPolicy]:
+    """The policy sent with the request, otherwise the one stored on the agent."""
+    if request_policy is not None:
+        return request_policy
+    return ModelRoutingPolicy.model_validate(agent_routing) if agent_routing else None
+
+
+def validate_routing_policy(policy: Optional[ModelRoutingPolicy]) -> None:
+    """Reject policies that fall back to models missing from the catalog or unavailable."""
+    if policy is None:
+        return
+    invalid = [model_id for model_id in policy.fallback_models if not is_model_available(model_id)]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fallback models not found or not available: {', '.join(invalid)}"
+        )
+
+
+def candidate_models(model_id: str, policy: Optional[ModelRoutingPolicy], required_tokens: int = 0) -> List[str]:
+    """
+    The requested model followed by the policy's fallbacks that are available, have a
+    provider implementation and a context window that fits `required_tokens`.
+    """
+    candidates = [model_id]
+    for fallback_id in (policy.fallback_models if policy else []):
+        fallback = get_model_by_id(fallback_id)
+        if fallback_id in candidates or fallback is None or not fallback.available:
+            continue
+        if fallback.context_window_k * 1000 < required_tokens or get_provider_for_model(fallback_id) is None:
+            continue
+        candidates.append(fallback_id)
+    return candidates
+
+
+async def route_model_call(
+    model_id: str,
+    policy: Optional[ModelRoutingPolicy],
+    call: Callable[[str], Awaitable[T]],
+    required_tokens: int = 0
+) -> Tuple[T, str]:
+    """
+    Run `call(model)` on the requested model or, following the policy, on its fallbacks.
+    Returns the result and the model that served it. The last model tried gets no latency
+    budget, and its error is raised.
+    """
+    candidates = candidate_models(model_id, policy, required_tokens)
+    if len(candidates) > 1:
+        max_error_rate = policy.max_error_rate
+        if max_error_rate is None:
+            max_error_rate = settings.MODEL_ROUTING_MAX_ERROR_RATE
+        healthy = [
+            candidate for candidate in candidates
+            if (provider_health.error_rate(_provider_of(candidate)) or 0.0) <= max_error_rate
+        ]
+        # When every provider looks unhealthy they are still tried, in order
+        if healthy and healthy[0] != model_id:
+            logger.warning(f"Provider of model '{model_id}' is over its error rate threshold; routing to '{healthy[0]}'")
+        candidates = healthy or candidates
+
+    for index, candidate in enumerate(candidates):
+        is_last = index == len(candidates) - 1
+        budget = None if is_last else policy.latency_budget_seconds
+        try:
+            result = await asyncio.wait_for(call(candidate), timeout=budget)
+        except Exception as e:
+            provider_health.record(_provider_of(candidate), ok=False)
+            if is_last:
+                raise
+            reason = "exceeded its latency budget" if isinstance(e, asyncio.TimeoutError) else f"failed ({e})"
+            logger.warning(f"Model '{candidate}' {reason}; falling back to '{candidates[index + 1]}'")
+            continue
+        provider_health.record(_provider_of(candidate), ok=True)
+        return result, candidate
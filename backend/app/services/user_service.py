@@ -117,7 +117,7 @@ class UserService:
                 detail="Not enough permissions"
             )
             
-        user = await self.repository.get_by_id(user_id)
+        user = await self.repository.get_by_id(user_id, use_cache=False)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -8,7 +8,7 @@ from app.db.repositories.vote_repository import VoteRepository
 from app.db.repositories.contest_repository import ContestRepository
 from app.db.repositories.user_repository import UserRepository
 from app.schemas.vote import VoteCreate, VoteResponse
-from app.db.models import Contest, ContestJudge, User, Vote, Agent
+from app.db.models import Contest, ContestJudge, User, Vote, Agent, AgentExecution, ContestText
 
 
 class VoteService:
@@ -59,7 +59,7 @@ class VoteService:
         # Get all votes for this contest with relationships loaded
         votes_stmt = select(Vote).filter(Vote.contest_id == contest_id).options(
             selectinload(Vote.contest_judge),
-            selectinload(Vote.agent_execution)
+            selectinload(Vote.agent_execution).selectinload(AgentExecution.agent).load_only(Agent.version)
         )
         votes_result = await db.execute(votes_stmt)
         votes = votes_result.scalars().all()
@@ -80,11 +80,9 @@ class VoteService:
                 # Get AI model and version from agent_execution
                 if vote.agent_execution:
                     ai_model = vote.agent_execution.model
-                    # Get AI version - we need to fetch the agent
-                    if vote.agent_execution.agent_id:
-                        agent_stmt = select(Agent.version).filter(Agent.id == vote.agent_execution.agent_id)
-                        agent_result = await db.execute(agent_stmt)
-                        ai_version = agent_result.scalar_one_or_none()
+                    # AI version comes from the agent, loaded with the votes
+                    if vote.agent_execution.agent:
+                        ai_version = vote.agent_execution.agent.version
             else:
                 # For human votes, judge_id is the user_judge_id
                 if vote.contest_judge and vote.contest_judge.user_judge_id:
@@ -185,7 +183,7 @@ class VoteService:
             Vote.contest_judge_id.in_(contest_judge_ids)
         ).options(
             selectinload(Vote.contest_judge),
-            selectinload(Vote.agent_execution)
+            selectinload(Vote.agent_execution).selectinload(AgentExecution.agent).load_only(Agent.version)
         )
         
         # Apply vote_type filter using the is_ai column
@@ -213,11 +211,9 @@ class VoteService:
                 # Get AI model and version from agent_execution
                 if vote.agent_execution:
                     ai_model = vote.agent_execution.model
-                    # Get AI version - we need to fetch the agent
-                    if vote.agent_execution.agent_id:
-                        agent_stmt = select(Agent.version).filter(Agent.id == vote.agent_execution.agent_id)
-                        agent_result = await db.execute(agent_stmt)
-                        ai_version = agent_result.scalar_one_or_none()
+                    # AI version comes from the agent, loaded with the votes
+                    if vote.agent_execution.agent:
+                        ai_version = vote.agent_execution.agent.version
             else:
                 # For human votes, judge_id is the user_judge_id
                 if vote.contest_judge and vote.contest_judge.user_judge_id:
@@ -304,44 +300,32 @@ class VoteService:
             
             required_places = min(3, total_texts)
             if len(remaining_votes) < required_places and vote_to_delete.contest_judge:
-                vote_to_delete.contest_judge.has_voted = False
-                await db.commit()
+                await ContestRepository.set_judge_has_voted(db, vote_to_delete.contest_judge, False)
         
-        # Delete the vote
-        await db.delete(vote_to_delete)
-        await db.commit()
+        # Delete the vote (and take it out of the contest tallies)
+        await VoteRepository.remove_vote(db, vote_to_delete)
 
     @staticmethod
     async def check_contest_completion(db: AsyncSession, contest_id: int) -> None:
         """
-        Check if all judges have completed their voting and close the contest if they have.
+        Close the contest and calculate its results if all judges have completed their voting.
+        Completion is read from the contest's judges_remaining counter, and the close itself is a
+        conditional UPDATE, so the results are computed exactly once even when the last judges
+        finish concurrently. The close, the rankings and the results snapshot are committed
+        together: if any step fails the contest stays in evaluation and the contest scheduler
+        retries it.
         """
-        contest = await ContestRepository.get_contest(db, contest_id)
-        if not contest or contest.status != "evaluation":
-            return
-        
-        # Get all judges for this contest
-        assigned_judges_stmt = select(ContestJudge).filter(
-            ContestJudge.contest_id == contest_id
-        )
-        assigned_judges_result = await db.execute(assigned_judges_stmt)
-        assigned_judges = assigned_judges_result.scalars().all()
+        from app.services.contest_service import ContestService
+        try:
+            if not await ContestRepository.close_completed_contest(db, contest_id):
+                return
+            await VoteRepository.calculate_results_for_contests(db, [contest_id], commit=False)
+            # Freeze the final results for closed-contest views
+            await ContestService.build_results_snapshot(db, contest_id, commit=False)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        await ContestRepository.invalidate_contest_cache(contest_id)
         
-        # If there are no judges, we can't complete
-        if not assigned_judges:
-            return
-        
-        # Check if all judges have completed voting
-        all_voted = all(ja.has_voted for ja in assigned_judges)
-        
-        # If all judges have voted, close the contest and calculate results
-        if all_voted:
-            # Calculate results
-            await VoteRepository.calculate_contest_results(db, contest_id)
-            
-            # Update contest state
-            from app.schemas.contest import ContestUpdate
-            contest_update = ContestUpdate(status="closed")
-            await ContestRepository.update_contest(db, contest_id, contest_update)
-            
-            # Could add notification logic here 
\ No newline at end of file
+        # Could add notification logic here 
\ No newline at end of file
@@ -3,13 +3,20 @@ Module for handling AI model configurations and selections.
 This provides utility functions for working with AI models and their cost structures.
 """
 
+import functools
+import hashlib
 import json
 import os
+from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, List, Optional, Union
 from pydantic import BaseModel
 import math
 
+# Writing a prompt prefix to the provider's cache costs more than sending it uncached
+# (Anthropic bills cache writes at 1.25x the input price); OpenAI caches for free.
+CACHE_WRITE_COST_MULTIPLIER = 1.25
+
 
 class ModelProvider(str, Enum):
     """Enum for AI model providers"""
@@ -30,62 +37,88 @@ class AIModel(BaseModel):
     context_window_k: int
     input_cost_usd_per_1k_tokens: float
     output_cost_usd_per_1k_tokens: float
+    # Price of input tokens served from the provider's prompt cache (None: billed as regular input)
+    cached_input_cost_usd_per_1k_tokens: Optional[float] = None
     available: bool
 
 
-# Load model definitions from JSON
 _models_file_path = os.path.join(os.path.dirname(__file__), "ai_model_costs.json")
-with open(_models_file_path, "r") as f:
-    _models_data = json.load(f)
 
-# Convert to AIModel objects
-_models: List[AIModel] = [AIModel(**model_data) for model_data in _models_data]
 
-# Create lookup dictionaries for faster access
-_models_by_id: Dict[str, AIModel] = {model.id: model for model in _models}
-_available_models: List[AIModel] = [model for model in _models if model.available]
+@dataclass(frozen=True)
+class ModelCatalog:
+    """The parsed model definitions with their lookup tables"""
+    models: List[AIModel]
+    models_by_id: Dict[str, AIModel]
+    available_models: List[AIModel]
+    # Version of the catalog contents, used as ETag for the /models endpoints
+    etag: str
+
+
+@functools.lru_cache(maxsize=None)
+def load_model_catalog() -> ModelCatalog:
+    """Read and validate the model definitions on first use (or during the startup warmup)"""
+    with open(_models_file_path, "r") as f:
+        models_data = json.load(f)
+    models = [AIModel(**model_data) for model_data in models_data]
+    return ModelCatalog(
+        models=models,
+        models_by_id={model.id: model for model in models},
+        available_models=[model for model in models if model.available],
+        etag='"' + hashlib.sha1(json.dumps(models_data, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+    )
 
 
 def get_all_models() -> List[AIModel]:
     """Get all models, regardless of availability"""
-    return _models
+    return load_model_catalog().models
 
 
 def get_available_models() -> List[AIModel]:
     """Get only available models"""
-    return _available_models
+    return load_model_catalog().available_models
 
 
 def get_provider_models(provider: ModelProvider, available_only: bool = True) -> List[AIModel]:
     """Get models from a specific provider"""
+    catalog = load_model_catalog()
     if available_only:
-        return [model for model in _available_models if model.provider == provider]
-    return [model for model in _models if model.provider == provider]
+        return [model for model in catalog.available_models if model.provider == provider]
+    return [model for model in catalog.models if model.provider == provider]
+
+
+def get_catalog_etag() -> str:
+    """Get a strong ETag identifying the current model catalog"""
+    return load_model_catalog().etag
 
 
 def get_model_by_id(model_id: str) -> Optional[AIModel]:
     """Get a specific model by ID"""
-    return _models_by_id.get(model_id)
+    return load_model_catalog().models_by_id.get(model_id)
 
 
 def is_model_available(model_id: str) -> bool:
     """Check if a model is available"""
-    model = _models_by_id.get(model_id)
+    model = get_model_by_id(model_id)
     return model is not None and model.available
 
 
 def estimate_cost_usd(
     model_id: str, 
     input_tokens: int, 
-    output_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None,
+    cached_input_tokens: int = 0,
+    cache_write_tokens: int = 0
 ) -> float:
     """
     Calculate the cost in USD for using a model with the given token counts
     
     Args:
         model_id: ID of the model to use
-        input_tokens: Number of input tokens
+        input_tokens: Number of input tokens, including the cached ones
         output_tokens: Number of output tokens (defaults to 0 if not specified)
+        cached_input_tokens: How many of the input tokens were read from the prompt cache
+        cache_write_tokens: How many of the input tokens were written to the prompt cache
         
     Returns:
         Estimated cost in USD
@@ -93,11 +126,19 @@ def estimate_cost_usd(
     Raises:
         ValueError: If the model ID is not recognized
     """
-    model = _models_by_id.get(model_id)
+    model = get_model_by_id(model_id)
     if not model:
         raise ValueError(f"Unknown model ID: {model_id}")
     
-    input_cost = (input_tokens / 1000) * model.input_cost_usd_per_1k_tokens
+    cached_input_tokens = min(cached_input_tokens or 0, input_tokens)
+    cache_write_tokens = min(cache_write_tokens or 0, input_tokens - cached_input_tokens)
+    cached_rate = model.cached_input_cost_usd_per_1k_tokens
+    if cached_rate is None:
+        cached_rate = model.input_cost_usd_per_1k_tokens
+    uncached_tokens = input_tokens - cached_input_tokens - cache_write_tokens
+    input_cost = (uncached_tokens / 1000) * model.input_cost_usd_per_1k_tokens
+    input_cost += (cached_input_tokens / 1000) * cached_rate
+    input_cost += (cache_write_tokens / 1000) * model.input_cost_usd_per_1k_tokens * CACHE_WRITE_COST_MULTIPLIER
     output_cost = 0
     if output_tokens:
         output_cost = (output_tokens / 1000) * model.output_cost_usd_per_1k_tokens
@@ -105,7 +146,13 @@ def estimate_cost_usd(
     return input_cost + output_cost
 
 
-def estimate_credits(model_id: str, input_tokens: int, output_tokens: Optional[int] = None) -> int:
+def estimate_credits(
+    model_id: str,
+    input_tokens: int,
+    output_tokens: Optional[int] = None,
+    cached_input_tokens: int = 0,
+    cache_write_tokens: int = 0
+) -> int:
     """
     Calculate the cost in credits for using a model with the given token counts.
     1 credit = $0.01 USD.
@@ -113,7 +160,7 @@ def estimate_credits(model_id: str, input_tokens: int, output_tokens: Optional[i
     All credit cost logic is centralized here.
     TODO: Review/remove the multiplier once cost calculation is verified.
     """
-    cost_usd = estimate_cost_usd(model_id, input_tokens, output_tokens)
+    cost_usd = estimate_cost_usd(model_id, input_tokens, output_tokens, cached_input_tokens, cache_write_tokens)
     real_credits = cost_usd * 100  # 1 credit = $0.01
     credits = math.ceil(real_credits * 1.5)
     return max(1, credits)  # Minimum 1 credit per operation 
\ No newline at end of file
@@ -1,11 +1,262 @@
+import asyncio
+import hashlib
 import json
+import logging
 import time
-from typing import Optional, Dict, Any, List
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+import zlib
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.core.config import settings
-from app.db.models.ai_debug_log import AIDebugLog
+from app.db.database import AsyncSessionLocal
+from app.db.models.ai_debug_log import AIDebugLog, AIDebugBlob
+
+logger = logging.getLogger(__name__)
+
+# Bodies are cut into chunks at blank lines. Whether a blank line is a cut depends only on
+# the paragraph before it: paragraphs of at least BLOB_PARAGRAPH_CHUNK_CHARS always end a
+# chunk, shorter ones when their hash picks them (about one in BLOB_BOUNDARY_ODDS). An edit
+# only changes the chunks around it, and a section shared by several prompts (the base
+# prompt, a contest's texts) produces the same chunks (and hashes) wherever it appears.
+BLOB_PARAGRAPH_CHUNK_CHARS = 1024
+BLOB_BOUNDARY_ODDS = 4
+BODY_FIELDS = (("llm_prompt", "llm_prompt_blobs"), ("llm_response", "llm_response_blobs"))
+# Chunks fetched per query when streaming a body
+BODY_STREAM_BATCH = 16
+# Columns of the log listing: everything except the (potentially huge) texts
+SUMMARY_COLUMNS = (
+    AIDebugLog.id,
+    AIDebugLog.timestamp,
+    AIDebugLog.operation_type,
+    AIDebugLog.user_id,
+    AIDebugLog.agent_id,
+    AIDebugLog.contest_id,
+    AIDebugLog.model_id,
+    AIDebugLog.execution_time_ms,
+    AIDebugLog.prompt_tokens,
+    AIDebugLog.completion_tokens,
+    AIDebugLog.cost_usd
+)
+
+
+def _ends_chunk(paragraph: str) -> bool:
+    if len(paragraph) >= BLOB_PARAGRAPH_CHUNK_CHARS:
+        return True
+    digest = hashlib.blake2b(paragraph.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % BLOB_BOUNDARY_ODDS == 0
+
+
+def split_body(body: str) -> List[str]:
+    """
+    Split a body into chunks at content-defined blank lines; rejoining the chunks with
+    blank lines restores it exactly.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    for paragraph in body.split("\n\n"):
+        current.append(paragraph)
+        if _ends_chunk(paragraph):
+            chunks.append("\n\n".join(current))
+            current = []
+    if current or not chunks:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def pack_bodies(batch: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Replace prompt/response bodies in queued log rows with chunk hashes.
+    Returns the distinct compressed chunks (keyed by hash) and the rewritten rows.
+    """
+    blobs: Dict[str, Dict[str, Any]] = {}
+    rows = []
+    for values in batch:
+        row = dict(values)
+        for body_field, blobs_field in BODY_FIELDS:
+            body = row.pop(body_field, None)
+            if body is None:
+                continue
+            hashes = []
+            for chunk in split_body(body):
+                raw = chunk.encode("utf-8")
+                digest = hashlib.sha256(raw).hexdigest()
+                hashes.append(digest)
+                blob = blobs.get(digest)
+                if blob is None:
+                    blobs[digest] = {
+                        "hash": digest,
+                        "data": zlib.compress(raw, 6),
+                        "size": len(raw),
+                        "last_used_at": row["timestamp"]
+                    }
+                else:
+                    blob["last_used_at"] = max(blob["last_used_at"], row["timestamp"])
+            row[blobs_field] = hashes
+        rows.append(row)
+    return blobs, rows
+
+
+class DebugLogWriter:
+    """
+    Buffers debug log rows in memory and writes them in batches on its own session.
+    Enqueueing never touches the database; when the queue is full new rows are dropped.
+    Retention runs every `retention_seconds` as a delete below an id threshold.
+    stop() lets a write in progress finish, then writes whatever is still queued.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_seconds: float,
+                 retention: int, retention_seconds: int, session_factory=AsyncSessionLocal):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.retention = retention
+        self.retention_seconds = retention_seconds
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+        self._batch: List[Dict[str, Any]] = []
+        self._last_retention = 0.0
+        self.written = 0
+        self.dropped = 0
+        self._reported_dropped = 0
+
+    def enqueue(self, values: Dict[str, Any]) -> None:
+        queue = self._get_queue()
+        try:
+            queue.put_nowait(values)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _get_queue(self) -> asyncio.Queue:
+        # The writer task starts lazily, on the loop of the first enqueue
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._loop = loop
+            self._batch = []
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    def _drain(self) -> None:
+        while len(self._batch) < self.batch_size:
+            try:
+                self._batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    async def _run(self) -> None:
+        while True:
+            self._batch.append(await self._queue.get())
+            if self._queue.qsize() < self.batch_size - 1:
+                # Give a burst a moment to accumulate into one INSERT
+                await asyncio.sleep(self.flush_seconds)
+            self._drain()
+            batch, self._batch = self._batch, []
+            # Shielded, so stop() lets a write in progress finish instead of losing its batch
+            self._writing = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._writing)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if self.dropped > self._reported_dropped:
+            logger.warning("AI debug log queue full, dropped %d rows", self.dropped - self._reported_dropped)
+            self._reported_dropped = self.dropped
+        try:
+            # Hashing and compressing large prompts is CPU work; keep it off the event loop
+            blobs, rows = await asyncio.to_thread(pack_bodies, batch)
+            async with self.session_factory() as db:
+                if blobs:
+                    await self._store_blobs(db, list(blobs.values()))
+                if rows:
+                    await db.execute(insert(AIDebugLog), rows)
+                    self.written += len(rows)
+                if time.monotonic() - self._last_retention >= self.retention_seconds:
+                    await self._apply_retention(db)
+                    self._last_retention = time.monotonic()
+                await db.commit()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Don't let debug logging break the writer loop
+            logger.exception("Failed to write %d AI debug logs", len(batch))
+
+    async def _apply_retention(self, db: AsyncSession) -> None:
+        """Keep only the newest `retention` logs; ids grow with time, so one index probe finds the cut."""
+        threshold = await db.scalar(
+            select(AIDebugLog.id).order_by(AIDebugLog.id.desc()).offset(self.retention).limit(1)
+        )
+        if threshold is not None:
+            await db.execute(delete(AIDebugLog).where(AIDebugLog.id <= threshold))
+            # A chunk not used since the oldest remaining log is referenced by no log
+            oldest = await db.scalar(select(func.min(AIDebugLog.timestamp)))
+            if oldest is not None:
+                await db.execute(delete(AIDebugBlob).where(AIDebugBlob.last_used_at < oldest))
+
+    @staticmethod
+    async def _store_blobs(db: AsyncSession, blobs: List[Dict[str, Any]]) -> None:
+        """Insert new chunks; chunks already stored only get their last_used_at bumped."""
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(AIDebugBlob).values(blobs)
+            # Batches from other workers may commit out of order: never move last_used_at back
+            # (SQLite's two-argument max() is its GREATEST)
+            greatest = func.greatest if dialect == "postgresql" else func.max
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[AIDebugBlob.hash],
+                set_={"last_used_at": greatest(AIDebugBlob.last_used_at, stmt.excluded.last_used_at)}
+            ))
+            return
+        existing = set((await db.execute(
+            select(AIDebugBlob.hash).where(AIDebugBlob.hash.in_([blob["hash"] for blob in blobs]))
+        )).scalars())
+        for blob in blobs:
+            if blob["hash"] in existing:
+                await db.execute(
+                    update(AIDebugBlob)
+                    .where(AIDebugBlob.hash == blob["hash"], AIDebugBlob.last_used_at < blob["last_used_at"])
+                    .values(last_used_at=blob["last_used_at"])
+                )
+        new_blobs = [blob for blob in blobs if blob["hash"] not in existing]
+        if new_blobs:
+            await db.execute(insert(AIDebugBlob), new_blobs)
+
+    async def flush(self) -> None:
+        """Write everything queued so far (used on shutdown and in tests)."""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        while self._batch or not self._queue.empty():
+            self._drain()
+            batch, self._batch = self._batch, []
+            await self._write(batch)
+
+    async def stop(self) -> None:
+        if self._task is not None and self._loop is asyncio.get_running_loop():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            if self._writing is not None:
+                await self._writing
+            await self.flush()
+        self._task = None
+        self._writing = None
+        self._queue = None
+        self._loop = None
+
+
+debug_log_writer = DebugLogWriter(
+    max_queue=settings.AI_DEBUG_LOG_QUEUE_SIZE,
+    batch_size=settings.AI_DEBUG_LOG_BATCH_SIZE,
+    flush_seconds=settings.AI_DEBUG_LOG_FLUSH_SECONDS,
+    retention=settings.AI_DEBUG_LOG_RETENTION,
+    retention_seconds=settings.AI_DEBUG_LOG_RETENTION_INTERVAL_SECONDS
+)
 
 
 class AIDebugLogger:
@@ -31,7 +282,7 @@ class AIDebugLogger:
         completion_tokens: int,
         cost_usd: float
     ):
-        """Log a writer operation."""
+        """Queue a writer operation log; `db` is unused, rows are written by debug_log_writer."""
         if not AIDebugLogger.is_enabled():
             return
             
@@ -39,7 +290,8 @@ class AIDebugLogger:
             # Format strategy input as readable text
             strategy_input_text = AIDebugLogger._format_strategy_input(strategy_input)
             
-            debug_log = AIDebugLog(
+            debug_log_writer.enqueue(dict(
+                timestamp=datetime.now(timezone.utc),
                 operation_type="writer",
                 user_id=user_id,
                 agent_id=agent_id,
@@ -52,13 +304,7 @@ class AIDebugLogger:
                 prompt_tokens=prompt_tokens,
                 completion_tokens=completion_tokens,
                 cost_usd=cost_usd
-            )
-            
-            db.add(debug_log)
-            await db.commit()
-            
-            # Cleanup old logs (keep only last 1000)
-            await AIDebugLogger._cleanup_old_logs(db)
+            ))
             
         except Exception as e:
             print(f"Debug logging error: {e}")
@@ -81,7 +327,7 @@ class AIDebugLogger:
         completion_tokens: int,
         cost_usd: float
     ):
-        """Log a judge operation."""
+        """Queue a judge operation log; `db` is unused, rows are written by debug_log_writer."""
         if not AIDebugLogger.is_enabled():
             return
             
@@ -92,7 +338,8 @@ class AIDebugLogger:
             # Format parsed output as readable text
             parsed_output_text = json.dumps(parsed_output, indent=2)
             
-            debug_log = AIDebugLog(
+            debug_log_writer.enqueue(dict(
+                timestamp=datetime.now(timezone.utc),
                 operation_type="judge",
                 user_id=user_id,
                 agent_id=agent_id,
@@ -106,13 +353,7 @@ class AIDebugLogger:
                 prompt_tokens=prompt_tokens,
                 completion_tokens=completion_tokens,
                 cost_usd=cost_usd
-            )
-            
-            db.add(debug_log)
-            await db.commit()
-            
-            # Cleanup old logs (keep only last 1000)
-            await AIDebugLogger._cleanup_old_logs(db)
+            ))
             
         except Exception as e:
             print(f"Debug logging error: {e}")
@@ -135,40 +376,51 @@ class AIDebugLogger:
         return "\n".join(lines)
     
     @staticmethod
-    async def _cleanup_old_logs(db: AsyncSession):
-        """Keep only the last 1000 debug logs."""
-        try:
-            await db.execute(
-                text("""
-                    DELETE FROM ai_debug_logs 
-                    WHERE id NOT IN (
-                        SELECT id FROM ai_debug_logs 
-                        ORDER BY timestamp DESC 
-                        LIMIT 1000
-                    )
-                """)
-            )
-            await db.commit()
-        except Exception as e:
-            print(f"Debug log cleanup error: {e}")
-            pass
-    
+    async def list_summaries(
+        db: AsyncSession,
+        limit: int,
+        before_id: Optional[int] = None,
+        operation_type: Optional[str] = None,
+        model_id: Optional[str] = None,
+        contest_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[Any]:
+        """
+        Newest-first page of log metadata (no prompt/response/input texts).
+        Keyset pagination: pass the last id of a page as `before_id` to get the next one.
+        """
+        query = select(*SUMMARY_COLUMNS).order_by(AIDebugLog.id.desc()).limit(limit)
+        if before_id is not None:
+            query = query.where(AIDebugLog.id < before_id)
+        if operation_type:
+            query = query.where(AIDebugLog.operation_type == operation_type)
+        if model_id:
+            query = query.where(AIDebugLog.model_id == model_id)
+        if contest_id is not None:
+            query = query.where(AIDebugLog.contest_id == contest_id)
+        if user_id is not None:
+            query = query.where(AIDebugLog.user_id == user_id)
+        if since is not None:
+            query = query.where(AIDebugLog.timestamp >= since)
+        if until is not None:
+            query = query.where(AIDebugLog.timestamp < until)
+        result = await db.execute(query)
+        return result.all()
+
     @staticmethod
-    async def get_recent_logs(db: AsyncSession, limit: int = 50) -> List[AIDebugLog]:
-        """Get recent debug logs for the admin page."""
-        if not AIDebugLogger.is_enabled():
-            return []
-            
-        try:
-            result = await db.execute(
-                text("""
-                    SELECT * FROM ai_debug_logs 
-                    ORDER BY timestamp DESC 
-                    LIMIT :limit
-                """),
-                {"limit": limit}
-            )
-            return result.fetchall()
-        except Exception as e:
-            print(f"Error fetching debug logs: {e}")
-            return [] 
\ No newline at end of file
+    async def stream_body_chunks(bind: AsyncEngine, digests: List[str]) -> AsyncIterator[str]:
+        """
+        Yield a blob-backed body chunk by chunk, a few chunks per query.
+        Runs while the response is being sent, after the request's session is closed, so it
+        opens its own session on that session's engine (`db.bind`).
+        """
+        async with AsyncSession(bind, expire_on_commit=False) as db:
+            for start in range(0, len(digests), BODY_STREAM_BATCH):
+                group = digests[start:start + BODY_STREAM_BATCH]
+                result = await db.execute(select(AIDebugBlob.hash, AIDebugBlob.data).where(AIDebugBlob.hash.in_(group)))
+                data = dict(result.all())
+                for index, digest in enumerate(group):
+                    chunk = zlib.decompress(data[digest]).decode("utf-8") if digest in data else ""
+                    yield chunk if start + index == 0 else "\n\n" + chunk
@@ -0,0 +1,102 @@
+"""
+Helpers for conditional GET support (ETag / Last-Modified / Cache-Control).
+
+Routes compute their validators from row versions or timestamps *before*
+building the response body, so a matching If-None-Match / If-Modified-Since
+short-circuits with a 304 and nothing is serialized.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+# Revalidate on every use, but allow the 304 round trip
+NO_CACHE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that identify a representation's version."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def latest_timestamp(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    """Return the most recent of the given timestamps as an aware UTC datetime."""
+    normalized = [_as_utc(ts) for ts in timestamps if ts is not None]
+    return max(normalized) if normalized else None
+
+
+def contest_cache_control(contest: Any) -> str:
+    """
+    Closed contests don't change anymore, so let browsers and proxies keep them.
+    Only contests anyone can open are marked public.
+    """
+    if contest.status.lower() != "closed":
+        return NO_CACHE
+    scope = "public" if contest.publicly_listed and not contest.password_protected else "private"
+    return f"{scope}, max-age={settings.CLOSED_CONTEST_CACHE_MAX_AGE}"
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return any(_strip_weak(tag) == etag for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def apply_cache_headers(
+    response: Response, etag: str, last_modified: Optional[datetime] = None, cache_control: str = NO_CACHE
+) -> None:
+    """Attach validators and caching policy to an outgoing response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = NO_CACHE
+) -> Optional[Response]:
+    """
+    Set cache headers on `response` and return a bodiless 304 if the client's copy is current.
+    Returns None when the route should go on and build the full body.
+    """
+    if is_not_modified(request, etag, last_modified):
+        not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        apply_cache_headers(not_modified, etag, last_modified, cache_control)
+        return not_modified
+    apply_cache_headers(response, etag, last_modified, cache_control)
+    return None
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; treat them as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,95 @@
+"""
+Token counting with cached tokenizer encoders.
+
+Models are grouped by tokenizer family (the tiktoken encoding name) and each family's
+encoder is loaded once. Models tiktoken doesn't know (e.g. Anthropic's) are counted
+with cl100k_base, and when tiktoken or an encoding can't be loaded the count falls back
+to the 4-characters-per-token approximation.
+"""
+
+import functools
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKENIZER = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=None)
+def load_tiktoken():
+    """Import tiktoken once (it's imported on first use, not with the app); None if it isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken library not found. Falling back to character-based token estimation.")
+        return None
+    return tiktoken
+
+
+@functools.lru_cache(maxsize=None)
+def tokenizer_for_model(model_id: str) -> str:
+    """The tokenizer family of a model."""
+    tiktoken = load_tiktoken()
+    if tiktoken is None:
+        return DEFAULT_TOKENIZER
+    try:
+        return tiktoken.encoding_name_for_model(model_id)
+    except KeyError:
+        return DEFAULT_TOKENIZER
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(tokenizer: str):
+    """
+    The encoder of a tokenizer family, loaded once. None (also cached, so a missing
+    encoding file isn't fetched again on every call) when it can't be loaded.
+    """
+    tiktoken = load_tiktoken()
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(tokenizer)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding '{tokenizer}' could not be loaded: {e}. Using character approximation.")
+        return None
+
+
+def approximate_token_count(char_count: int) -> int:
+    return max(1, char_count // CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str, tokenizer: str) -> Optional[int]:
+    """Exact token count of `text` for a tokenizer family, None if its encoder isn't available."""
+    encoder = get_encoder(tokenizer)
+    if encoder is None:
+        return None
+    # User text may contain special-token strings; count them as plain text
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def estimate_token_count(text: str, model_id: str = "gpt-4") -> int:
+    """
+    Estimate the number of tokens in a text.
+    Uses tiktoken for compatible models if available, otherwise approximates.
+    """
+    count = count_tokens(text, tokenizer_for_model(model_id))
+    return count if count is not None else approximate_token_count(len(text))
+
+
+@functools.lru_cache(maxsize=None)
+def tokenizer_families() -> List[str]:
+    """The tokenizer families of the available models, the ones counted for every stored text."""
+    from app.utils.ai_models import get_available_models
+    return sorted({tokenizer_for_model(model.id) for model in get_available_models()})
+
+
+def count_text_tokens(text: str) -> Dict[str, int]:
+    """Token counts of `text` for every tokenizer family whose encoder is available."""
+    counts = {}
+    for tokenizer in tokenizer_families():
+        count = count_tokens(text, tokenizer)
+        if count is not None:
+            counts[tokenizer] = count
+    return counts
@@ -17,7 +17,10 @@ from app.db.models.vote import Vote
 from app.db.models.agent import Agent
 from app.db.models.agent_execution import AgentExecution
 from app.db.models.credit_transaction import CreditTransaction
-from app.db.models.ai_debug_log import AIDebugLog
+from app.db.models.ai_debug_log import AIDebugLog, AIDebugBlob
+from app.db.models.contest_result_snapshot import ContestResultSnapshot
+from app.db.models.contest_text_tally import ContestTextTally
+from app.db.models.scheduled_judge_run import ScheduledJudgeRun
 
 from app.db.database import Base
 from app.core.config import settings
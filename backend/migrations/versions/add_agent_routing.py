@@ -0,0 +1,24 @@
+"""Add model routing policy to agents
+
+Revision ID: add_agent_routing_001
+Revises: add_text_token_counts_001
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_agent_routing_001'
+down_revision = 'add_text_token_counts_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('agents', sa.Column('routing', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('agents', 'routing')
@@ -0,0 +1,37 @@
+"""Store AI debug prompt/response bodies as compressed, deduplicated blobs
+
+Revision ID: add_ai_debug_blobs_001
+Revises: add_judges_remaining_001
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_ai_debug_blobs_001'
+down_revision = 'add_judges_remaining_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ai_debug_blobs',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('hash')
+    )
+    op.create_index('idx_ai_debug_blob_last_used', 'ai_debug_blobs', ['last_used_at'], unique=False)
+    op.add_column('ai_debug_logs', sa.Column('llm_prompt_blobs', sa.JSON(), nullable=True))
+    op.add_column('ai_debug_logs', sa.Column('llm_response_blobs', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('ai_debug_logs', 'llm_response_blobs')
+    op.drop_column('ai_debug_logs', 'llm_prompt_blobs')
+    op.drop_index('idx_ai_debug_blob_last_used', table_name='ai_debug_blobs')
+    op.drop_table('ai_debug_blobs')
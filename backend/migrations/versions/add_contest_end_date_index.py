@@ -0,0 +1,30 @@
+"""Index open contests by end_date for the lifecycle scheduler
+
+Revision ID: add_contest_end_date_idx_001
+Revises: add_result_snapshots_001
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_contest_end_date_idx_001'
+down_revision = 'add_result_snapshots_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_contests_open_end_date',
+        'contests',
+        ['end_date'],
+        unique=False,
+        postgresql_where=sa.text("status = 'open'")
+    )
+
+
+def downgrade():
+    op.drop_index('ix_contests_open_end_date', table_name='contests')
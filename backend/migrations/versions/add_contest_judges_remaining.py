@@ -0,0 +1,33 @@
+"""Add judges_remaining counter to contests
+
+Revision ID: add_judges_remaining_001
+Revises: add_contest_text_tallies_001
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_judges_remaining_001'
+down_revision = 'add_contest_text_tallies_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('contests', sa.Column('judges_remaining', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the current judge assignments
+    op.execute("""
+        UPDATE contests SET judges_remaining = (
+            SELECT COUNT(*) FROM contest_judges
+            WHERE contest_judges.contest_id = contests.id
+              AND NOT COALESCE(contest_judges.has_voted, false)
+        )
+    """)
+
+
+def downgrade():
+    op.drop_column('contests', 'judges_remaining')
@@ -0,0 +1,37 @@
+"""Add contest_result_snapshots table
+
+Revision ID: add_result_snapshots_001
+Revises: add_last_login_001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_result_snapshots_001'
+down_revision = 'add_last_login_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'contest_result_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('contest_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('submissions', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['contest_id'], ['contests.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('contest_id')
+    )
+    op.create_index(op.f('ix_contest_result_snapshots_id'), 'contest_result_snapshots', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_contest_result_snapshots_id'), table_name='contest_result_snapshots')
+    op.drop_table('contest_result_snapshots')
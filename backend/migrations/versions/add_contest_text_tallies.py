@@ -0,0 +1,53 @@
+"""Add contest_text_tallies table
+
+Revision ID: add_contest_text_tallies_001
+Revises: add_contest_end_date_idx_001
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_contest_text_tallies_001'
+down_revision = 'add_contest_end_date_idx_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'contest_text_tallies',
+        sa.Column('contest_id', sa.Integer(), nullable=False),
+        sa.Column('text_id', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('first_places', sa.Integer(), nullable=False),
+        sa.Column('second_places', sa.Integer(), nullable=False),
+        sa.Column('third_places', sa.Integer(), nullable=False),
+        sa.Column('vote_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['contest_id'], ['contests.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['text_id'], ['texts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('contest_id', 'text_id')
+    )
+
+    # Backfill from the votes cast so far
+    op.execute("""
+        INSERT INTO contest_text_tallies
+            (contest_id, text_id, points, first_places, second_places, third_places, vote_count)
+        SELECT
+            contest_id,
+            text_id,
+            SUM(CASE text_place WHEN 1 THEN 3 WHEN 2 THEN 2 WHEN 3 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN text_place = 1 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN text_place = 2 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN text_place = 3 THEN 1 ELSE 0 END),
+            COUNT(id)
+        FROM votes
+        GROUP BY contest_id, text_id
+    """)
+
+
+def downgrade():
+    op.drop_table('contest_text_tallies')
@@ -0,0 +1,38 @@
+"""Add scheduled_judge_runs table
+
+Revision ID: add_scheduled_judge_runs_001
+Revises: add_agent_routing_001
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_scheduled_judge_runs_001'
+down_revision = 'add_agent_routing_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scheduled_judge_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('contest_id', sa.Integer(), nullable=False),
+        sa.Column('agent_id', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['contest_id'], ['contests.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['agent_id'], ['agents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('contest_id', 'agent_id', name='uq_scheduled_judge_runs_contest_agent')
+    )
+    op.create_index(op.f('ix_scheduled_judge_runs_id'), 'scheduled_judge_runs', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_scheduled_judge_runs_id'), table_name='scheduled_judge_runs')
+    op.drop_table('scheduled_judge_runs')
@@ -0,0 +1,30 @@
+"""Add stored content size (characters and tokens) to texts
+
+Revision ID: add_text_token_counts_001
+Revises: add_ai_debug_blobs_001
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_text_token_counts_001'
+down_revision = 'add_ai_debug_blobs_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('texts', sa.Column('content_chars', sa.Integer(), nullable=True))
+    op.add_column('texts', sa.Column('content_tokens', sa.JSON(), nullable=True))
+
+    # Character counts can be backfilled in SQL; token counts need the tokenizer, so existing
+    # texts are estimated from their length until scripts/backfill_text_token_counts.py runs
+    op.execute("UPDATE texts SET content_chars = LENGTH(content)")
+
+
+def downgrade():
+    op.drop_column('texts', 'content_tokens')
+    op.drop_column('texts', 'content_chars')
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
+from app.db.models.text import Text
+from app.utils.tokens import count_text_tokens, tokenizer_families
+
+BATCH_SIZE = 500
+
+
+def _needs_counts(content_tokens, families) -> bool:
+    return not content_tokens or any(family not in content_tokens for family in families)
+
+
+async def backfill_text_token_counts(db: AsyncSession, recount: bool = False) -> int:
+    """
+    Store the character and token counts of texts that lack them (or that miss a tokenizer
+    family added since they were counted). Returns the number of texts updated.
+    """
+    families = tokenizer_families()
+    updated, last_id = 0, 0
+    while True:
+        result = await db.execute(
+            select(Text.id, Text.content, Text.content_tokens)
+            .where(Text.id > last_id)
+            .order_by(Text.id)
+            .limit(BATCH_SIZE)
+        )
+        rows = result.all()
+        if not rows:
+            return updated
+        last_id = rows[-1].id
+
+        pending = [row for row in rows if recount or _needs_counts(row.content_tokens, families)]
+        if pending:
+            counts = await asyncio.to_thread(lambda: [count_text_tokens(row.content) for row in pending])
+            await db.execute(update(Text), [
+                {"id": row.id, "content_chars": len(row.content), "content_tokens": tokens}
+                for row, tokens in zip(pending, counts)
+            ])
+            await db.commit()
+            updated += len(pending)
+            print(f"Counted {updated} texts (up to id {last_id})")
+
+
+async def main():
+    """Main function to backfill text token counts."""
+    parser = argparse.ArgumentParser(description="Store character and per-tokenizer token counts on existing texts.")
+    parser.add_argument("--recount", action="store_true", help="Recount every text, not only those missing counts")
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as session:
+        updated = await backfill_text_token_counts(session, args.recount)
+    print(f"Done: {updated} texts updated")
+
+if __name__ == "__main__":
+    asyncio.run(main())
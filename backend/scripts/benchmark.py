@@ -0,0 +1,494 @@
+"""
+In-process load test and latency benchmark.
+
+Seeds a dataset, then replays a weighted mix of user scenarios concurrently against
+the ASGI app (no network, no real LLM: AI executions go to a local fake provider
+with a configurable latency) and reports throughput and p50/p95/p99 per endpoint.
+
+    python scripts/benchmark.py --database-url sqlite+aiosqlite:///./bench.db --create-schema \
+        --contests 30 --texts-per-contest 12 --concurrency 20 --duration 30 --output baseline.json
+    python scripts/benchmark.py --database-url ... --duration 30 --baseline baseline.json
+
+Every run seeds fresh rows under its own prefix, so the target database is only added to.
+Never point it at production.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_WEIGHTS = {
+    "browse_contests": 30,
+    "view_contest": 20,
+    "view_submissions": 20,
+    "judge_vote": 15,
+    "ai_writer": 8,
+    "ai_judge": 7,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay weighted scenarios against the app in-process and report latency.")
+    parser.add_argument("--database-url", help="Database to seed and benchmark against (default: DATABASE_URL from the environment)")
+    parser.add_argument("--create-schema", action="store_true", help="Create missing tables before seeding (for scratch databases)")
+    parser.add_argument("--users", type=int, default=60, help="Users to seed")
+    parser.add_argument("--contests", type=int, default=30, help="Contests to seed (split across open, evaluation and closed)")
+    parser.add_argument("--texts-per-contest", type=int, default=10, help="Submissions per seeded contest")
+    parser.add_argument("--judges-per-contest", type=int, default=3, help="Human judges per evaluation/closed contest")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run (ignored when --requests is given)")
+    parser.add_argument("--requests", type=int, help="Stop after this many scenario runs instead of after --duration")
+    parser.add_argument("--weights", help="Scenario weights, e.g. 'browse_contests=50,ai_judge=0' (unlisted keep their default)")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Simulated latency of each fake LLM call")
+    parser.add_argument("--model", help="Model id for AI executions (default: first available model)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the scenario mix")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a JSON report written by an earlier run")
+    parser.add_argument("--regression-threshold", type=float, default=0.2,
+                        help="Relative p95 increase (or throughput drop) flagged as a regression (default 0.2)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when a regression is flagged")
+    return parser.parse_args()
+
+
+ARGS = parse_args() if __name__ == "__main__" else None
+
+# Settings are read at import time, so the environment has to be prepared before the app is imported
+if ARGS and ARGS.database_url:
+    os.environ["DATABASE_URL"] = ARGS.database_url
+os.environ.setdefault("DEBUG", "False")
+os.environ.setdefault("CONTEST_SCHEDULER_ENABLED", "False")
+os.environ.setdefault("TRACING_ENABLED", "False")
+
+import httpx  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.db.models import Agent, Contest, ContestJudge, ContestText, Text, User, Vote  # noqa: E402
+from app.db.repositories.vote_repository import VoteRepository  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import ai_provider_service  # noqa: E402
+from app.services.ai_provider_service import AIProviderInterface  # noqa: E402
+from app.utils.ai_models import get_available_models  # noqa: E402
+
+
+# Fake LLM provider
+
+class FakeLLMProvider(AIProviderInterface):
+    """
+    Answers in the formats the writer and judge strategies parse, after sleeping
+    `latency_seconds`, so AI executions exercise the full request path without an API.
+    A prompt prefix it has seen before is reported as read from the prompt cache.
+    """
+
+    latency_seconds: float = 0.05
+    judge_title_pattern = re.compile(r"Text: (.+?)(?:\\n|\n)Content:")
+    seen_prefixes: Set[str] = set()
+
+    @classmethod
+    async def validate_credentials(cls) -> bool:
+        return True
+
+    @classmethod
+    async def generate_text(cls, model_id: str, prompt: str, system_message: Optional[str] = None,
+                            temperature: float = 0.7, max_tokens: Optional[int] = None,
+                            cacheable_prefix: Optional[str] = None) -> Tuple[str, int, int, int, int]:
+        await asyncio.sleep(cls.latency_seconds)
+        prefix = cacheable_prefix or ""
+        titles = cls.judge_title_pattern.findall(prefix + prompt)
+        if titles:
+            response = "\n\n".join(
+                f"{place}. {title}\nCommentary: Benchmark commentary for {title}."
+                for place, title in enumerate(titles, start=1)
+            )
+        else:
+            response = "Title: Benchmark Story\nText: " + "The benchmark wrote a sentence. " * 40
+        # The first call with a prefix writes it to the cache, later ones read it
+        cached_tokens = len(prefix) // 4 if prefix in cls.seen_prefixes else 0
+        cache_write_tokens = len(prefix) // 4 - cached_tokens
+        cls.seen_prefixes.add(prefix)
+        return response, len(prefix + prompt) // 4, len(response) // 4, cached_tokens, cache_write_tokens
+
+    @classmethod
+    async def generate_batch(cls, model_id: str, prompts: List[str], system_message: Optional[str] = None,
+                             temperature: float = 0.7, max_tokens: Optional[int] = None,
+                             cacheable_prefix: Optional[str] = None) -> List[Tuple[str, int, int, int, int]]:
+        return list(await asyncio.gather(*(
+            cls.generate_text(model_id, prompt, system_message, temperature, max_tokens, cacheable_prefix)
+            for prompt in prompts
+        )))
+
+
+def install_fake_provider(latency_ms: float) -> None:
+    FakeLLMProvider.latency_seconds = latency_ms / 1000
+    for provider in list(ai_provider_service.PROVIDER_MAP):
+        ai_provider_service.PROVIDER_MAP[provider] = FakeLLMProvider
+
+
+# Dataset
+
+@dataclass
+class Dataset:
+    model: str
+    user_headers: List[dict] = field(default_factory=list)
+    listed_contest_ids: List[int] = field(default_factory=list)
+    submission_contest_ids: List[int] = field(default_factory=list)
+    # (contest_id, text_ids, judge headers)
+    evaluation_contests: List[Tuple[int, List[int], List[dict]]] = field(default_factory=list)
+    # (contest_id, judge agent_id, creator headers)
+    ai_judge_contests: List[Tuple[int, int, dict]] = field(default_factory=list)
+    # (writer agent_id, owner headers)
+    writer_agents: List[Tuple[int, dict]] = field(default_factory=list)
+
+
+def _headers(user: User) -> dict:
+    token = create_access_token(data={"sub": user.username, "id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def seed_dataset(db: AsyncSession, args: argparse.Namespace, model: str) -> Dataset:
+    """
+    Insert users, agents and contests in every state directly through the ORM.
+    A third of the contests are open, a third in evaluation (each with one holdout
+    judge that never votes, so replayed votes can't close them) and a third closed
+    with votes and rankings.
+    """
+    prefix = f"bench{int(time.time())}"
+    rng = random.Random(args.seed)
+    dataset = Dataset(model=model)
+
+    users = [
+        User(username=f"{prefix}_user{i}", email=f"{prefix}_user{i}@bench.plumas.top",
+             hashed_password="not-a-real-hash", credits=10 ** 9, is_admin=False)
+        for i in range(max(args.users, args.judges_per_contest + 2))
+    ]
+    db.add_all(users)
+    await db.flush()
+    dataset.user_headers = [_headers(user) for user in users]
+
+    writer_agents = [
+        Agent(name=f"{prefix} writer {i}", description="Benchmark writer", prompt="Write vividly.",
+              type="writer", owner_id=user.id)
+        for i, user in enumerate(users[:10])
+    ]
+    db.add_all(writer_agents)
+    await db.flush()
+    dataset.writer_agents = [(agent.id, _headers(user)) for agent, user in zip(writer_agents, users)]
+
+    closed_ids = []
+    for index in range(args.contests):
+        status = ("open", "evaluation", "closed")[index % 3]
+        creator = users[index % len(users)]
+        contest = Contest(title=f"{prefix} contest {index}", description="Benchmark contest " * 10,
+                          status=status, creator_id=creator.id, publicly_listed=True, password_protected=False)
+        db.add(contest)
+        await db.flush()
+        dataset.listed_contest_ids.append(contest.id)
+
+        authors = rng.sample(users, min(args.texts_per_contest, len(users)))
+        texts = [
+            Text(title=f"{prefix} text {index}-{i}", content="Benchmark prose paragraph. " * 60,
+                 author=author.username, owner_id=author.id)
+            for i, author in enumerate(authors)
+        ]
+        db.add_all(texts)
+        await db.flush()
+        for place, text in enumerate(texts, start=1):
+            ranking = place if status == "closed" else None
+            db.add(ContestText(contest_id=contest.id, text_id=text.id, ranking=ranking,
+                               total_points=max(0, 4 - place) if status == "closed" else None))
+        if status == "open":
+            continue
+
+        dataset.submission_contest_ids.append(contest.id)
+        judge_users = rng.sample([user for user in users if user.id != creator.id], args.judges_per_contest + 1)
+        judge_agent = Agent(name=f"{prefix} judge {index}", description="Benchmark judge", prompt="Judge fairly.",
+                            type="judge", owner_id=creator.id)
+        db.add(judge_agent)
+        await db.flush()
+
+        voted = status == "closed"
+        judges = [ContestJudge(contest_id=contest.id, user_judge_id=user.id, has_voted=voted) for user in judge_users]
+        judges.append(ContestJudge(contest_id=contest.id, agent_judge_id=judge_agent.id, has_voted=voted))
+        db.add_all(judges)
+        await db.flush()
+
+        if status == "evaluation":
+            contest.judges_remaining = len(judges)
+            # The last human judge is the holdout
+            dataset.evaluation_contests.append(
+                (contest.id, [text.id for text in texts], [_headers(user) for user in judge_users[:-1]])
+            )
+            dataset.ai_judge_contests.append((contest.id, judge_agent.id, _headers(creator)))
+        else:
+            closed_ids.append(contest.id)
+            for judge in judges[:-1]:
+                for place, text in enumerate(texts[:3], start=1):
+                    db.add(Vote(contest_id=contest.id, text_id=text.id, contest_judge_id=judge.id,
+                                text_place=place, comment="Benchmark vote", is_ai=False))
+
+    await db.flush()
+    if closed_ids:
+        await VoteRepository.rebuild_contest_tallies(db, closed_ids)
+    await db.commit()
+    return dataset
+
+
+# Scenarios
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        stats = self.endpoints[label]
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception as e:
+            stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+            stats.errors += 1
+            stats.statuses[type(e).__name__] += 1
+            return None
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.statuses[str(response.status_code)] += 1
+        if response.status_code >= 400:
+            stats.errors += 1
+        return response
+
+
+async def browse_contests(client, recorder: Recorder, dataset: Dataset, rng: random.Random):
+    skip = rng.randrange(0, max(1, len(dataset.listed_contest_ids)), 20)
+    await recorder.request(client, "GET /contests/", "GET", "/contests/", params={"skip": skip, "limit": 20})
+
+
+async def view_contest(client, recorder: Recorder, dataset: Dataset, rng: random.Random):
+    contest_id = rng.choice(dataset.listed_contest_ids)
+    await recorder.request(client, "GET /contests/{id}", "GET", f"/contests/{contest_id}",
+                           headers=rng.choice(dataset.user_headers))
+
+
+async def view_submissions(client, recorder: Recorder, dataset: Dataset, rng: random.Random):
+    contest_id = rng.choice(dataset.submission_contest_ids)
+    await recorder.request(client, "GET /contests/{id}/submissions/", "GET", f"/contests/{contest_id}/submissions/",
+                           headers=rng.choice(dataset.user_headers))
+
+
+async def judge_vote(client, recorder: Recorder, dataset: Dataset, rng: random.Random):
+    # Re-voting replaces the judge's previous votes, so the same judges can vote repeatedly
+    contest_id, text_ids, judge_headers = rng.choice(dataset.evaluation_contests)
+    podium = rng.sample(text_ids, min(3, len(text_ids)))
+    votes = [{"text_id": text_id, "text_place": place, "comment": "Benchmark vote"}
+             for place, text_id in enumerate(podium, start=1)]
+    await recorder.request(client, "POST /contests/{id}/votes", "POST", f"/contests/{contest_id}/votes",
+                           json=votes, headers=rng.choice(judge_headers))
+
+
+async def ai_writer(client, recorder: Recorder, dataset: Dataset, rng: random.Random):
+    agent_id, headers = rng.choice(dataset.writer_agents)
+    payload = {"agent_id": agent_id, "model": dataset.model, "title": "Benchmark",
+               "description": "A short story about load tests"}
+    await recorder.request(client, "POST /agents/execute/writer", "POST", "/agents/execute/writer",
+                           json=payload, headers=headers)
+
+
+async def ai_judge(client, recorder: Recorder, dataset: Dataset, rng: random.Random):
+    contest_id, agent_id, headers = rng.choice(dataset.ai_judge_contests)
+    payload = {"agent_id": agent_id, "model": dataset.model, "contest_id": contest_id}
+    await recorder.request(client, "POST /agents/execute/judge", "POST", "/agents/execute/judge",
+                           json=payload, headers=headers)
+
+
+SCENARIOS = {
+    "browse_contests": browse_contests,
+    "view_contest": view_contest,
+    "view_submissions": view_submissions,
+    "judge_vote": judge_vote,
+    "ai_writer": ai_writer,
+    "ai_judge": ai_judge,
+}
+
+
+def parse_weights(spec: Optional[str]) -> Dict[str, float]:
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (spec or "").split(",")):
+        name, _, value = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name.strip()}' (choose from {', '.join(SCENARIOS)})")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+async def run_load(dataset: Dataset, weights: Dict[str, float], args: argparse.Namespace) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    names = [name for name, weight in weights.items() if weight > 0]
+    deadline = None if args.requests else time.perf_counter() + args.duration
+    remaining = [args.requests or 0]
+
+    def should_continue() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        if remaining[0] <= 0:
+            return False
+        remaining[0] -= 1
+        return True
+
+    async def worker(client: httpx.AsyncClient, worker_index: int):
+        rng = random.Random(args.seed * 1000 + worker_index)
+        while should_continue():
+            name = rng.choices(names, weights=[weights[name] for name in names])[0]
+            await SCENARIOS[name](client, recorder, dataset, rng)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, index) for index in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    return recorder, elapsed
+
+
+# Report
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_report(recorder: Recorder, elapsed: float, args: argparse.Namespace, weights: Dict[str, float]) -> dict:
+    endpoints = {}
+    for label, stats in sorted(recorder.endpoints.items()):
+        latencies = sorted(stats.latencies_ms)
+        endpoints[label] = {
+            "count": len(latencies),
+            "errors": stats.errors,
+            "statuses": dict(stats.statuses),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+    total = sum(endpoint["count"] for endpoint in endpoints.values())
+    return {
+        "config": {
+            "users": args.users,
+            "contests": args.contests,
+            "texts_per_contest": args.texts_per_contest,
+            "judges_per_contest": args.judges_per_contest,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "requests": args.requests,
+            "llm_latency_ms": args.llm_latency_ms,
+            "seed": args.seed,
+            "weights": weights,
+            "database": engine.url.get_backend_name(),
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['total_requests']} requests in {report['elapsed_seconds']}s "
+          f"({report['throughput_rps']} req/s, {report['errors']} errors)\n")
+    print(f"{'endpoint':<34} {'count':>7} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, endpoint in report["endpoints"].items():
+        print(f"{label:<34} {endpoint['count']:>7} {endpoint['errors']:>5} {endpoint['throughput_rps']:>8} "
+              f"{endpoint['p50_ms']:>9} {endpoint['p95_ms']:>9} {endpoint['p99_ms']:>9}")
+
+
+def compare_reports(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print per-endpoint changes against `baseline` and return the regressions."""
+    regressions = []
+    print(f"\nAgainst baseline (regression threshold {threshold:.0%}):")
+    print(f"{'endpoint':<34} {'p50':>16} {'p95':>16} {'p99':>16} {'req/s':>16}")
+
+    def change(current: float, previous: float) -> str:
+        if not previous:
+            return f"{current}"
+        return f"{current} ({(current - previous) / previous:+.0%})"
+
+    for label, endpoint in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(label)
+        if not previous:
+            print(f"{label:<34} (not in baseline)")
+            continue
+        print(f"{label:<34} {change(endpoint['p50_ms'], previous['p50_ms']):>16} "
+              f"{change(endpoint['p95_ms'], previous['p95_ms']):>16} {change(endpoint['p99_ms'], previous['p99_ms']):>16} "
+              f"{change(endpoint['throughput_rps'], previous['throughput_rps']):>16}")
+        if previous["p95_ms"] and endpoint["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{label}: p95 {previous['p95_ms']} -> {endpoint['p95_ms']} ms")
+        if endpoint["errors"] > previous["errors"]:
+            regressions.append(f"{label}: errors {previous['errors']} -> {endpoint['errors']}")
+
+    if baseline.get("throughput_rps") and report["throughput_rps"] < baseline["throughput_rps"] * (1 - threshold):
+        regressions.append(f"overall throughput {baseline['throughput_rps']} -> {report['throughput_rps']} req/s")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return regressions
+
+
+async def main():
+    """Main function to seed the dataset, run the load and report."""
+    args = ARGS
+    weights = parse_weights(args.weights)
+    model = args.model or next(iter(get_available_models()), None)
+    if model is None:
+        raise SystemExit("No available model to run AI scenarios with (pass --model)")
+    model = getattr(model, "id", model)
+    install_fake_provider(args.llm_latency_ms)
+
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    print(f"Seeding {args.contests} contests x {args.texts_per_contest} texts, {args.users} users...")
+    async with AsyncSessionLocal() as session:
+        dataset = await seed_dataset(session, args, model)
+
+    print(f"Running {args.concurrency} workers for "
+          f"{f'{args.requests} scenarios' if args.requests else f'{args.duration}s'}...")
+    recorder, elapsed = await run_load(dataset, weights, args)
+    report = build_report(recorder, elapsed, args, weights)
+    print_report(report)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(report, json.load(f), args.regression_threshold)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    await engine.dispose()
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
+from app.db.models.contest import Contest
+from app.db.repositories.vote_repository import VoteRepository
+from app.services.contest_service import ContestService
+
+RECALCULATE_BATCH_SIZE = 500
+
+
+async def rebuild_results_snapshots(db: AsyncSession, contest_ids=None, recalculate: bool = False):
+    """Rebuild the results snapshot of the given closed contests (all closed contests by default)."""
+    if not contest_ids:
+        result = await db.execute(select(Contest.id).filter(Contest.status == "closed").order_by(Contest.id))
+        contest_ids = list(result.scalars().all())
+
+    if recalculate:
+        # Set-based: a few statements per batch of contests rather than per contest
+        for start in range(0, len(contest_ids), RECALCULATE_BATCH_SIZE):
+            batch = contest_ids[start:start + RECALCULATE_BATCH_SIZE]
+            await VoteRepository.rebuild_contest_tallies(db, batch)
+            updated = await VoteRepository.calculate_results_for_contests(db, batch)
+            print(f"Recalculated {len(batch)} contests ({updated} submissions)")
+
+    for contest_id in contest_ids:
+        snapshot = await ContestService.build_results_snapshot(db, contest_id)
+        if snapshot:
+            print(f"Contest {contest_id}: snapshot v{snapshot.version} with {len(snapshot.submissions)} submissions")
+        else:
+            print(f"Contest {contest_id}: skipped (not found or not closed)")
+
+
+async def main():
+    """Main function to rebuild results snapshots."""
+    parser = argparse.ArgumentParser(description="Rebuild the results snapshots of closed contests.")
+    parser.add_argument("contest_ids", nargs="*", type=int, help="Contest IDs to rebuild (default: all closed contests)")
+    parser.add_argument("--recalculate", action="store_true", help="Rebuild vote tallies and recalculate rankings and points from votes first")
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as session:
+        await rebuild_results_snapshots(session, args.contest_ids, args.recalculate)
+
+if __name__ == "__main__":
+    asyncio.run(main())
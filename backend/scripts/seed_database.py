@@ -0,0 +1,405 @@
+"""
+Seed a database directly with a large, deterministic synthetic dataset.
+
+Unlike large_scale_init_script.py (which goes through the HTTP API one entity at a
+time) this writes rows straight to the tables in large batches: COPY on PostgreSQL,
+executemany everywhere else. Ids are assigned here, after the current maximum of each
+table, so parent and child rows can be generated together and the same --seed on an
+empty database always produces the same data.
+
+    python scripts/seed_database.py --preset large --database-url postgresql+asyncpg://...
+    python scripts/seed_database.py --users 500 --contests 200 --texts-per-contest 12
+
+Every seeded user has the password given by --password.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PRESETS = {
+    # Roughly 10k texts / 25k votes
+    "small": {"users": 1_000, "agents": 100, "contests": 1_000, "texts_per_contest": 10, "judges_per_contest": 3},
+    # Roughly 100k texts / 600k votes
+    "medium": {"users": 10_000, "agents": 1_000, "contests": 10_000, "texts_per_contest": 10, "judges_per_contest": 8},
+    # Roughly 1M texts / 10M votes
+    "large": {"users": 100_000, "agents": 10_000, "contests": 100_000, "texts_per_contest": 10, "judges_per_contest": 14},
+}
+
+STATUS_WEIGHTS = {"open": 0.2, "evaluation": 0.2, "closed": 0.6}
+RECALCULATE_BATCH_SIZE = 500
+
+WORDS = (
+    "pluma tinta verso rima sombra luz mar viento noche aurora camino memoria silencio fuego "
+    "river lantern harbor whisper garden ember paper letter winter orchard mirror thread stone "
+    "dream voice echo window clock bridge salt honey storm feather journey promise ghost forest"
+).split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-insert a deterministic synthetic dataset directly into the database.")
+    parser.add_argument("--database-url", help="Database to seed (default: DATABASE_URL from the environment)")
+    parser.add_argument("--create-schema", action="store_true", help="Create missing tables first (for scratch databases)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="Dataset size preset; explicit size options override it")
+    parser.add_argument("--users", type=int, help="Users to create (default 1000)")
+    parser.add_argument("--agents", type=int, help="Agents to create, half writers and half judges (default users / 10)")
+    parser.add_argument("--contests", type=int, help="Contests to create (default 1000)")
+    parser.add_argument("--texts-per-contest", type=int, help="Average submissions per contest (default 10)")
+    parser.add_argument("--judges-per-contest", type=int, help="Human judges per contest (default 3)")
+    parser.add_argument("--ai-judge-ratio", type=float, default=0.5, help="Share of contests that also get an AI judge")
+    parser.add_argument("--unlisted-ratio", type=float, default=0.1, help="Share of contests not publicly listed (their authors and judges become members)")
+    parser.add_argument("--words-per-text", type=int, default=300, help="Approximate length of generated texts")
+    parser.add_argument("--password", default="seedpassword", help="Password of every seeded user")
+    parser.add_argument("--prefix", default="seed", help="Prefix of generated usernames and emails")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--now", help="Reference date (YYYY-MM-DD) that creation dates precede and open contests end after (default: today)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per COPY/executemany batch")
+    parser.add_argument("--chunk-contests", type=int, default=2_000, help="Contests generated and committed per transaction")
+    args = parser.parse_args()
+
+    defaults = {"users": 1_000, "contests": 1_000, "texts_per_contest": 10, "judges_per_contest": 3}
+    defaults.update(PRESETS.get(args.preset, {}))
+    for name, value in defaults.items():
+        if getattr(args, name, None) is None:
+            setattr(args, name, value)
+    if args.agents is None:
+        args.agents = max(2, args.users // 10)
+    if args.users < args.judges_per_contest + 1:
+        parser.error("--users must be larger than --judges-per-contest")
+    return args
+
+
+ARGS = parse_args() if __name__ == "__main__" else None
+
+# Settings are read at import time, so the environment has to be prepared before the app is imported
+if ARGS and ARGS.database_url:
+    os.environ["DATABASE_URL"] = ARGS.database_url
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import Table, func, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection  # noqa: E402
+
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.db.models import (  # noqa: E402
+    Agent, AgentExecution, Contest, ContestJudge, ContestMember, ContestText, CreditTransaction, Text, User, Vote
+)
+from app.db.repositories.vote_repository import VoteRepository  # noqa: E402
+from app.services.contest_service import ContestService  # noqa: E402
+from app.utils.tokens import count_text_tokens  # noqa: E402
+
+# Insert order respects foreign keys
+SEEDED_MODELS = [User, CreditTransaction, Agent, Contest, ContestMember, Text, ContestText, ContestJudge, AgentExecution, Vote]
+
+COLUMNS: Dict[str, Sequence[str]] = {
+    "users": ("id", "username", "email", "hashed_password", "credits", "is_admin", "created_at", "last_login"),
+    "credit_transactions": ("id", "user_id", "amount", "transaction_type", "description", "created_at"),
+    "agents": ("id", "name", "description", "prompt", "type", "is_public", "version", "owner_id", "created_at"),
+    "contests": ("id", "title", "description", "password_protected", "publicly_listed", "min_votes_required", "status",
+                 "judge_restrictions", "author_restrictions", "judges_remaining", "creator_id", "end_date",
+                 "created_at", "updated_at"),
+    "contest_members": ("id", "contest_id", "user_id", "added_at"),
+    "texts": ("id", "title", "content", "content_chars", "content_tokens", "author", "owner_id", "created_at", "updated_at"),
+    "contest_texts": ("id", "contest_id", "text_id", "submission_date", "ranking", "total_points"),
+    "contest_judges": ("id", "contest_id", "user_judge_id", "agent_judge_id", "assignment_date", "has_voted"),
+    "agent_executions": ("id", "agent_id", "owner_id", "execution_type", "model", "status", "credits_used",
+                         "api_version", "created_at"),
+    "votes": ("id", "contest_id", "text_id", "contest_judge_id", "agent_execution_id", "text_place", "comment",
+              "is_ai", "created_at"),
+}
+
+
+class BulkWriter:
+    """Writes row tuples in batches: COPY on PostgreSQL (asyncpg), executemany otherwise."""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.dialect = engine.dialect.name
+        self.rows_written: Dict[str, int] = {}
+
+    async def write(self, conn: AsyncConnection, table: Table, rows: List[tuple]) -> None:
+        columns = COLUMNS[table.name]
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            if self.dialect == "postgresql":
+                # COPY takes JSON columns as text
+                records = [tuple(json.dumps(value) if isinstance(value, dict) else value for value in row) for row in batch]
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=list(columns))
+            else:
+                await conn.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+        self.rows_written[table.name] = self.rows_written.get(table.name, 0) + len(rows)
+
+    async def reset_sequences(self, conn: AsyncConnection) -> None:
+        """Explicit ids bypass PostgreSQL sequences, so move them past the seeded rows."""
+        if self.dialect != "postgresql":
+            return
+        for model in SEEDED_MODELS:
+            table = model.__tablename__
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            ))
+
+
+@dataclass
+class IdCounter:
+    next_id: int
+
+    def take(self) -> int:
+        value = self.next_id
+        self.next_id += 1
+        return value
+
+
+@dataclass
+class ChunkRows:
+    contests: List[tuple] = field(default_factory=list)
+    contest_members: List[tuple] = field(default_factory=list)
+    texts: List[tuple] = field(default_factory=list)
+    contest_texts: List[tuple] = field(default_factory=list)
+    contest_judges: List[tuple] = field(default_factory=list)
+    agent_executions: List[tuple] = field(default_factory=list)
+    votes: List[tuple] = field(default_factory=list)
+
+
+class DatasetGenerator:
+    """
+    Deterministic row generator. All randomness comes from one Random(seed), and rows
+    are produced in a fixed order, so a given seed and size always yield the same data.
+    """
+
+    def __init__(self, args: argparse.Namespace, first_ids: Dict[str, int], now: datetime, password_hash: str):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.ids = {table: IdCounter(first_id) for table, first_id in first_ids.items()}
+        self.now = now
+        self.password_hash = password_hash
+        self.user_ids: List[int] = []
+        self.writer_agents: List[tuple] = []
+        self.judge_agents: List[tuple] = []
+        self.paragraphs = [self._sentence(self.rng.randint(40, 80)) for _ in range(500)]
+        # Texts are joined paragraphs, so their token counts are summed from per-paragraph counts
+        # (plus the separators) instead of tokenizing every generated text
+        self.paragraph_tokens = [count_text_tokens(paragraph) for paragraph in self.paragraphs]
+        self.separator_tokens = count_text_tokens("\n\n")
+        self.comments = [self._sentence(self.rng.randint(8, 25)) for _ in range(200)]
+        self.voted_contest_ids: List[int] = []
+        self.closed_contest_ids: List[int] = []
+
+    def _sentence(self, word_count: int) -> str:
+        words = self.rng.choices(WORDS, k=word_count)
+        return " ".join(words).capitalize() + "."
+
+    def _past(self, max_days: int = 365) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(max_days * 86400))
+
+    def users(self) -> tuple:
+        users, transactions = [], []
+        for _ in range(self.args.users):
+            user_id = self.ids["users"].take()
+            created_at = self._past()
+            credits = self.rng.choice((0, 10, 50, 100, 500, 1000))
+            last_login = created_at + (self.now - created_at) * self.rng.random() if self.rng.random() < 0.7 else None
+            users.append((user_id, f"{self.args.prefix}_user{user_id}", f"{self.args.prefix}_user{user_id}@seed.plumas.top",
+                          self.password_hash, credits, False, created_at, last_login))
+            if credits:
+                transactions.append((self.ids["credit_transactions"].take(), user_id, credits, "purchase",
+                                     "Seeded credits", created_at))
+            self.user_ids.append(user_id)
+        return users, transactions
+
+    def agents(self) -> List[tuple]:
+        rows = []
+        for index in range(self.args.agents):
+            agent_id = self.ids["agents"].take()
+            agent_type = "writer" if index % 2 == 0 else "judge"
+            owner_id = self.rng.choice(self.user_ids)
+            rows.append((agent_id, f"{agent_type.title()} {agent_id}", f"Seeded {agent_type} agent",
+                         self._sentence(30), agent_type, self.rng.random() < 0.2, "2.1", owner_id, self._past()))
+            (self.writer_agents if agent_type == "writer" else self.judge_agents).append((agent_id, owner_id))
+        return rows
+
+    def contest_chunk(self, count: int) -> ChunkRows:
+        chunk = ChunkRows()
+        statuses, weights = zip(*STATUS_WEIGHTS.items())
+        for _ in range(count):
+            self._contest(chunk, self.rng.choices(statuses, weights=weights)[0])
+        return chunk
+
+    def _contest(self, chunk: ChunkRows, status: str) -> None:
+        args, rng = self.args, self.rng
+        contest_id = self.ids["contests"].take()
+        creator_id = rng.choice(self.user_ids)
+        created_at = self._past()
+        publicly_listed = rng.random() >= args.unlisted_ratio
+
+        # Texts, by distinct authors
+        text_count = rng.randint(max(1, args.texts_per_contest // 2), max(1, args.texts_per_contest * 3 // 2))
+        authors = rng.sample(self.user_ids, min(text_count, len(self.user_ids)))
+        text_ids = []
+        for author_id in authors:
+            text_id = self.ids["texts"].take()
+            written_at = created_at + timedelta(seconds=rng.randrange(86400 * 7))
+            picked = rng.choices(range(len(self.paragraphs)), k=max(1, args.words_per_text // 60))
+            content = "\n\n".join(self.paragraphs[index] for index in picked)
+            content_tokens = {
+                tokenizer: sum(self.paragraph_tokens[index][tokenizer] for index in picked) + separator * (len(picked) - 1)
+                for tokenizer, separator in self.separator_tokens.items()
+            }
+            chunk.texts.append((text_id, self._sentence(rng.randint(2, 5))[:-1], content, len(content), content_tokens,
+                                f"{args.prefix}_user{author_id}", author_id, written_at, written_at))
+            chunk.contest_texts.append((self.ids["contest_texts"].take(), contest_id, text_id, written_at, None, 0))
+            text_ids.append(text_id)
+
+        # Judges: distinct users other than the creator, plus an optional AI judge
+        candidates = rng.sample(self.user_ids, min(args.judges_per_contest + 1, len(self.user_ids)))
+        judges = [("user", user_id) for user_id in candidates if user_id != creator_id][:args.judges_per_contest]
+        if self.judge_agents and rng.random() < args.ai_judge_ratio:
+            judges.append(("agent", rng.choice(self.judge_agents)))
+
+        if status == "closed":
+            voted = [True] * len(judges)
+        elif status == "evaluation":
+            voted = [rng.random() < 0.5 for _ in judges]
+            if voted and all(voted):
+                # A contest whose judges have all voted would have been closed
+                voted[-1] = False
+        else:
+            voted = [False] * len(judges)
+
+        assigned_at = created_at + timedelta(days=1)
+        for (judge_type, judge), has_voted in zip(judges, voted):
+            contest_judge_id = self.ids["contest_judges"].take()
+            execution_id = None
+            if judge_type == "user":
+                chunk.contest_judges.append((contest_judge_id, contest_id, judge, None, assigned_at, has_voted))
+            else:
+                agent_id, owner_id = judge
+                chunk.contest_judges.append((contest_judge_id, contest_id, None, agent_id, assigned_at, has_voted))
+                if has_voted:
+                    execution_id = self.ids["agent_executions"].take()
+                    chunk.agent_executions.append((execution_id, agent_id, owner_id, "judge", "gpt-4.1-nano-2025-04-14",
+                                                   "completed", rng.randint(1, 20), "2.1", assigned_at))
+            if has_voted:
+                self._votes(chunk, contest_id, contest_judge_id, execution_id, text_ids, assigned_at)
+
+        if any(voted):
+            self.voted_contest_ids.append(contest_id)
+        if status == "closed":
+            self.closed_contest_ids.append(contest_id)
+
+        if not publicly_listed:
+            members = {creator_id, *authors, *(judge for judge_type, judge in judges if judge_type == "user")}
+            for user_id in sorted(members):
+                chunk.contest_members.append((self.ids["contest_members"].take(), contest_id, user_id, created_at))
+
+        end_date: Optional[datetime] = None
+        if status == "open":
+            end_date = self.now + timedelta(hours=rng.randint(1, 30 * 24)) if rng.random() < 0.8 else None
+        elif rng.random() < 0.8:
+            end_date = created_at + timedelta(days=rng.randint(7, 30))
+        chunk.contests.append((
+            contest_id, f"Contest {contest_id}: {self._sentence(3)[:-1]}", self._sentence(40), False, publicly_listed,
+            None, status, False, False, voted.count(False), creator_id, end_date, created_at, created_at
+        ))
+
+    def _votes(self, chunk: ChunkRows, contest_id: int, contest_judge_id: int, execution_id: Optional[int],
+               text_ids: List[int], voted_at: datetime) -> None:
+        """A vote with a comment on every text, podium places for three of them."""
+        podium = self.rng.sample(text_ids, min(3, len(text_ids)))
+        places = {text_id: place for place, text_id in enumerate(podium, start=1)}
+        for text_id in text_ids:
+            chunk.votes.append((self.ids["votes"].take(), contest_id, text_id, contest_judge_id, execution_id,
+                                places.get(text_id), self.rng.choice(self.comments), execution_id is not None, voted_at))
+
+
+async def first_free_ids(conn: AsyncConnection) -> Dict[str, int]:
+    ids = {}
+    for model in SEEDED_MODELS:
+        max_id = (await conn.execute(select(func.max(model.__table__.c.id)))).scalar()
+        ids[model.__tablename__] = (max_id or 0) + 1
+    return ids
+
+
+async def seed_database(args: argparse.Namespace) -> Dict[str, int]:
+    """Generate and insert the dataset; returns the number of rows written per table."""
+    writer = BulkWriter(args.batch_size)
+    now = (datetime.strptime(args.now, "%Y-%m-%d") if args.now else datetime.now(timezone.utc)).replace(
+        hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
+    )
+    tables = {model.__tablename__: model.__table__ for model in SEEDED_MODELS}
+
+    async with engine.connect() as conn:
+        first_ids = await first_free_ids(conn)
+    generator = DatasetGenerator(args, first_ids, now, get_password_hash(args.password))
+    started = time.perf_counter()
+
+    async with engine.begin() as conn:
+        users, transactions = generator.users()
+        await writer.write(conn, tables["users"], users)
+        await writer.write(conn, tables["credit_transactions"], transactions)
+        await writer.write(conn, tables["agents"], generator.agents())
+    print(f"Users and agents written ({time.perf_counter() - started:.1f}s)")
+
+    for start in range(0, args.contests, args.chunk_contests):
+        chunk = generator.contest_chunk(min(args.chunk_contests, args.contests - start))
+        async with engine.begin() as conn:
+            for name in ("contests", "contest_members", "texts", "contest_texts", "contest_judges", "agent_executions", "votes"):
+                await writer.write(conn, tables[name], getattr(chunk, name))
+        done = start + len(chunk.contests)
+        print(f"{done}/{args.contests} contests, {writer.rows_written.get('votes', 0)} votes "
+              f"({time.perf_counter() - started:.1f}s)")
+
+    async with engine.begin() as conn:
+        await writer.reset_sequences(conn)
+
+    # Tallies and rankings come from the same set-based code the app uses
+    async with AsyncSessionLocal() as session:
+        for start in range(0, len(generator.voted_contest_ids), RECALCULATE_BATCH_SIZE):
+            await VoteRepository.rebuild_contest_tallies(session, generator.voted_contest_ids[start:start + RECALCULATE_BATCH_SIZE])
+        for start in range(0, len(generator.closed_contest_ids), RECALCULATE_BATCH_SIZE):
+            await VoteRepository.calculate_results_for_contests(session, generator.closed_contest_ids[start:start + RECALCULATE_BATCH_SIZE])
+            await session.commit()
+    print(f"Tallies and results calculated ({time.perf_counter() - started:.1f}s)")
+
+    # Closed contests are served from their results snapshot, as after a real close
+    # (the same rebuild as scripts/rebuild_results_snapshots.py)
+    async with AsyncSessionLocal() as session:
+        for start in range(0, len(generator.closed_contest_ids), RECALCULATE_BATCH_SIZE):
+            for contest_id in generator.closed_contest_ids[start:start + RECALCULATE_BATCH_SIZE]:
+                await ContestService.build_results_snapshot(session, contest_id, commit=False)
+            await session.commit()
+            session.expunge_all()
+    writer.rows_written["contest_result_snapshots"] = len(generator.closed_contest_ids)
+    print(f"Results snapshots written ({time.perf_counter() - started:.1f}s)")
+    return writer.rows_written
+
+
+async def main():
+    """Main function to seed the database."""
+    args = ARGS
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    rows_written = await seed_database(args)
+    elapsed = time.perf_counter() - started
+    total = sum(rows_written.values())
+    print(f"\nSeeded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s):")
+    for table, count in rows_written.items():
+        print(f"  {table}: {count}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -20,6 +20,8 @@ from typing import AsyncGenerator
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # --- Settings Override (CRUCIAL: Must happen before other app imports that initialize DB engine) ---
+# Minimum bcrypt work factor keeps signup/login fast in tests
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 try:
     from app.core.config import settings
     if settings.DATABASE_URL_TEST:
@@ -185,6 +187,12 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close() # Important for NullPool to actually close connection
 
+@pytest.fixture
+def query_budget():
+    """`with query_budget(n):` fails the test if the block runs more than n SQL statements."""
+    from tests.query_budget import assert_max_queries
+    return assert_max_queries
+
 # --- Helper Functions (as previously defined) ---
 def generate_unique_username(base="user"):
     return f"{base}_{uuid.uuid4().hex[:8]}_test"
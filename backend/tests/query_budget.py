@@ -0,0 +1,61 @@
+"""
+SQL statement counting for N+1 regression tests.
+
+    with assert_max_queries(6):
+        response = await client.get(f"/contests/{contest_id}/votes", headers=headers)
+
+counts every statement any engine executes in the current task (and tasks it
+spawns) inside the block, and fails with the offending statements listed when
+the budget is exceeded.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_active_counter: ContextVar[Optional["QueryCounter"]] = ContextVar("active_query_counter", default=None)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"  {index}. {' '.join(statement.split())}" for index, statement in enumerate(self.statements, 1))
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_counter.get()
+    if counter is not None:
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Collect the statements executed inside the block."""
+    counter = QueryCounter()
+    token = _active_counter.set(counter)
+    # Listening on the Engine class covers the test engine as well as the app engine
+    event.listen(Engine, "before_cursor_execute", _record_statement)
+    try:
+        yield counter
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record_statement)
+        _active_counter.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryCounter]:
+    """Fail if the block executes more than `budget` SQL statements."""
+    with count_queries() as counter:
+        yield counter
+    assert counter.count <= budget, (
+        f"Query budget exceeded: {counter.count} statements, budget {budget}:\n{counter.report()}"
+    )
@@ -0,0 +1,129 @@
+"""
+Batch text submission: every rejection reason of the single-submission path,
+reported per pair, and the restrictions applied across pairs of one batch.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Contest, ContestJudge, ContestMember, ContestText, Text
+from app.schemas.contest import BatchSubmissionItem, BatchTextSubmission, TextSubmission
+from app.services.contest_service import ContestService
+from tests.test_query_budgets import _user
+
+MISSING_ID = 10 ** 9
+
+
+async def _seed(db: AsyncSession) -> dict:
+    creator, submitter, other = _user("creator"), _user("submitter"), _user("other")
+    db.add_all([creator, submitter, other])
+    await db.flush()
+
+    def contest(**kwargs) -> Contest:
+        values = dict(title="Batch contest", description="Batch", creator_id=creator.id, status="open",
+                      publicly_listed=True, password_protected=False)
+        return Contest(**{**values, **kwargs})
+
+    contests = {
+        "open": contest(),
+        "private": contest(publicly_listed=False),
+        "member": contest(publicly_listed=False),
+        "password": contest(password_protected=True, password="secret"),
+        "evaluation": contest(status="evaluation"),
+        "past_deadline": contest(end_date=datetime.now(timezone.utc) - timedelta(days=1)),
+        "one_per_author": contest(author_restrictions=True),
+        "authored": contest(author_restrictions=True),
+        "judged": contest(judge_restrictions=True),
+        "judged_one_per_author": contest(judge_restrictions=True, author_restrictions=True),
+    }
+    texts = [Text(title=f"Text {i}", content="Content", author="Author", owner_id=submitter.id) for i in range(3)]
+    foreign_text = Text(title="Not mine", content="Content", author="Author", owner_id=other.id)
+    db.add_all([*contests.values(), *texts, foreign_text])
+    await db.flush()
+
+    db.add_all([
+        ContestMember(contest_id=contests["member"].id, user_id=submitter.id),
+        ContestJudge(contest_id=contests["judged"].id, user_judge_id=submitter.id),
+        ContestJudge(contest_id=contests["judged_one_per_author"].id, user_judge_id=submitter.id),
+        ContestText(contest_id=contests["authored"].id, text_id=texts[2].id),
+        ContestText(contest_id=contests["open"].id, text_id=texts[2].id),
+    ])
+    await db.commit()
+    return {"submitter": submitter, "contests": contests,
+            "texts": [text.id for text in texts], "foreign_text": foreign_text.id}
+
+
+async def test_batch_reports_each_rejection(db_session: AsyncSession):
+    seed = await _seed(db_session)
+    contests = {name: contest.id for name, contest in seed["contests"].items()}
+    first, second, submitted = seed["texts"]
+    pairs = [
+        (contests["open"], first),
+        (contests["open"], first),  # Duplicate pair: submitted once
+        (contests["open"], submitted),
+        (MISSING_ID, first),
+        (contests["private"], first),
+        (contests["member"], first),
+        (contests["password"], first),
+        (contests["evaluation"], first),
+        (contests["past_deadline"], first),
+        (contests["open"], MISSING_ID),
+        (contests["open"], seed["foreign_text"]),
+        (contests["one_per_author"], first),
+        (contests["one_per_author"], second),  # Second text of the same author in this batch
+        (contests["authored"], first),
+        (contests["judged"], first),
+        (contests["judged_one_per_author"], first),
+        (contests["judged_one_per_author"], second),
+    ]
+    batch = BatchTextSubmission(
+        submissions=[BatchSubmissionItem(contest_id=contest_id, text_id=text_id) for contest_id, text_id in pairs],
+        contest_passwords={contests["password"]: "wrong"}
+    )
+
+    response = await ContestService.submit_texts_batch(db_session, batch, seed["submitter"].id)
+
+    assert sorted((item.contest_id, item.text_id) for item in response.submitted) == sorted([
+        (contests["open"], first),
+        (contests["member"], first),
+        (contests["one_per_author"], first),
+    ])
+    rejected = {(item.contest_id, item.text_id): (item.status_code, item.detail) for item in response.rejected}
+    assert rejected == {
+        (contests["open"], submitted): (400, "Text has already been submitted to this contest"),
+        (MISSING_ID, first): (404, f"Contest with id {MISSING_ID} not found"),
+        (contests["private"], first): (403, "You don't have access to this contest"),
+        (contests["password"], first): (403, "Invalid password for password protected contest"),
+        (contests["evaluation"], first): (400, "Contest is not open for submissions"),
+        (contests["past_deadline"], first): (400, "Contest deadline has passed"),
+        (contests["open"], MISSING_ID): (404, f"Text with id {MISSING_ID} not found"),
+        (contests["open"], seed["foreign_text"]): (403, "You don't have permission to submit this text"),
+        (contests["one_per_author"], second): (403, "Contest only allows one submission per author"),
+        (contests["authored"], first): (403, "Contest only allows one submission per author"),
+        (contests["judged"], first): (403, "Judges cannot submit texts to this contest"),
+        # A pair rejected for another reason doesn't use up the author's one submission
+        (contests["judged_one_per_author"], first): (403, "Judges cannot submit texts to this contest"),
+        (contests["judged_one_per_author"], second): (403, "Judges cannot submit texts to this contest"),
+    }
+    assert len(response.rejected) == len(rejected)
+
+
+@pytest.mark.parametrize("contest, detail", [
+    ("authored", "Contest only allows one submission per author"),
+    ("judged", "Judges cannot submit texts to this contest"),
+])
+async def test_single_submission_applies_contest_restrictions(db_session: AsyncSession, contest: str, detail: str):
+    seed = await _seed(db_session)
+    with pytest.raises(HTTPException) as error:
+        await ContestService.submit_text_to_contest(
+            db_session, seed["contests"][contest].id, TextSubmission(text_id=seed["texts"][0]), seed["submitter"].id
+        )
+    assert (error.value.status_code, error.value.detail) == (403, detail)
+
+    submitted = await ContestService.submit_text_to_contest(
+        db_session, seed["contests"]["one_per_author"].id, TextSubmission(text_id=seed["texts"][0]), seed["submitter"].id
+    )
+    assert submitted.text_id == seed["texts"][0]
@@ -0,0 +1,237 @@
+"""
+Read cache: the Redis backend (against an in-process stand-in for the Redis
+protocol) and the credit paths, which must never act on a cached balance.
+"""
+
+import fnmatch
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import RedisCache, get_cache, set_cache
+from app.core.security import create_access_token
+from app.db.models import User
+from app.db.repositories.agent_repository import AgentRepository
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.user_repository import UserRepository
+from app.services.credit_service import CreditService
+from tests.test_judges_remaining import _seed_evaluation_contest
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis used by RedisCache, kept in a dict (values as bytes)."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.elapsed = 0  # Seconds added to the clock, to let entries expire
+
+    def _now(self):
+        return time.monotonic() + self.elapsed
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= self._now():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    @staticmethod
+    def _key(key):
+        return key.encode() if isinstance(key, str) else key
+
+    async def get(self, key):
+        key = self._key(key)
+        return self.data[key] if self._alive(key) else None
+
+    async def set(self, key, value, ex=None):
+        key = self._key(key)
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = self._now() + ex
+
+    async def sadd(self, key, *members):
+        key = self._key(key)
+        if not self._alive(key):
+            self.data[key] = set()
+        self.data[key].update(self._key(member) for member in members)
+
+    async def expire(self, key, seconds, nx=False, gt=False):
+        key = self._key(key)
+        if not self._alive(key):
+            return False
+        current = self.expires.get(key)
+        expires_at = self._now() + seconds
+        # GT treats a key without a TTL as never expiring
+        if (nx and current is not None) or (gt and (current is None or expires_at <= current)):
+            return False
+        self.expires[key] = expires_at
+        return True
+
+    async def smembers(self, key):
+        key = self._key(key)
+        return set(self.data[key]) if self._alive(key) else set()
+
+    async def delete(self, *keys):
+        for key in keys:
+            key = self._key(key)
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+
+    async def scan_iter(self, match="*"):
+        pattern = self._key(match).decode()
+        for key in list(self.data):
+            if self._alive(key) and fnmatch.fnmatchcase(key.decode(), pattern):
+                yield key
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def redis_cache():
+    previous = get_cache()
+    cache = RedisCache(client=FakeRedis(), default_ttl=60)
+    set_cache(cache)
+    yield cache
+    set_cache(previous)
+
+
+def _user(credits: int = 100) -> User:
+    suffix = uuid.uuid4().hex[:8]
+    return User(
+        username=f"cache_{suffix}_test",
+        email=f"cache_{suffix}@cache.plumas.top",
+        hashed_password="not-a-real-hash",
+        credits=credits,
+        is_admin=False
+    )
+
+
+async def test_redis_cache_round_trip_and_tags():
+    cache = RedisCache(client=FakeRedis(), default_ttl=60)
+    created_at = datetime(2024, 5, 1, 12, 30)
+
+    await cache.set("user:1", {"id": 1, "created_at": created_at}, tags=["user:1"])
+    await cache.set("contest:7:results", [1, 2, 3], tags=["contest:7", "user:1"])
+    assert await cache.get("user:1") == {"id": 1, "created_at": created_at}
+
+    await cache.invalidate_tags("user:1")
+    assert await cache.get("user:1") is None
+    assert await cache.get("contest:7:results") is None
+
+    await cache.set("contest:8", {"title": "Kept"})
+    await cache.clear()
+    assert await cache.get("contest:8") is None
+
+
+async def test_redis_tag_outlives_its_longest_entry():
+    client = FakeRedis()
+    cache = RedisCache(client=client, default_ttl=60)
+
+    # A user row and a shorter-lived principal share the user's tag; the principal is written last
+    await cache.set("user:1", {"id": 1}, ttl=60, tags=["user:1"])
+    await cache.set("principal:1", {"id": 1}, ttl=30, tags=["user:1"])
+    client.elapsed = 45
+    assert await cache.get("principal:1") is None
+    assert await cache.get("user:1") == {"id": 1}
+
+    await cache.invalidate_tags("user:1")
+    assert await cache.get("user:1") is None
+
+    # Tag sets still expire once all of their entries have
+    await cache.set("user:2", {"id": 2}, ttl=30, tags=["user:2"])
+    client.elapsed += 31
+    assert await client.smembers("duelo:tag:user:2") == set()
+
+
+async def test_cached_user_has_no_password_hash(db_session: AsyncSession, redis_cache: RedisCache):
+    user = _user()
+    db_session.add(user)
+    await db_session.commit()
+
+    await UserRepository(db_session).get_by_id(user.id)
+
+    cached = await redis_cache.get(f"user:{user.id}")
+    assert cached["username"] == user.username
+    assert "hashed_password" not in cached
+
+
+async def test_principal_is_detached_and_has_no_password_hash(
+    client: AsyncClient, db_session: AsyncSession, redis_cache: RedisCache
+):
+    user = _user()
+    db_session.add(user)
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.username, 'id': user.id})}"}
+
+    for _ in range(2):  # Cache miss, then hit
+        response = await client.get("/users/me", headers=headers)
+        assert response.status_code == 200, response.text
+        assert response.json()["username"] == user.username
+    assert "hashed_password" not in await redis_cache.get(f"principal:{user.id}")
+
+    principal = await UserRepository(db_session).get_principal(user.id, user.username)
+    assert inspect(principal).detached
+    assert principal not in db_session
+    assert await UserRepository(db_session).get_principal(user.id, "someone_else") is None
+
+
+async def test_credits_ignore_stale_cached_user(db_session: AsyncSession, redis_cache: RedisCache):
+    user = _user(credits=100)
+    db_session.add(user)
+    await db_session.commit()
+    user_id = user.id
+
+    # Warm the cache (and this session's identity map) at 100 credits
+    repo = UserRepository(db_session)
+    assert (await repo.get_by_id(user_id)).credits == 100
+
+    # Another worker changes the balance without this process knowing
+    await db_session.execute(text("UPDATE users SET credits = 500 WHERE id = :id"), {"id": user_id})
+    await db_session.commit()
+
+    await CreditService.deduct_credits(db_session, user_id, 10, "Stale cache regression")
+    assert (await repo.get_by_id(user_id, use_cache=False)).credits == 490
+
+    # Deductions never go below zero
+    await CreditService.deduct_credits(db_session, user_id, 1000, "Overdraw")
+    assert (await repo.get_by_id(user_id, use_cache=False)).credits == 0
+
+
+async def test_deleting_judges_invalidates_their_contests(db_session: AsyncSession, redis_cache: RedisCache):
+    seed = await _seed_evaluation_contest(db_session, human_judges=1, ai_judges=1)
+    contest_id, agent_id = seed["contest"].id, seed["agents"][0].id
+    contest_key = f"contest:{contest_id}"
+
+    await ContestRepository.get_contest(db_session, contest_id)
+    assert (await redis_cache.get(contest_key))["judges_remaining"] == 2
+    await UserRepository(db_session).delete(seed["judges"][0].id)
+    assert await redis_cache.get(contest_key) is None
+
+    db_session.expire_all()  # As in a new request
+    await ContestRepository.get_contest(db_session, contest_id)
+    assert (await redis_cache.get(contest_key))["judges_remaining"] == 1
+    await AgentRepository.delete_agent(db_session, agent_id)
+    assert await redis_cache.get(contest_key) is None
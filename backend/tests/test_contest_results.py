@@ -0,0 +1,103 @@
+"""
+Set-based contest results: one UPDATE ranks several contests, with the same
+points and rankings as the original per-contest Python algorithm.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Contest, ContestJudge, ContestText, Text, Vote
+from app.db.repositories.vote_repository import VoteRepository
+from tests.test_query_budgets import _user
+
+POINTS_BY_PLACE = {1: 3, 2: 2, 3: 1}
+SUBMITTED_AT = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def reference_results(contest_texts: List[ContestText], votes: List[Vote]) -> Dict[int, Tuple[int, Optional[int]]]:
+    """The original Python ranking: {contest_text_id: (total_points, ranking)} for one contest."""
+    points = {ct.text_id: 0 for ct in contest_texts}
+    for vote in votes:
+        if vote.text_id in points and vote.text_place is not None:
+            points[vote.text_id] += POINTS_BY_PLACE.get(vote.text_place, 0)
+    if not votes:
+        return {ct.id: (0, None) for ct in contest_texts}
+
+    ordered = sorted(
+        contest_texts,
+        key=lambda ct: (points[ct.text_id], -ct.submission_date.timestamp()),
+        reverse=True
+    )
+    results, current_rank, last_score = {}, 0, -1
+    for i, ct in enumerate(ordered):
+        if points[ct.text_id] != last_score:
+            current_rank = i + 1
+            last_score = points[ct.text_id]
+        results[ct.id] = (points[ct.text_id], current_rank)
+    return results
+
+
+async def _seed_contest(db: AsyncSession, creator, author, judges, placements: List[List[Optional[int]]]):
+    """
+    A contest with one text per placements row; placements[t][j] is the place judge j gave text t
+    (None: a comment without a place; missing: no vote). Later texts were submitted earlier.
+    """
+    contest = Contest(title="Results contest", description="Set-based results", creator_id=creator.id,
+                      status="evaluation", publicly_listed=True, password_protected=False)
+    texts = [Text(title=f"Text {i}", content="Content", author="Author", owner_id=author.id) for i in range(len(placements))]
+    db.add_all([contest, *texts])
+    await db.flush()
+
+    assignments = [ContestJudge(contest_id=contest.id, user_judge_id=judge.id) for judge in judges]
+    contest_texts = [
+        ContestText(contest_id=contest.id, text_id=text.id, submission_date=SUBMITTED_AT - timedelta(hours=i))
+        for i, text in enumerate(texts)
+    ]
+    db.add_all([*assignments, *contest_texts])
+    await db.flush()
+
+    votes = [
+        Vote(contest_id=contest.id, text_id=text.id, contest_judge_id=assignments[j].id,
+             text_place=place, comment="Comment", is_ai=False)
+        for text, places in zip(texts, placements)
+        for j, place in enumerate(places)
+    ]
+    db.add_all(votes)
+    await db.flush()
+    await VoteRepository.apply_votes_to_tallies(db, Vote.contest_id == contest.id)
+    await db.commit()
+    return contest.id, contest_texts, votes
+
+
+async def test_results_for_several_contests_match_python_ranking(db_session: AsyncSession):
+    creator, author, *judges = [_user("creator"), _user("author"), _user("judge"), _user("judge")]
+    db_session.add_all([creator, author, *judges])
+    await db_session.flush()
+
+    seeds = [
+        # Tied at the top and the bottom (5, 5, 1, 1), one text left off the podium entirely
+        await _seed_contest(db_session, creator, author, judges, [[1, 2], [2, 1], [3], [None, 3], []]),
+        # No votes at all: everything stays unranked
+        await _seed_contest(db_session, creator, author, judges, [[], [], []]),
+        # Only one podium place given, plus a comment-only vote
+        await _seed_contest(db_session, creator, author, judges, [[1], [None], []]),
+    ]
+    expected = {}
+    for _, contest_texts, votes in seeds:
+        expected.update(reference_results(contest_texts, votes))
+
+    updated = await VoteRepository.calculate_results_for_contests(db_session, [contest_id for contest_id, _, _ in seeds])
+    assert updated == len(expected)
+
+    rows = await db_session.execute(
+        select(ContestText.id, ContestText.total_points, ContestText.ranking)
+        .where(ContestText.id.in_(list(expected)))
+    )
+    stored = {row.id: (row.total_points, row.ranking) for row in rows}
+    assert stored == expected
+    # Spot checks on the reference itself: shared ranks and unranked contests
+    assert sorted(stored[ct.id] for ct in seeds[0][1]) == [(0, 5), (1, 3), (1, 3), (5, 1), (5, 1)]
+    assert {stored[ct.id] for ct in seeds[1][1]} == {(0, None)}
@@ -0,0 +1,113 @@
+"""
+Contest lifecycle scheduler: concurrent workers claim each due contest once, and
+the AI judges of claimed contests are run from the database, surviving restarts.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Contest, ScheduledJudgeRun
+from app.services.contest_scheduler import ContestLifecycleScheduler
+from app.services.judge_service import JudgeService
+from tests.test_judges_remaining import _seed_evaluation_contest
+
+
+async def _seed_due_contests(db: AsyncSession, count: int, ai_judges: int) -> list:
+    """Open contests whose end_date has passed, each with its own AI judges."""
+    seeds = [await _seed_evaluation_contest(db, human_judges=1, ai_judges=ai_judges) for _ in range(count)]
+    contest_ids = [seed["contest"].id for seed in seeds]
+    await db.execute(
+        update(Contest)
+        .where(Contest.id.in_(contest_ids))
+        .values(status="open", end_date=datetime.now(timezone.utc) - timedelta(minutes=5))
+    )
+    await db.commit()
+    return seeds
+
+
+def _scheduler(db: AsyncSession, **kwargs) -> ContestLifecycleScheduler:
+    """A scheduler with its own sessions on the test database, like another worker."""
+    return ContestLifecycleScheduler(
+        batch_size=2, ai_judge_model="test-model",
+        session_factory=lambda: AsyncSession(db.bind, expire_on_commit=False), **kwargs
+    )
+
+
+async def _scheduled_runs(db: AsyncSession, contest_ids: list) -> list:
+    result = await db.execute(
+        select(ScheduledJudgeRun.contest_id, ScheduledJudgeRun.agent_id)
+        .where(ScheduledJudgeRun.contest_id.in_(contest_ids))
+    )
+    return sorted(result.all())
+
+
+async def test_concurrent_runs_claim_each_contest_once(db_session: AsyncSession):
+    seeds = await _seed_due_contests(db_session, count=5, ai_judges=2)
+    contest_ids = {seed["contest"].id for seed in seeds}
+
+    first, second = await asyncio.gather(_scheduler(db_session).run_once(), _scheduler(db_session).run_once())
+
+    mine = [contest_id for contest_id in first + second if contest_id in contest_ids]
+    assert sorted(mine) == sorted(contest_ids)
+    statuses = await db_session.execute(select(Contest.status).where(Contest.id.in_(contest_ids)))
+    assert set(statuses.scalars()) == {"evaluation"}
+    # One scheduled run per AI judge, written by whichever worker claimed the contest
+    assert await _scheduled_runs(db_session, list(contest_ids)) == sorted(
+        (seed["contest"].id, agent.id) for seed in seeds for agent in seed["agents"]
+    )
+
+
+async def test_scheduled_judges_survive_a_restart(db_session: AsyncSession, monkeypatch):
+    seeds = await _seed_due_contests(db_session, count=1, ai_judges=3)
+    contest_id = seeds[0]["contest"].id
+    crashed_agent, rejected_agent, _ = [agent.id for agent in seeds[0]["agents"]]
+    assert await _scheduler(db_session).run_once() == [contest_id]
+
+    calls = []
+
+    async def execute_ai_judge(db, request, user_id):
+        calls.append((request.contest_id, request.agent_id, user_id))
+        if request.agent_id == crashed_agent and len([c for c in calls if c[1] == crashed_agent]) == 1:
+            raise RuntimeError("Provider timed out")
+        if request.agent_id == rejected_agent:
+            raise HTTPException(status_code=400, detail="Insufficient credits")
+
+    monkeypatch.setattr(JudgeService, "execute_ai_judge", execute_ai_judge)
+
+    # A new worker (e.g. after a restart) finds the runs in the database; a lease of 0
+    # lets it retry the failed run right away instead of after the usual timeout
+    restarted = _scheduler(db_session, judge_lease_seconds=0)
+    while await restarted.run_next_judge():
+        pass
+
+    creator_id = seeds[0]["creator"].id
+    mine = [call for call in calls if call[0] == contest_id]
+    assert sorted(mine) == sorted(
+        [(contest_id, agent.id, creator_id) for agent in seeds[0]["agents"]] + [(contest_id, crashed_agent, creator_id)]
+    )
+    # Finished and rejected runs are removed; nothing is left to run
+    assert await _scheduled_runs(db_session, [contest_id]) == []
+
+
+async def test_failing_judge_is_given_up_after_max_attempts(db_session: AsyncSession, monkeypatch):
+    seeds = await _seed_due_contests(db_session, count=1, ai_judges=1)
+    contest_id = seeds[0]["contest"].id
+    await _scheduler(db_session).run_once()
+    attempts = []
+
+    async def execute_ai_judge(db, request, user_id):
+        if request.contest_id == contest_id:
+            attempts.append(request.agent_id)
+            raise RuntimeError("Provider down")
+
+    monkeypatch.setattr(JudgeService, "execute_ai_judge", execute_ai_judge)
+    scheduler = _scheduler(db_session, judge_lease_seconds=0, max_judge_attempts=2)
+    while await scheduler.run_next_judge():
+        pass
+
+    assert attempts == [seeds[0]["agents"][0].id] * 2
+    assert await _scheduled_runs(db_session, [contest_id]) == []
@@ -0,0 +1,127 @@
+"""
+Content-addressed storage of debug log bodies: chunking is lossless, shared
+chunks are stored once, and retention only drops chunks no log uses any more.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.ai_debug_log import AIDebugBlob, AIDebugLog
+from app.utils.debug_logger import BLOB_PARAGRAPH_CHUNK_CHARS, DebugLogWriter, pack_bodies, split_body
+
+LOGGED_AT = datetime(2024, 7, 1, tzinfo=timezone.utc)
+
+
+def _section(name: str, paragraphs: int = 3) -> str:
+    """Paragraphs long enough to always end a chunk, unique to this test run."""
+    marker = uuid.uuid4().hex
+    return "\n\n".join(f"{name} {marker} {i}: " + "x" * BLOB_PARAGRAPH_CHUNK_CHARS for i in range(paragraphs))
+
+
+def _row(hour: int, prompt: str, response: str = "Response") -> dict:
+    return {"timestamp": LOGGED_AT + timedelta(hours=hour), "operation_type": "judge",
+            "llm_prompt": prompt, "llm_response": response}
+
+
+async def _blob_hashes_used_at(db: AsyncSession, hashes, when: datetime) -> set:
+    result = await db.execute(
+        select(AIDebugBlob.hash).where(AIDebugBlob.hash.in_(list(hashes)), AIDebugBlob.last_used_at == when)
+    )
+    return set(result.scalars())
+
+
+@pytest.mark.parametrize("body", [
+    "",
+    "One paragraph",
+    "\n\n",
+    "\n\nLeading and trailing blank lines\n\n",
+    "Three\n\n\n\nblank\n\n\n\n\nlines",
+    "Windows\r\n\r\nline endings\r\n",
+    "Acentos, eñes y ✒️ emoji\n\n" * 40,
+    _section("Long") + "\n\nshort tail",
+])
+def test_split_body_rejoins_exactly(body: str):
+    chunks = split_body(body)
+    assert "\n\n".join(chunks).encode("utf-8") == body.encode("utf-8")
+    assert chunks
+
+
+def test_shared_section_gives_the_same_chunks():
+    shared = _section("Base prompt")
+    first = split_body(f"{shared}\n\nContest A texts")
+    second = split_body(f"{shared}\n\nContest B texts, which are different")
+    assert first[:3] == second[:3] == shared.split("\n\n")
+    assert first[3:] != second[3:]
+
+
+async def test_equal_chunks_are_stored_once(db_session: AsyncSession):
+    shared = _section("Shared")
+    blobs, rows = pack_bodies([_row(0, f"{shared}\n\nFirst"), _row(1, f"{shared}\n\nSecond")])
+    shared_hashes = rows[0]["llm_prompt_blobs"][:3]
+    assert rows[1]["llm_prompt_blobs"][:3] == shared_hashes
+    assert set(blobs) == {
+        digest for row in rows for digest in row["llm_prompt_blobs"] + row["llm_response_blobs"]
+    }
+    assert all("llm_prompt" not in row and "llm_response" not in row for row in rows)
+
+    await DebugLogWriter._store_blobs(db_session, list(blobs.values()))
+    # A later batch with the same section adds no rows for it
+    later_blobs, _ = pack_bodies([_row(2, f"{shared}\n\nThird")])
+    await DebugLogWriter._store_blobs(db_session, list(later_blobs.values()))
+    await db_session.commit()
+
+    counts = await db_session.execute(
+        select(AIDebugBlob.hash, func.count()).where(AIDebugBlob.hash.in_(shared_hashes)).group_by(AIDebugBlob.hash)
+    )
+    assert dict(counts.all()) == {digest: 1 for digest in shared_hashes}
+
+
+async def test_last_used_at_never_moves_back(db_session: AsyncSession):
+    shared = _section("Reused")
+    # Within a batch the newest log wins, whatever the order of the rows
+    blobs, rows = pack_bodies([_row(5, shared), _row(3, shared)])
+    hashes = rows[0]["llm_prompt_blobs"]
+    await DebugLogWriter._store_blobs(db_session, list(blobs.values()))
+    await db_session.commit()
+    assert await _blob_hashes_used_at(db_session, hashes, LOGGED_AT + timedelta(hours=5)) == set(hashes)
+
+    # A batch from another worker that commits late doesn't move it back
+    older, _ = pack_bodies([_row(4, shared)])
+    await DebugLogWriter._store_blobs(db_session, list(older.values()))
+    await db_session.commit()
+    assert await _blob_hashes_used_at(db_session, hashes, LOGGED_AT + timedelta(hours=5)) == set(hashes)
+
+    newer, _ = pack_bodies([_row(6, shared)])
+    await DebugLogWriter._store_blobs(db_session, list(newer.values()))
+    await db_session.commit()
+    assert await _blob_hashes_used_at(db_session, hashes, LOGGED_AT + timedelta(hours=6)) == set(hashes)
+
+
+async def test_retention_deletes_only_unreferenced_blobs(db_session: AsyncSession):
+    shared, only_old, only_kept, only_newest = (_section(name, 1) for name in ("Shared", "Old", "Kept", "Newest"))
+    blobs, rows = pack_bodies([
+        _row(0, f"{shared}\n\n{only_old}", response=""),
+        _row(1, f"{shared}\n\n{only_kept}", response=""),
+        _row(2, only_newest, response=""),
+    ])
+    await DebugLogWriter._store_blobs(db_session, list(blobs.values()))
+    await db_session.execute(insert(AIDebugLog), rows)
+    await db_session.commit()
+
+    writer = DebugLogWriter(max_queue=10, batch_size=10, flush_seconds=0, retention=2, retention_seconds=0)
+    await writer._apply_retention(db_session)
+    await db_session.commit()
+
+    remaining_logs = (await db_session.execute(
+        select(AIDebugLog.llm_prompt_blobs).order_by(AIDebugLog.id)
+    )).scalars().all()
+    assert remaining_logs == [rows[1]["llm_prompt_blobs"], rows[2]["llm_prompt_blobs"]]
+    stored = set((await db_session.execute(
+        select(AIDebugBlob.hash).where(AIDebugBlob.hash.in_(list(blobs)))
+    )).scalars())
+    # The old log's own chunk goes; the chunk it shared with a remaining log stays
+    assert stored == {digest for row in rows[1:] for digest in row["llm_prompt_blobs"] + row["llm_response_blobs"]}
@@ -0,0 +1,84 @@
+"""
+DebugLogWriter: queued rows are written in batches, a full queue drops rows
+instead of blocking, retention keeps the newest logs and stop() drains the queue.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.ai_debug_log import AIDebugLog
+from app.utils.debug_logger import DebugLogWriter
+
+
+def _writer(db: AsyncSession, **kwargs) -> DebugLogWriter:
+    values = dict(max_queue=100, batch_size=3, flush_seconds=0.01, retention=10_000, retention_seconds=3600,
+                  session_factory=lambda: AsyncSession(db.bind, expire_on_commit=False))
+    return DebugLogWriter(**{**values, **kwargs})
+
+
+def _row(model_id: str) -> dict:
+    return {"timestamp": datetime.now(timezone.utc), "operation_type": "writer", "model_id": model_id,
+            "llm_prompt": "Prompt", "llm_response": "Response"}
+
+
+async def _logged(db: AsyncSession, model_id: str) -> int:
+    return await db.scalar(select(func.count()).select_from(AIDebugLog).where(AIDebugLog.model_id == model_id))
+
+
+async def test_rows_are_written_in_batches(db_session: AsyncSession, monkeypatch):
+    writer, model_id = _writer(db_session), uuid.uuid4().hex
+    batches = []
+    write = writer._write
+
+    async def record(batch):
+        batches.append(len(batch))
+        await write(batch)
+
+    monkeypatch.setattr(writer, "_write", record)
+    for _ in range(7):
+        writer.enqueue(_row(model_id))
+    while sum(batches) < 7:
+        await asyncio.sleep(0.01)
+    await writer.stop()
+
+    assert batches == [3, 3, 1]
+    assert await _logged(db_session, model_id) == writer.written == 7
+
+
+async def test_full_queue_drops_rows(db_session: AsyncSession):
+    writer, model_id = _writer(db_session, max_queue=2), uuid.uuid4().hex
+    # The writer task doesn't run until this coroutine yields, so the queue fills up
+    for _ in range(5):
+        writer.enqueue(_row(model_id))
+    assert writer.dropped == 3
+
+    await writer.stop()
+    assert await _logged(db_session, model_id) == 2
+
+
+async def test_retention_keeps_the_newest_logs(db_session: AsyncSession):
+    writer, model_id = _writer(db_session, batch_size=10, retention=3, retention_seconds=0), uuid.uuid4().hex
+    for _ in range(5):
+        writer.enqueue(_row(model_id))
+    await writer.stop()
+
+    remaining = (await db_session.execute(select(AIDebugLog.model_id, AIDebugLog.id).order_by(AIDebugLog.id))).all()
+    assert [row.model_id for row in remaining] == [model_id] * 3
+    assert await _logged(db_session, model_id) == 3
+
+
+async def test_stop_drains_the_queue(db_session: AsyncSession):
+    # A long flush interval: the task holds the first row while it waits for a burst
+    writer, model_id = _writer(db_session, batch_size=10, flush_seconds=60), uuid.uuid4().hex
+    writer.enqueue(_row(model_id))
+    await asyncio.sleep(0.01)
+    for _ in range(3):
+        writer.enqueue(_row(model_id))
+    assert await _logged(db_session, model_id) == 0
+
+    await writer.stop()
+    assert await _logged(db_session, model_id) == writer.written == 4
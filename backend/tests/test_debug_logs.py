@@ -0,0 +1,136 @@
+"""
+AI debug log admin API: keyset pagination and filters of the listing, and
+blob-backed bodies streamed back exactly as they were logged.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import User
+from app.db.models.ai_debug_log import AIDebugLog
+from app.utils import debug_logger
+from app.utils.debug_logger import DebugLogWriter, pack_bodies
+from tests.test_query_budgets import _headers, _user
+
+STARTED_AT = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def debug_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+
+async def _admin(db: AsyncSession) -> User:
+    admin = _user("admin")
+    admin.is_admin = True
+    db.add(admin)
+    await db.commit()
+    return admin
+
+
+async def _log(db: AsyncSession, rows: list) -> list:
+    """Write log rows the way DebugLogWriter does (bodies as shared chunks); returns their ids."""
+    blobs, rows = pack_bodies(rows)
+    if blobs:
+        await DebugLogWriter._store_blobs(db, list(blobs.values()))
+    result = await db.execute(insert(AIDebugLog).returning(AIDebugLog.id), rows)
+    await db.commit()
+    return list(result.scalars())
+
+
+def _row(model_id: str, hour: int, **values) -> dict:
+    return {"timestamp": STARTED_AT + timedelta(hours=hour), "operation_type": "judge",
+            "model_id": model_id, "llm_prompt": "Prompt", "llm_response": "Response", **values}
+
+
+async def _list(client: AsyncClient, admin: User, **params) -> dict:
+    response = await client.get("/admin/ai-debug-logs/api", params=params, headers=_headers(admin))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_listing_pages_through_logs_newest_first(client: AsyncClient, db_session: AsyncSession, debug_enabled):
+    admin = await _admin(db_session)
+    model_id = f"paging-{uuid.uuid4().hex[:8]}"
+    ids = await _log(db_session, [_row(model_id, hour) for hour in range(5)])
+
+    pages, before_id = [], None
+    while True:
+        params = {"model_id": model_id, "limit": 2}
+        if before_id is not None:
+            params["before_id"] = before_id
+        page = await _list(client, admin, **params)
+        pages.append([log["id"] for log in page["logs"]])
+        before_id = page["next_before_id"]
+        if before_id is None:
+            break
+
+    newest_first = sorted(ids, reverse=True)
+    assert pages == [newest_first[0:2], newest_first[2:4], newest_first[4:]]
+
+
+async def test_listing_filters(client: AsyncClient, db_session: AsyncSession, debug_enabled):
+    admin = await _admin(db_session)
+    model_id = f"filters-{uuid.uuid4().hex[:8]}"
+    writer, judge, other_user, late = await _log(db_session, [
+        _row(model_id, 0, operation_type="writer", user_id=1),
+        _row(model_id, 1, contest_id=7, user_id=1),
+        _row(model_id, 2, contest_id=8, user_id=2),
+        _row(model_id, 3, contest_id=7, user_id=1),
+    ])
+
+    filters = [
+        ({}, [late, other_user, judge, writer]),
+        ({"operation_type": "writer"}, [writer]),
+        ({"operation_type": "judge"}, [late, other_user, judge]),
+        ({"contest_id": 7}, [late, judge]),
+        ({"user_id": 2}, [other_user]),
+        ({"since": (STARTED_AT + timedelta(hours=2)).isoformat()}, [late, other_user]),
+        ({"until": (STARTED_AT + timedelta(hours=2)).isoformat()}, [judge, writer]),
+        ({"contest_id": 7, "since": (STARTED_AT + timedelta(hours=2)).isoformat()}, [late]),
+    ]
+    for params, expected in filters:
+        page = await _list(client, admin, model_id=model_id, **params)
+        assert [log["id"] for log in page["logs"]] == expected, params
+    assert (await _list(client, admin, model_id=f"{model_id}-none"))["logs"] == []
+
+
+async def test_streamed_body_matches_logged_body(
+    client: AsyncClient, db_session: AsyncSession, debug_enabled, monkeypatch
+):
+    admin = await _admin(db_session)
+    # More chunks than one streaming query fetches
+    monkeypatch.setattr(debug_logger, "BODY_STREAM_BATCH", 2)
+    shared = "\n\n".join(f"Base prompt section {i}: " + "rule " * 250 for i in range(4))
+    prompt = f"{shared}\n\nText 1: Érase una vez…\n\n\n\nText 2: ✒️ fin\n\n"
+    response = "1. Text 2\n\n2. Text 1"
+    ids = await _log(db_session, [
+        _row("streaming", 0, llm_prompt=prompt, llm_response=response),
+        _row("streaming", 1, llm_prompt=shared + "\n\nAnother contest", llm_response=""),
+    ])
+    legacy_id = (await db_session.execute(
+        insert(AIDebugLog).values(_row("streaming", 2, llm_prompt="Inline prompt", llm_response=None)).returning(AIDebugLog.id)
+    )).scalar_one()
+    await db_session.commit()
+
+    async def body(log_id: int, which: str) -> str:
+        result = await client.get(f"/admin/ai-debug-logs/api/{log_id}/{which}", headers=_headers(admin))
+        assert result.status_code == 200, result.text
+        return result.text
+
+    assert await body(ids[0], "prompt") == prompt
+    assert await body(ids[0], "response") == response
+    assert await body(ids[1], "prompt") == shared + "\n\nAnother contest"
+    assert await body(ids[1], "response") == ""
+    # Rows logged before blob storage keep their bodies inline
+    assert await body(legacy_id, "prompt") == "Inline prompt"
+    assert await body(legacy_id, "response") == ""
+
+    missing = await client.get("/admin/ai-debug-logs/api/1000000000/prompt", headers=_headers(admin))
+    assert missing.status_code == 404
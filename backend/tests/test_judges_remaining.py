@@ -0,0 +1,157 @@
+"""
+The judges_remaining counter: contests close exactly once when the last judges
+finish, and the counter follows vote deletions and deleted judges.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Agent, Contest, ContestJudge, ContestResultSnapshot, ContestText, Text, Vote
+from app.db.repositories.agent_repository import AgentRepository
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.user_repository import UserRepository
+from app.db.repositories.vote_repository import VoteRepository
+from app.services.contest_service import ContestService
+from app.services.vote_service import VoteService
+from tests.test_query_budgets import _user
+
+
+async def _seed_evaluation_contest(db: AsyncSession, human_judges: int, ai_judges: int = 0, text_count: int = 3) -> dict:
+    """A contest in evaluation with the given judges (none of them has voted yet)."""
+    creator, author = _user("creator"), _user("author")
+    judges = [_user("judge") for _ in range(human_judges)]
+    db.add_all([creator, author, *judges])
+    await db.flush()
+
+    agents = [
+        Agent(name=f"Counter judge {i}", description="Judge", prompt="Judge fairly", type="judge",
+              is_public=False, version="1.0", owner_id=creator.id)
+        for i in range(ai_judges)
+    ]
+    contest = Contest(title="Counter contest", description="judges_remaining", creator_id=creator.id,
+                      status="evaluation", publicly_listed=True, password_protected=False,
+                      judges_remaining=human_judges + ai_judges)
+    db.add_all([*agents, contest])
+    await db.flush()
+
+    texts = [Text(title=f"Text {i}", content="Content", author="Author", owner_id=author.id) for i in range(text_count)]
+    assignments = [ContestJudge(contest_id=contest.id, user_judge_id=judge.id) for judge in judges]
+    assignments += [ContestJudge(contest_id=contest.id, agent_judge_id=agent.id) for agent in agents]
+    db.add_all([*texts, *assignments])
+    await db.flush()
+    db.add_all(ContestText(contest_id=contest.id, text_id=text.id) for text in texts)
+    await db.commit()
+    return {"contest": contest, "creator": creator, "judges": judges, "agents": agents,
+            "assignments": assignments, "texts": texts}
+
+
+async def _vote_podium(db: AsyncSession, seed: dict, assignment: ContestJudge) -> None:
+    db.add_all(
+        Vote(contest_id=seed["contest"].id, text_id=text.id, contest_judge_id=assignment.id,
+             text_place=place, comment="Comment", is_ai=False)
+        for place, text in enumerate(seed["texts"], start=1)
+    )
+    await db.flush()
+    await VoteRepository.apply_votes_to_tallies(db, Vote.contest_judge_id == assignment.id)
+    await db.commit()
+
+
+async def _judges_remaining(db: AsyncSession, contest_id: int) -> int:
+    result = await db.execute(select(Contest.judges_remaining).where(Contest.id == contest_id))
+    return result.scalar_one()
+
+
+async def test_last_judges_finishing_together_close_contest_once(db_session: AsyncSession):
+    seed = await _seed_evaluation_contest(db_session, human_judges=2)
+    contest_id = seed["contest"].id
+    for assignment in seed["assignments"]:
+        await _vote_podium(db_session, seed, assignment)
+
+    async def finish(contest_judge_id: int) -> None:
+        # What the vote endpoint does once a judge has placed the podium, in its own session
+        async with AsyncSession(db_session.bind, expire_on_commit=False) as db:
+            assignment = await db.get(ContestJudge, contest_judge_id)
+            if await ContestRepository.set_judge_has_voted(db, assignment, True) == 0:
+                await VoteService.check_contest_completion(db, contest_id)
+
+    await asyncio.gather(*(finish(assignment.id) for assignment in seed["assignments"]))
+    # A retry (e.g. by the contest scheduler) doesn't close the contest again
+    await VoteService.check_contest_completion(db_session, contest_id)
+
+    db_session.expire_all()
+    contest = await db_session.get(Contest, contest_id)
+    assert (contest.status, contest.judges_remaining) == ("closed", 0)
+    snapshot = (await db_session.execute(
+        select(ContestResultSnapshot).where(ContestResultSnapshot.contest_id == contest_id)
+    )).scalar_one()
+    assert snapshot.version == 1
+    rankings = (await db_session.execute(
+        select(ContestText.ranking).where(ContestText.contest_id == contest_id).order_by(ContestText.ranking)
+    )).scalars().all()
+    assert rankings == [1, 2, 3]
+
+
+async def test_failed_close_leaves_contest_in_evaluation(db_session: AsyncSession, monkeypatch):
+    seed = await _seed_evaluation_contest(db_session, human_judges=1)
+    contest_id = seed["contest"].id
+    await _vote_podium(db_session, seed, seed["assignments"][0])
+    assert await ContestRepository.set_judge_has_voted(db_session, seed["assignments"][0], True) == 0
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("Snapshot write failed")
+
+    monkeypatch.setattr(ContestService, "build_results_snapshot", fail)
+    with pytest.raises(RuntimeError):
+        await VoteService.check_contest_completion(db_session, contest_id)
+    monkeypatch.undo()
+
+    db_session.expire_all()
+    assert (await db_session.get(Contest, contest_id)).status == "evaluation"
+    assert contest_id in await ContestRepository.get_completed_evaluation_contest_ids(db_session, limit=1000)
+
+    # The retry closes it with rankings and a snapshot
+    await VoteService.check_contest_completion(db_session, contest_id)
+    db_session.expire_all()
+    assert (await db_session.get(Contest, contest_id)).status == "closed"
+    assert (await db_session.execute(
+        select(ContestResultSnapshot.version).where(ContestResultSnapshot.contest_id == contest_id)
+    )).scalar_one() == 1
+
+
+async def test_deleting_a_vote_puts_the_judge_back(db_session: AsyncSession):
+    seed = await _seed_evaluation_contest(db_session, human_judges=2)
+    contest_id = seed["contest"].id
+    finished = seed["assignments"][0]
+    await _vote_podium(db_session, seed, finished)
+    assert await ContestRepository.set_judge_has_voted(db_session, finished, True) == 1
+
+    vote_id = (await db_session.execute(
+        select(Vote.id).where(Vote.contest_judge_id == finished.id, Vote.text_place == 1)
+    )).scalar_one()
+    await VoteService.delete_vote(db_session, vote_id, seed["judges"][0])
+
+    assert await _judges_remaining(db_session, contest_id) == 2
+    has_voted = await db_session.execute(select(ContestJudge.has_voted).where(ContestJudge.id == finished.id))
+    assert has_voted.scalar_one() is False
+
+
+async def test_deleted_judges_are_released(db_session: AsyncSession):
+    seed = await _seed_evaluation_contest(db_session, human_judges=2, ai_judges=1)
+    contest_id = seed["contest"].id
+    voted_judge = seed["assignments"][1]
+    await _vote_podium(db_session, seed, voted_judge)
+    assert await ContestRepository.set_judge_has_voted(db_session, voted_judge, True) == 2
+
+    # A judge that hasn't voted yet no longer holds the contest up
+    await UserRepository(db_session).delete(seed["judges"][0].id)
+    assert await _judges_remaining(db_session, contest_id) == 1
+
+    # One that already voted was not counted any more
+    await UserRepository(db_session).delete(seed["judges"][1].id)
+    assert await _judges_remaining(db_session, contest_id) == 1
+
+    assert await AgentRepository.delete_agent(db_session, seed["agents"][0].id)
+    assert await _judges_remaining(db_session, contest_id) == 0
@@ -0,0 +1,97 @@
+"""
+Running vote tallies and the live standings read from them: the tallies follow
+every vote insert, delete and re-vote, and only the contest creator sees them.
+"""
+
+from collections import defaultdict
+
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ContestTextTally, Vote
+from app.db.repositories.vote_repository import VoteRepository
+from tests.test_judges_remaining import _seed_evaluation_contest
+from tests.test_query_budgets import _headers
+
+POINTS_BY_PLACE = {1: 3, 2: 2, 3: 1}
+
+
+async def _assert_tallies_match_votes(db: AsyncSession, contest_id: int) -> dict:
+    """The stored tallies equal a recount of the contest's votes; returns {text_id: points}."""
+    votes = (await db.execute(
+        select(Vote.text_id, Vote.text_place).where(Vote.contest_id == contest_id)
+    )).all()
+    expected = defaultdict(lambda: [0, 0, 0, 0, 0])
+    for text_id, place in votes:
+        counters = expected[text_id]
+        counters[0] += POINTS_BY_PLACE.get(place, 0)
+        if place in (1, 2, 3):
+            counters[place] += 1
+        counters[4] += 1
+
+    rows = (await db.execute(
+        select(ContestTextTally).where(ContestTextTally.contest_id == contest_id)
+        .execution_options(populate_existing=True)
+    )).scalars().all()
+    stored = {
+        row.text_id: [row.points, row.first_places, row.second_places, row.third_places, row.vote_count]
+        for row in rows if row.vote_count
+    }
+    assert stored == dict(expected)
+    return {text_id: counters[0] for text_id, counters in stored.items()}
+
+
+async def _vote(db: AsyncSession, seed: dict, judge: int, places: list) -> None:
+    """Judge `judge` gives text i the place places[i] (None: comment only)."""
+    for text, place in zip(seed["texts"], places):
+        await VoteRepository.create_vote(
+            db, contest_id=seed["contest"].id, contest_judge_id=seed["assignments"][judge].id,
+            text_id=text.id, text_place=place, comment="Comment", is_ai=False
+        )
+
+
+async def test_tallies_follow_vote_changes(db_session: AsyncSession):
+    seed = await _seed_evaluation_contest(db_session, human_judges=2)
+    contest_id = seed["contest"].id
+    first, second, third = (text.id for text in seed["texts"])
+
+    await _vote(db_session, seed, 0, [1, 2, 3])
+    await _vote(db_session, seed, 1, [2, 1, None])
+    assert await _assert_tallies_match_votes(db_session, contest_id) == {first: 5, second: 5, third: 1}
+
+    # A single vote deleted
+    vote = (await db_session.execute(
+        select(Vote).where(Vote.contest_judge_id == seed["assignments"][1].id, Vote.text_id == second)
+    )).scalar_one()
+    assert await VoteRepository.delete_vote(db_session, vote.id)
+    assert await _assert_tallies_match_votes(db_session, contest_id) == {first: 5, second: 2, third: 1}
+
+    # A judge votes again: their previous votes are replaced
+    await VoteRepository.delete_votes_by_contest_judge(db_session, seed["assignments"][0].id, contest_id)
+    await _vote(db_session, seed, 0, [3, None, 1])
+    assert await _assert_tallies_match_votes(db_session, contest_id) == {first: 3, second: 0, third: 3}
+
+
+async def test_live_standings(client: AsyncClient, db_session: AsyncSession):
+    seed = await _seed_evaluation_contest(db_session, human_judges=2)
+    contest_id = seed["contest"].id
+    url = f"/contests/{contest_id}/standings"
+
+    # Before any vote nobody is ranked
+    response = await client.get(url, headers=_headers(seed["creator"]))
+    assert response.status_code == 200, response.text
+    assert {entry["rank"] for entry in response.json()} == {None}
+
+    await _vote(db_session, seed, 0, [2, 1, 3])
+    await _vote(db_session, seed, 1, [1, 2, None])
+    response = await client.get(url, headers=_headers(seed["creator"]))
+    assert response.status_code == 200, response.text
+    standings = [(entry["text_id"], entry["points"], entry["rank"]) for entry in response.json()]
+    # Tied texts share a rank; all texts were submitted together, so the tie keeps submission order
+    first, second, third = (text.id for text in seed["texts"])
+    assert standings == [(first, 5, 1), (second, 5, 1), (third, 1, 3)]
+
+    for judge in seed["judges"]:
+        response = await client.get(url, headers=_headers(judge))
+        assert response.status_code == 403
@@ -0,0 +1,100 @@
+"""
+Model fallback routing: candidate selection, fallbacks on timeouts and errors,
+and skipping providers that have been failing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.agent import ModelRoutingPolicy
+from app.services.model_router import ProviderHealth, candidate_models, provider_health, route_model_call
+
+PRIMARY = "gpt-4.1-2025-04-14"  # OpenAI, 1M token context window
+FALLBACK = "claude-sonnet-4-20250514"  # Anthropic, 200k token context window
+LAST = "claude-3-5-haiku-latest"
+
+
+@pytest.fixture(autouse=True)
+def clean_provider_health():
+    provider_health.reset()
+    yield
+    provider_health.reset()
+
+
+def _policy(*fallbacks: str, **kwargs) -> ModelRoutingPolicy:
+    return ModelRoutingPolicy(fallback_models=list(fallbacks), **kwargs)
+
+
+def test_candidate_models_filters_fallbacks():
+    policy = _policy("not-a-model", PRIMARY, FALLBACK, FALLBACK, LAST)
+    assert candidate_models(PRIMARY, policy) == [PRIMARY, FALLBACK, LAST]
+    assert candidate_models(PRIMARY, None) == [PRIMARY]
+
+
+def test_candidate_models_drops_fallbacks_with_small_context_window():
+    policy = _policy(FALLBACK)
+    assert candidate_models(PRIMARY, policy, required_tokens=1_000) == [PRIMARY, FALLBACK]
+    assert candidate_models(PRIMARY, policy, required_tokens=300_000) == [PRIMARY]
+
+
+async def test_timeout_falls_back_to_next_model():
+    async def call(model_id: str) -> str:
+        if model_id == PRIMARY:
+            await asyncio.sleep(1)
+        return f"served by {model_id}"
+
+    result, served = await route_model_call(PRIMARY, _policy(FALLBACK, latency_budget_seconds=0.05), call)
+    assert (result, served) == (f"served by {FALLBACK}", FALLBACK)
+
+
+async def test_error_falls_back_to_next_model():
+    tried = []
+
+    async def call(model_id: str) -> str:
+        tried.append(model_id)
+        if model_id != LAST:
+            raise RuntimeError(f"{model_id} is down")
+        return "ok"
+
+    assert await route_model_call(PRIMARY, _policy(FALLBACK, LAST), call) == ("ok", LAST)
+    assert tried == [PRIMARY, FALLBACK, LAST]
+
+
+async def test_last_model_error_is_raised():
+    async def call(model_id: str) -> str:
+        raise RuntimeError(f"{model_id} is down")
+
+    with pytest.raises(RuntimeError, match=FALLBACK):
+        await route_model_call(PRIMARY, _policy(FALLBACK), call)
+    with pytest.raises(RuntimeError, match=PRIMARY):
+        await route_model_call(PRIMARY, None, call)
+
+
+async def test_unhealthy_provider_is_skipped(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_ROUTING_MIN_CALLS", 3)
+    for _ in range(3):
+        provider_health.record("OpenAI", ok=False)
+    tried = []
+
+    async def call(model_id: str) -> str:
+        tried.append(model_id)
+        return "ok"
+
+    assert await route_model_call(PRIMARY, _policy(FALLBACK), call) == ("ok", FALLBACK)
+    assert tried == [FALLBACK]
+
+
+def test_provider_health_error_rate(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_ROUTING_MIN_CALLS", 4)
+    health = ProviderHealth()
+    for ok in (True, False, True):
+        health.record("OpenAI", ok=ok)
+    assert health.error_rate("OpenAI") is None  # Not enough calls yet
+    health.record("OpenAI", ok=False)
+    assert health.error_rate("OpenAI") == 0.5
+    assert health.error_rate("Anthropic") is None
+
+    monkeypatch.setattr(settings, "MODEL_ROUTING_ERROR_WINDOW_SECONDS", -1)
+    assert health.error_rate("OpenAI") is None  # Outcomes outside the window are dropped
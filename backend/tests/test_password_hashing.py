@@ -0,0 +1,67 @@
+"""
+Password hashing: hashes with another work factor than BCRYPT_ROUNDS are
+replaced on login, and admins can read the hashing pool's metrics.
+"""
+
+from httpx import AsyncClient
+from passlib.hash import bcrypt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import verify_password
+from app.db.models import User
+from tests.test_query_budgets import _headers, _user
+
+PASSWORD = "correct horse battery staple"
+
+
+def _rounds(hashed_password: str) -> int:
+    return int(hashed_password.split("$")[2])
+
+
+async def _stored_hash(db: AsyncSession, user_id: int) -> str:
+    return (await db.execute(select(User.hashed_password).where(User.id == user_id))).scalar_one()
+
+
+async def _login(client: AsyncClient, user: User) -> None:
+    response = await client.post("/auth/login/json", json={"username": user.username, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+
+
+async def test_hash_with_more_rounds_is_replaced_on_login(client: AsyncClient, db_session: AsyncSession):
+    user = _user("rehash")
+    user.hashed_password = bcrypt.using(rounds=settings.BCRYPT_ROUNDS + 1).hash(PASSWORD)
+    db_session.add(user)
+    await db_session.commit()
+
+    await _login(client, user)
+    upgraded = await _stored_hash(db_session, user.id)
+    assert _rounds(upgraded) == settings.BCRYPT_ROUNDS
+    assert verify_password(PASSWORD, upgraded)
+
+    # A current hash is left alone
+    await _login(client, user)
+    assert await _stored_hash(db_session, user.id) == upgraded
+
+
+async def test_password_hashing_stats_are_admin_only(client: AsyncClient, db_session: AsyncSession):
+    admin, user = _user("admin"), _user("user")
+    admin.is_admin = True
+    user.hashed_password = bcrypt.using(rounds=settings.BCRYPT_ROUNDS).hash(PASSWORD)
+    db_session.add_all([admin, user])
+    await db_session.commit()
+
+    response = await client.get("/admin/password-hashing/stats", headers=_headers(user))
+    assert response.status_code == 403
+
+    before = (await client.get("/admin/password-hashing/stats", headers=_headers(admin))).json()
+    await _login(client, user)
+    response = await client.get("/admin/password-hashing/stats", headers=_headers(admin))
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    assert stats["bcrypt_rounds"] == settings.BCRYPT_ROUNDS
+    assert stats["completed"] == before["completed"] + 1
+    assert (stats["waiting"], stats["running"]) == (0, 0)
+    assert stats["workers"] >= 1
+    assert stats["avg_hash_ms"] > 0
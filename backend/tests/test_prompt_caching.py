@@ -0,0 +1,75 @@
+"""
+Prompt caching: when Anthropic requests get a cache breakpoint, how their usage
+is split into plain, cached and cache-write tokens, and how each is priced.
+"""
+
+import pytest
+
+from app.services.ai_provider_service import AnthropicProvider
+from app.utils.ai_models import CACHE_WRITE_COST_MULTIPLIER, estimate_cost_usd, get_model_by_id
+from app.utils.tokens import CHARS_PER_TOKEN
+
+SONNET = "claude-sonnet-4-20250514"
+HAIKU = "claude-3-5-haiku-latest"
+
+
+def _prefix(tokens: int) -> str:
+    return "x" * (tokens * CHARS_PER_TOKEN)
+
+
+def test_long_prefix_gets_a_cache_breakpoint():
+    prefix = _prefix(AnthropicProvider.MIN_CACHEABLE_PREFIX_TOKENS)
+    assert AnthropicProvider._user_content(SONNET, "Judge the texts.", prefix) == [
+        {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "Judge the texts."}
+    ]
+
+
+@pytest.mark.parametrize("model_id, tokens", [
+    (SONNET, AnthropicProvider.MIN_CACHEABLE_PREFIX_TOKENS - 1),
+    # Haiku models need twice the minimum
+    (HAIKU, 2 * AnthropicProvider.MIN_CACHEABLE_PREFIX_TOKENS - 1),
+])
+def test_short_prefix_is_sent_inline(model_id: str, tokens: int):
+    prefix = _prefix(tokens)
+    assert AnthropicProvider._user_content(model_id, "Judge the texts.", prefix) == prefix + "Judge the texts."
+    assert isinstance(AnthropicProvider._user_content(model_id, "Judge.", prefix + _prefix(1)), list)
+
+
+def test_no_prefix_is_sent_as_the_prompt():
+    assert AnthropicProvider._user_content(SONNET, "Judge the texts.") == "Judge the texts."
+    assert AnthropicProvider._user_content(SONNET, "Judge the texts.", "") == "Judge the texts."
+
+
+def test_anthropic_usage_adds_cached_tokens_to_the_prompt():
+    usage = {"input_tokens": 50, "output_tokens": 200,
+             "cache_creation_input_tokens": 3000, "cache_read_input_tokens": 0}
+    assert AnthropicProvider._usage(usage) == (3050, 200, 0, 3000)
+
+    usage.update(cache_creation_input_tokens=0, cache_read_input_tokens=3000)
+    assert AnthropicProvider._usage(usage) == (3050, 200, 3000, 0)
+
+    # Requests without a breakpoint may omit the cache fields or report them as null
+    assert AnthropicProvider._usage({"input_tokens": 80, "output_tokens": 10}) == (80, 10, 0, 0)
+    assert AnthropicProvider._usage(
+        {"input_tokens": 80, "output_tokens": 10, "cache_creation_input_tokens": None}
+    ) == (80, 10, 0, 0)
+
+
+def test_cached_reads_and_cache_writes_are_priced_apart():
+    model = get_model_by_id(SONNET)
+    input_rate, cached_rate = model.input_cost_usd_per_1k_tokens, model.cached_input_cost_usd_per_1k_tokens
+    output_rate = model.output_cost_usd_per_1k_tokens
+    assert cached_rate < input_rate
+
+    assert estimate_cost_usd(SONNET, 10_000, 1_000) == pytest.approx(10 * input_rate + output_rate)
+
+    # Reads at the cached rate, writes above the input rate, the rest at the input rate
+    mixed = estimate_cost_usd(SONNET, 10_000, 1_000, cached_input_tokens=4_000, cache_write_tokens=5_000)
+    assert mixed == pytest.approx(
+        input_rate + 4 * cached_rate + 5 * input_rate * CACHE_WRITE_COST_MULTIPLIER + output_rate
+    )
+
+    # Cached and written tokens can't exceed the prompt
+    capped = estimate_cost_usd(SONNET, 1_000, 0, cached_input_tokens=800, cache_write_tokens=800)
+    assert capped == pytest.approx(0.8 * cached_rate + 0.2 * input_rate * CACHE_WRITE_COST_MULTIPLIER)
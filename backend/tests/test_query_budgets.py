@@ -0,0 +1,114 @@
+"""
+Query budgets for the main read endpoints.
+
+Each endpoint is exercised on a small and a larger seeded contest with the same
+budget, so a per-row query (N+1) fails the test with the statements listed.
+"""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.db.models import Agent, AgentExecution, Contest, ContestJudge, ContestText, Text, User, Vote
+
+SEED_SIZES = [2, 8]
+
+
+def _headers(user: User) -> dict:
+    token = create_access_token(data={"sub": user.username, "id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _user(prefix: str) -> User:
+    suffix = uuid.uuid4().hex[:8]
+    return User(
+        username=f"{prefix}_{suffix}_qb",
+        email=f"{prefix}_{suffix}@qb.plumas.top",
+        hashed_password="not-a-real-hash",
+        credits=100,
+        is_admin=False
+    )
+
+
+async def seed_closed_contest(db: AsyncSession, text_count: int) -> dict:
+    """
+    A closed contest with `text_count` texts by one author, voted on by a human
+    judge and an AI judge (one vote per text each, podium for the first three).
+    """
+    creator, author, judge_user = _user("creator"), _user("author"), _user("judge")
+    db.add_all([creator, author, judge_user])
+    await db.flush()
+
+    agent = Agent(name="Budget judge", description="Judge", prompt="Judge fairly", type="judge",
+                  is_public=False, version="2.1", owner_id=creator.id)
+    contest = Contest(title="Budget contest", description="Query budget seed", creator_id=creator.id,
+                      status="closed", publicly_listed=True, password_protected=False)
+    db.add_all([agent, contest])
+    await db.flush()
+
+    texts = [Text(title=f"Text {i}", content="Content " * 20, author="Author", owner_id=author.id)
+             for i in range(text_count)]
+    human_judge = ContestJudge(contest_id=contest.id, user_judge_id=judge_user.id, has_voted=True)
+    ai_judge = ContestJudge(contest_id=contest.id, agent_judge_id=agent.id, has_voted=True)
+    execution = AgentExecution(agent_id=agent.id, owner_id=creator.id, execution_type="judge",
+                               model="test-model", status="completed", credits_used=1)
+    db.add_all([*texts, human_judge, ai_judge, execution])
+    await db.flush()
+
+    for place, text in enumerate(texts, start=1):
+        db.add(ContestText(contest_id=contest.id, text_id=text.id, ranking=place, total_points=max(0, 4 - place)))
+        podium_place = place if place <= 3 else None
+        db.add(Vote(contest_id=contest.id, text_id=text.id, contest_judge_id=human_judge.id,
+                    text_place=podium_place, comment="Human comment", is_ai=False))
+        db.add(Vote(contest_id=contest.id, text_id=text.id, contest_judge_id=ai_judge.id,
+                    agent_execution_id=execution.id, text_place=podium_place, comment="AI comment", is_ai=True))
+    await db.commit()
+
+    return {"contest_id": contest.id, "creator": creator, "author": author, "judge": judge_user}
+
+
+@pytest.mark.parametrize("text_count", SEED_SIZES)
+async def test_contest_votes_query_budget(client: AsyncClient, db_session: AsyncSession, query_budget, text_count: int):
+    seed = await seed_closed_contest(db_session, text_count)
+    with query_budget(7):
+        response = await client.get(f"/contests/{seed['contest_id']}/votes", headers=_headers(seed["creator"]))
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 2 * text_count
+    assert all(vote["ai_version"] == "2.1" for vote in response.json() if vote["is_ai_vote"])
+
+
+@pytest.mark.parametrize("text_count", SEED_SIZES)
+async def test_contest_submissions_query_budget(client: AsyncClient, db_session: AsyncSession, query_budget, text_count: int):
+    seed = await seed_closed_contest(db_session, text_count)
+    with query_budget(8):
+        response = await client.get(f"/contests/{seed['contest_id']}/submissions/", headers=_headers(seed["creator"]))
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == text_count
+
+
+@pytest.mark.parametrize("text_count", SEED_SIZES)
+async def test_my_submissions_query_budget(client: AsyncClient, db_session: AsyncSession, query_budget, text_count: int):
+    seed = await seed_closed_contest(db_session, text_count)
+    with query_budget(4):
+        response = await client.get("/contests/my-submissions/", headers=_headers(seed["author"]))
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == text_count
+
+
+@pytest.mark.parametrize("text_count", SEED_SIZES)
+async def test_contest_detail_query_budget(client: AsyncClient, db_session: AsyncSession, query_budget, text_count: int):
+    seed = await seed_closed_contest(db_session, text_count)
+    with query_budget(8):
+        response = await client.get(f"/contests/{seed['contest_id']}", headers=_headers(seed["creator"]))
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("text_count", SEED_SIZES)
+async def test_dashboard_query_budget(client: AsyncClient, db_session: AsyncSession, query_budget, text_count: int):
+    seed = await seed_closed_contest(db_session, text_count)
+    with query_budget(7):
+        response = await client.get("/dashboard", headers=_headers(seed["judge"]))
+    assert response.status_code == 200, response.text
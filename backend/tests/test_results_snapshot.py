@@ -0,0 +1,74 @@
+"""
+Closed-contest results snapshot: reads are served from it in one query, and
+edits to the texts, submissions and agent names it shows rebuild it.
+"""
+
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Agent, Contest, ContestJudge, ContestResultSnapshot
+from app.db.repositories.agent_repository import AgentRepository
+from app.db.repositories.contest_repository import ContestRepository
+from app.db.repositories.text_repository import TextRepository
+from app.schemas.agent import AgentUpdate
+from app.schemas.text import TextUpdate
+from app.services.contest_service import ContestService
+from tests.test_query_budgets import _headers, seed_closed_contest
+
+
+async def _snapshot_version(db: AsyncSession, contest_id: int):
+    result = await db.execute(
+        select(ContestResultSnapshot.version).where(ContestResultSnapshot.contest_id == contest_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def test_closed_contest_is_served_from_snapshot(db_session: AsyncSession, query_budget):
+    seed = await seed_closed_contest(db_session, 4)
+    contest_id = seed["contest_id"]
+    await ContestService.build_results_snapshot(db_session, contest_id)
+    contest = await db_session.get(Contest, contest_id)
+    live = await ContestService._build_submission_responses(db_session, contest)
+
+    with query_budget(1):
+        served = await ContestService.get_submissions_for_contest(db_session, contest)
+    assert served == live
+
+
+async def test_snapshot_follows_text_and_judge_changes(client: AsyncClient, db_session: AsyncSession):
+    seed = await seed_closed_contest(db_session, 4)
+    contest_id = seed["contest_id"]
+    await ContestService.build_results_snapshot(db_session, contest_id)
+    agent_id = (await db_session.execute(
+        select(Agent.id).join(ContestJudge, ContestJudge.agent_judge_id == Agent.id).where(ContestJudge.contest_id == contest_id)
+    )).scalar_one()
+
+    submissions = (await client.get(f"/contests/{contest_id}/submissions/", headers=_headers(seed["creator"]))).json()
+    by_rank = {item["ranking"]: item for item in submissions}
+    edited, removed, deleted = by_rank[1], by_rank[2], by_rank[3]
+
+    changes = [
+        lambda: TextRepository(db_session).update_text(edited["text_id"], TextUpdate(title="Edited title")),
+        lambda: ContestRepository.delete_submission(db_session, removed["id"]),
+        lambda: TextRepository(db_session).delete_text(deleted["text_id"]),
+        lambda: AgentRepository.update_agent(db_session, agent_id, AgentUpdate(name="Renamed AI judge"))
+    ]
+    for change in changes:
+        # Each change drops the snapshot; the next read rebuilds it from the live rows
+        await client.get(f"/contests/{contest_id}/submissions/", headers=_headers(seed["creator"]))
+        assert await _snapshot_version(db_session, contest_id) is not None
+        await change()
+        assert await _snapshot_version(db_session, contest_id) is None
+
+    for _ in range(2):  # Rebuild, then served from the rebuilt snapshot
+        response = await client.get(f"/contests/{contest_id}/submissions/", headers=_headers(seed["creator"]))
+        assert response.status_code == 200, response.text
+        submissions = {item["text_id"]: item for item in response.json()}
+
+        assert set(submissions) == {edited["text_id"], by_rank[4]["text_id"]}
+        assert submissions[edited["text_id"]]["title"] == "Edited title"
+        assert submissions[edited["text_id"]]["ranking"] == 1
+        judges = {evaluation["judge_identifier"] for evaluation in submissions[edited["text_id"]]["evaluations"]}
+        assert judges == {seed["judge"].username, "Renamed AI judge"}
+    assert await _snapshot_version(db_session, contest_id) == 1
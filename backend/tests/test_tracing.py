@@ -0,0 +1,95 @@
+"""
+Request tracing: the Server-Timing header counts the DB statements and LLM calls
+of a request, nested provider calls are counted once, and trace logs are sampled.
+"""
+
+import json
+import re
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import tracing
+from app.core.tracing import TracingMiddleware, install_sql_tracing, trace_llm_call
+
+
+@trace_llm_call
+async def generate_text(prompt: str):
+    return f"Reply to {prompt}", 100, 10, 40, 0
+
+
+@trace_llm_call
+async def generate_batch(prompts: list):
+    # Like a provider batch falling back to single calls
+    return [await generate_text(prompt) for prompt in prompts]
+
+
+def _app(db: AsyncSession, **middleware) -> TracingMiddleware:
+    engine = db.bind
+    install_sql_tracing(engine)
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work(queries: int = 0, prompts: int = 0):
+        async with AsyncSession(engine) as session:
+            for _ in range(queries):
+                await session.execute(text("SELECT 1"))
+        if prompts:
+            await generate_batch([f"prompt {i}" for i in range(prompts)])
+        return {"ok": True}
+
+    return TracingMiddleware(app, **middleware)
+
+
+async def _get(app: TracingMiddleware, **params):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/work", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+@pytest.fixture
+def trace_records(monkeypatch):
+    records = []
+    monkeypatch.setattr(tracing.logger, "info", lambda message: records.append(json.loads(message)))
+    return records
+
+
+async def test_server_timing_counts_queries_and_llm_calls(db_session: AsyncSession, trace_records):
+    response = await _get(_app(db_session), queries=3, prompts=2)
+
+    timing = response.headers["server-timing"]
+    assert re.search(r'db;dur=[\d.]+;desc="3 queries"', timing), timing
+    assert re.search(r'llm;dur=[\d.]+;desc="2 calls"', timing), timing
+    assert re.search(r"total;dur=[\d.]+", timing), timing
+
+    # The batch wraps the two single calls: their tokens are counted once, not again for the batch
+    [record] = trace_records
+    assert (record["db_statements"], record["llm_calls"]) == (3, 2)
+    assert (record["llm_prompt_tokens"], record["llm_completion_tokens"], record["llm_cached_prompt_tokens"]) == (200, 20, 80)
+    assert (record["path"], record["status"]) == ("/work", 200)
+
+
+async def test_server_timing_header_can_be_disabled(db_session: AsyncSession, trace_records):
+    response = await _get(_app(db_session, server_timing=False), queries=1)
+    assert "server-timing" not in response.headers
+
+
+async def test_trace_logs_are_sampled(db_session: AsyncSession, trace_records, monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.5)
+
+    await _get(_app(db_session, sample_rate=0.4, slow_request_ms=60_000))
+    assert trace_records == []
+    await _get(_app(db_session, sample_rate=0.6, slow_request_ms=60_000))
+    assert len(trace_records) == 1
+    # Slow requests are always logged
+    await _get(_app(db_session, sample_rate=0.0, slow_request_ms=0))
+    assert len(trace_records) == 2
+
+
+async def test_calls_outside_a_request_are_not_traced():
+    assert tracing.current_trace() is None
+    assert await generate_batch(["untraced"]) == [("Reply to untraced", 100, 10, 40, 0)]
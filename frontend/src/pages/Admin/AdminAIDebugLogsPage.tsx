@@ -10,44 +10,56 @@ interface AIDebugLog {
   agent_id?: number;
   contest_id?: number;
   model_id?: string;
-  strategy_input?: string;
-  llm_prompt?: string;
-  llm_response?: string;
-  parsed_output?: string;
   execution_time_ms?: number;
   prompt_tokens?: number;
   completion_tokens?: number;
   cost_usd?: number;
 }
 
+// Heavy fields, loaded only when a log is expanded
+interface AIDebugLogDetail {
+  strategy_input?: string;
+  parsed_output?: string;
+  llm_prompt?: string;
+  llm_response?: string;
+}
+
 interface APIResponse {
   enabled: boolean;
   count: number;
   logs: AIDebugLog[];
+  next_before_id?: number | null;
 }
 
+const API_BASE = 'http://localhost:8000/admin/ai-debug-logs/api';
+
+const authHeaders = (): Record<string, string> => {
+  const authHeader = getAuthHeader();
+  return authHeader ? { Authorization: authHeader } : {};
+};
+
 const AdminAIDebugLogsPage: React.FC = () => {
   const [logs, setLogs] = useState<AIDebugLog[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [isEnabled, setIsEnabled] = useState(false);
   const [filter, setFilter] = useState<string>('');
   const [expandedLogs, setExpandedLogs] = useState<Set<number>>(new Set());
+  const [details, setDetails] = useState<Record<number, AIDebugLogDetail>>({});
+  const [nextBeforeId, setNextBeforeId] = useState<number | null>(null);
+  const [olderPagesLoaded, setOlderPagesLoaded] = useState(false);
 
-  const fetchLogs = async () => {
+  const fetchLogs = async (beforeId?: number) => {
     try {
       // Temporarily call backend directly to test
-      const url = `http://localhost:8000/admin/ai-debug-logs/api${filter ? `?operation_type=${filter}` : ''}`;
+      const params = new URLSearchParams();
+      if (filter) params.set('operation_type', filter);
+      if (beforeId) params.set('before_id', String(beforeId));
+      const url = `${API_BASE}${params.toString() ? `?${params}` : ''}`;
       console.log('🔍 Fetching from:', url);
       
-      const authHeader = getAuthHeader();
-      const headers: Record<string, string> = {};
-      if (authHeader) {
-        headers['Authorization'] = authHeader;
-      }
-      
       const response = await fetch(url, {
         credentials: 'include', // Include cookies for authentication
-        headers
+        headers: authHeaders()
       });
       
       console.log('📡 Response status:', response.status);
@@ -61,7 +73,9 @@ const AdminAIDebugLogsPage: React.FC = () => {
       
       const data: APIResponse = await response.json();
       console.log('✅ Received data:', data);
-      setLogs(data.logs);
+      setLogs(beforeId ? (previous) => [...previous, ...data.logs] : data.logs);
+      setNextBeforeId(data.next_before_id ?? null);
+      setOlderPagesLoaded(Boolean(beforeId));
       setIsEnabled(data.enabled);
     } catch (error) {
       console.error('Error fetching AI debug logs:', error);
@@ -73,18 +87,52 @@ const AdminAIDebugLogsPage: React.FC = () => {
 
   useEffect(() => {
     fetchLogs();
-    
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(fetchLogs, 30000);
-    return () => clearInterval(interval);
   }, [filter]);
 
+  // Auto-refresh every 30 seconds, paused while older pages are shown: a refresh loads the
+  // latest page only and would drop them (the Refresh button goes back to the latest page)
+  useEffect(() => {
+    if (olderPagesLoaded) return;
+    const interval = setInterval(() => fetchLogs(), 30000);
+    return () => clearInterval(interval);
+  }, [filter, olderPagesLoaded]);
+
+  const fetchLogDetail = async (logId: number) => {
+    try {
+      const [detailResponse, promptResponse, responseResponse] = await Promise.all([
+        fetch(`${API_BASE}/${logId}`, { credentials: 'include', headers: authHeaders() }),
+        fetch(`${API_BASE}/${logId}/prompt`, { credentials: 'include', headers: authHeaders() }),
+        fetch(`${API_BASE}/${logId}/response`, { credentials: 'include', headers: authHeaders() })
+      ]);
+      if (!detailResponse.ok || !promptResponse.ok || !responseResponse.ok) {
+        throw new Error(`Failed to fetch log ${logId}`);
+      }
+      const detail = await detailResponse.json();
+      const [llmPrompt, llmResponse] = await Promise.all([promptResponse.text(), responseResponse.text()]);
+      setDetails((previous) => ({
+        ...previous,
+        [logId]: {
+          strategy_input: detail.strategy_input,
+          parsed_output: detail.parsed_output,
+          llm_prompt: llmPrompt,
+          llm_response: llmResponse
+        }
+      }));
+    } catch (error) {
+      console.error('Error fetching AI debug log detail:', error);
+      toast.error('Failed to load AI debug log');
+    }
+  };
+
   const toggleLogExpansion = (logId: number) => {
     const newExpanded = new Set(expandedLogs);
     if (newExpanded.has(logId)) {
       newExpanded.delete(logId);
     } else {
       newExpanded.add(logId);
+      if (!details[logId]) {
+        fetchLogDetail(logId);
+      }
     }
     setExpandedLogs(newExpanded);
   };
@@ -122,7 +170,7 @@ const AdminAIDebugLogsPage: React.FC = () => {
       <div className="flex justify-between items-center mb-8">
         <h1 className="text-3xl font-bold">AI Debug Logs</h1>
         <button
-          onClick={fetchLogs}
+          onClick={() => fetchLogs()}
           className="px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors"
         >
           🔄 Refresh
@@ -130,7 +178,9 @@ const AdminAIDebugLogsPage: React.FC = () => {
       </div>
 
       <div className="mb-6 text-center text-sm text-gray-600">
-        🔄 Auto-refreshing every 30 seconds | Showing last 50 operations
+        {olderPagesLoaded
+          ? '⏸️ Auto-refresh paused while older operations are shown | Refresh to go back to the latest'
+          : '🔄 Auto-refreshing every 30 seconds | Showing latest operations'}
       </div>
 
       {/* Filters */}
@@ -217,7 +267,7 @@ const AdminAIDebugLogsPage: React.FC = () => {
                   <div>
                     <h4 className="font-semibold mb-2">📥 Strategy Input</h4>
                     <div className="bg-gray-100 p-3 rounded font-mono text-sm whitespace-pre-wrap max-h-60 overflow-y-auto">
-                      {log.strategy_input || 'No input logged'}
+                      {details[log.id] ? (details[log.id].strategy_input || 'No input logged') : 'Loading...'}
                     </div>
                   </div>
 
@@ -225,7 +275,7 @@ const AdminAIDebugLogsPage: React.FC = () => {
                   <div>
                     <h4 className="font-semibold mb-2">🚀 LLM Prompt</h4>
                     <div className="bg-gray-100 p-3 rounded font-mono text-sm whitespace-pre-wrap max-h-60 overflow-y-auto">
-                      {log.llm_prompt || 'No prompt logged'}
+                      {details[log.id] ? (details[log.id].llm_prompt || 'No prompt logged') : 'Loading...'}
                     </div>
                   </div>
 
@@ -233,7 +283,7 @@ const AdminAIDebugLogsPage: React.FC = () => {
                   <div>
                     <h4 className="font-semibold mb-2">🤖 LLM Response</h4>
                     <div className="bg-gray-100 p-3 rounded font-mono text-sm whitespace-pre-wrap max-h-60 overflow-y-auto">
-                      {log.llm_response || 'No response logged'}
+                      {details[log.id] ? (details[log.id].llm_response || 'No response logged') : 'Loading...'}
                     </div>
                   </div>
 
@@ -241,13 +291,23 @@ const AdminAIDebugLogsPage: React.FC = () => {
                   <div>
                     <h4 className="font-semibold mb-2">📤 Parsed Output</h4>
                     <div className="bg-gray-100 p-3 rounded font-mono text-sm whitespace-pre-wrap max-h-60 overflow-y-auto">
-                      {log.parsed_output || 'No output logged'}
+                      {details[log.id] ? (details[log.id].parsed_output || 'No output logged') : 'Loading...'}
                     </div>
                   </div>
                 </div>
               )}
             </div>
           ))}
+          {nextBeforeId && (
+            <div className="text-center">
+              <button
+                onClick={() => fetchLogs(nextBeforeId)}
+                className="px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors"
+              >
+                Load older
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>